@@ -1,41 +1,64 @@
 # app/api/v1/endpoints/ai.py
+import json
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models import Bill
 from app.services.ai_service import generate_openai_summary, generate_bill_ai
 from app.services.ai_generator_service import generate_bill_ai_summary
 from app.services.ai_enrichment_service import enrich_bill_with_ai
+from app.services.enrichment_queue import enrichment_queue, PRIORITY_WATCHED
+from app.services.cache_service import invalidate_async
 
 router = APIRouter()
 
 @router.post("/generate/{bill_id}")
-async def regenerate_ai_for_bill(bill_id: int, db: Session = Depends(get_db)):
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
+async def regenerate_ai_for_bill(bill_id: int, db: AsyncSession = Depends(get_async_db)):
+    bill = await db.get(Bill, bill_id)
     if not bill:
         raise HTTPException(status_code=404, detail="Bill not found")
 
-    ai_result = await generate_ai_summary(bill.title, bill.description)
+    ai_result = await generate_openai_summary(bill.title, bill.description)
     bill.ai_summary = ai_result["summary"]
     bill.ai_impacts = ai_result["impacts"]
     bill.ai_pro_con = ai_result["pros_cons"]
-    db.commit()
+    bill.ai_input_key = None  # not enrich_bill_with_ai's analysis; don't let it serve this as a cache hit
+    await db.commit()
+    await invalidate_async(f"bill:{bill_id}")
     return {"bill_id": bill_id, "status": "AI analysis updated", "ai": ai_result}
 
 
 @router.post("/bills/{bill_id}/enrich")
-async def enrich_bill_ai(bill_id: int, db: Session = Depends(get_db)):
+async def enrich_bill_ai(bill_id: int, db: AsyncSession = Depends(get_async_db)):
     updated_bill = await enrich_bill_with_ai(db, bill_id)
     if not updated_bill:
         raise HTTPException(status_code=404, detail="No bill text found or bill missing")
     return updated_bill
 
 
+@router.post("/bills/{bill_id}/enrich/queue", status_code=202)
+def queue_bill_enrichment(bill_id: int, mode: str = "latest", db: Session = Depends(get_db)):
+    """Queue background enrichment at top priority; poll /enrich/status for progress."""
+    if db.get(Bill, bill_id) is None:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    return enrichment_queue.enqueue(bill_id, PRIORITY_WATCHED, mode)
+
+
+@router.get("/bills/{bill_id}/enrich/status")
+def bill_enrichment_status(bill_id: int):
+    """Latest background enrichment job for the bill: queued / running / done / failed."""
+    status = enrichment_queue.status(bill_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="No enrichment job for this bill")
+    return status
+
+
 @router.get("/{bill_id}/ai")
 async def generate_bill_ai_data(
     bill_id: int, 
     mode: str = "latest", 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate and return AI analysis for a bill.
@@ -60,13 +83,13 @@ async def generate_bill_ai_data(
 async def regenerate_bill_ai_data(
     bill_id: int,
     mode: str = "latest",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Force regeneration of AI analysis for a bill.
     Useful for updating existing analyses.
     """
-    result = await enrich_bill_with_ai(db, bill_id, mode)
+    result = await enrich_bill_with_ai(db, bill_id, mode, force=True)
     return result
 
 
@@ -75,10 +98,10 @@ async def regenerate_bill_ai_data(
 @router.get("/{id}")
 async def ai_analysis(
     id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     regen: bool = Query(False)
 ):
-    bill = db.query(Bill).filter(Bill.id == id).first()
+    bill = await db.get(Bill, id)
     if not bill:
         raise HTTPException(404)
     
@@ -87,7 +110,9 @@ async def ai_analysis(
         bill.ai_summary = ai['summary']
         bill.ai_impacts = ai['impacts']
         bill.ai_pro_con = ai['pros_cons']
-        db.commit()
+        bill.ai_input_key = None  # see regenerate_ai_for_bill
+        await db.commit()
+        await invalidate_async(f"bill:{id}")
     
     return {
         "summary": bill.ai_summary,
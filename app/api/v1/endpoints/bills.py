@@ -1,24 +1,102 @@
 # routers/bills.py (Rewritten to handle full parsing, update detection with change_hash, and sub-models)
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, select, tuple_
+from starlette.concurrency import run_in_threadpool
+from app.db.session import AsyncSessionLocal, get_db, get_async_db
 from app.models import Bill, BillHistory
 from app.schemas import schemas
 from app.services.legiscan_service import legiscan
-from app.schemas.schemas import PaginatedBills, BillListItem
+from app.schemas.schemas import BillSearchResults, PaginatedBills
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+import time
+from app.core.config import settings
+from app.utils.pagination import encode_cursor, decode_cursor
 from app.services.ai_service import generate_bill_ai
+from app.services.sync_legiscan import bulk_sync_masterlist
+from app.services.cache_service import cached_response_async
+from app.services.search_service import search_bills as run_search
+from app.services.export_service import EXPORT_FORMATS, export_bills, export_query
+from app.core.responses import FastJSONResponse
 
 router = APIRouter()
 
+# Declared before /{bill_id} so "search" and "export" are not taken for bill ids
+@router.get("/search", response_model=BillSearchResults)
+async def search_bills(
+    q: str = Query(..., min_length=2, max_length=200, description="Words, \"quoted phrases\", OR and -exclusions"),
+    state: Optional[str] = Query(None),
+    session_id: Optional[int] = Query(None),
+    status: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """🔎 Full-text search over titles, descriptions and extracted bill text, best match first
+
+    When a query matches more than SEARCH_MAX_CANDIDATES bills (1000 by
+    default), only the newest of them are ranked and the response has
+    `truncated: true`; narrow the query or filter by state/session.
+    """
+    try:
+        page = await run_search(db, q, state=state, session_id=session_id, status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(page)
+
+@router.get("/export")
+async def export_state_bills(
+    state: Optional[str] = Query(None),
+    session_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None, description="Only bills with last_updated at or after this time"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """📦 Bulk export of a state's or session's bills with sponsors, streamed as NDJSON or CSV"""
+    if not state and session_id is None:
+        raise HTTPException(status_code=400, detail="Pass state and/or session_id")
+    query = export_query(state=state, session_id=session_id, since=since)
+
+    # The stream outlives the request's dependencies, so it owns its session
+    async def body():
+        async with AsyncSessionLocal() as db:
+            async for chunk in export_bills(db, format, query):
+                yield chunk
+
+    name = "-".join(str(part) for part in ("bills", state and state.upper(), session_id) if part)
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
 @router.get("/{bill_id}", response_model=schemas.Bill)
-async def get_bill(bill_id: str, db: Session = Depends(get_db)):
-    db_bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not db_bill:
-        raise HTTPException(status_code=404, detail="Bill not found")
-    return db_bill
+async def get_bill(bill_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        # AsyncSession cannot lazy-load, so pull every relation the schema renders up front:
+        # the session rides along in the bill's row, each collection is one IN query,
+        # so a bill costs 7 queries however long its history is
+        db_bill = await db.scalar(
+            select(Bill)
+            .where(Bill.id == bill_id)
+            .options(
+                joinedload(Bill.session),
+                selectinload(Bill.sponsors),
+                selectinload(Bill.referrals),
+                selectinload(Bill.history),
+                selectinload(Bill.texts),
+                selectinload(Bill.calendar),
+                selectinload(Bill.sasts),
+            )
+        )
+        if not db_bill:
+            raise HTTPException(status_code=404, detail="Bill not found")
+        return schemas.Bill.model_validate(db_bill)
+
+    return await cached_response_async(request, f"bill:{bill_id}", build)
 
 # @router.get("/state/{state}", response_model=schemas.PaginatedBills)
 # def get_state_bills(
@@ -74,112 +152,109 @@ async def get_bill(bill_id: str, db: Session = Depends(get_db)):
 
 @router.post("/sync/{state}")
 async def sync_state_bills(state: str, db: Session = Depends(get_db)):
-    """🔄 SYNC: Fetch + Save MasterList to DB (change_hash delta)"""
+    """🔄 SYNC: Fetch + Save MasterList to DB (change_hash delta, one bulk upsert)"""
     masterlist = await legiscan.get_master_list(state)
-    
-    updated = 0
-    for bill_id_str, data in masterlist.items():
-        if not isinstance(data, dict) or 'bill_id' not in data:
-            continue
-            
-        bill_id = int(bill_id_str)
-        bill = db.query(Bill).filter(Bill.id == bill_id).first()
-        
-        if bill and bill.change_hash == data.get('change_hash'):
-            continue  # ✅ No change
-            
-        bill_data = {
-            'id': bill_id,
-            'state': state.upper(),
-            'bill_number': data.get('number'),
-            'change_hash': data.get('change_hash'),
-            'title': data.get('title'),
-            'description': data.get('description'),
-            'url': data.get('url'),
-            'status': data.get('status'),
-            'status_date': datetime.strptime(data['status_date'], '%Y-%m-%d') if data.get('status_date') else None,
-            'last_updated': datetime.strptime(data['last_action_date'], '%Y-%m-%d') if data.get('last_action_date') else None,
-        }
-        
-        if not bill:
-            bill = Bill(**bill_data)
-            db.add(bill)
-        else:
-            for k, v in bill_data.items():
-                setattr(bill, k, v)
-        
-        updated += 1
-    
-    db.commit()
-    return {"state": state, "synced": len(masterlist), "updated": updated}
+    # The bulk writer is sync; keep it off the event loop
+    stats = await run_in_threadpool(bulk_sync_masterlist, db, state, masterlist)
+    stats.pop("changed_ids")
+    return stats
+
+# state -> (monotonic timestamp, total); per worker process
+_STATE_TOTALS: Dict[str, Tuple[float, int]] = {}
+
+async def _count_state_bills(db: AsyncSession, state: str) -> int:
+    return await db.scalar(select(func.count(Bill.id)).where(Bill.state == state))
+
+
+async def _state_total(db: AsyncSession, state: str) -> int:
+    """COUNT(*) for a state's feed, cached in-process for FEED_COUNT_TTL seconds."""
+    now = time.monotonic()
+    cached = _STATE_TOTALS.get(state)
+    if cached and now - cached[0] < settings.FEED_COUNT_TTL:
+        return cached[1]
+    total = await _count_state_bills(db, state)
+    _STATE_TOTALS[state] = (now, total)
+    return total
+
 
 @router.get("/state/{state}", response_model=PaginatedBills)
-def get_state_bills(
+async def get_state_bills(
     state: str,
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; switches to keyset pagination"),
+    include_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """📋 BillFeed: Paginated + Last Action"""
-    subq = (
-        db.query(BillHistory.bill_id, func.max(BillHistory.date).label("latest_date"))
-        .filter(BillHistory.bill_id == Bill.id)  # Correlate
-        .group_by(BillHistory.bill_id)
-        .subquery()
-    )
-    
-    query = (
-        db.query(Bill, BillHistory.date.label("last_action_date"), BillHistory.action.label("last_action"))
-        .outerjoin(subq, Bill.id == subq.c.bill_id)
-        .outerjoin(
-            BillHistory,
-            (BillHistory.bill_id == subq.c.bill_id) & (BillHistory.date == subq.c.latest_date)
-        )
-        .filter(Bill.state == state.upper())
-        .order_by(func.coalesce(BillHistory.date, Bill.last_updated).desc())
+    """📋 BillFeed: Paginated + Last Action (denormalized, index range scan)
+
+    Offset mode (default) behaves as before. Passing `cursor` seeks straight
+    to the next page via (last_action_date, id) instead of OFFSET, and the
+    total comes from a short-lived cache (or is skipped with include_total=false).
+    Pages are served from the response cache until a sync touches the state.
+    """
+    state = state.upper()
+    return await cached_response_async(
+        request, f"feed:{state}",
+        lambda: _state_feed_page(db, state, limit, offset, cursor, include_total),
     )
-    
-    total = query.count()
-    rows = query.offset(offset).limit(limit).all()
-    
-    bills_out = [
-        BillListItem(
-            id=r[0].id,
-            title=r[0].title,
-            status=r[0].status,
-            last_action_date=r[1],
-            last_action=r[2]
-        )
-        for r in rows
-    ]
-    
-    return PaginatedBills(
-        total=total, limit=limit, offset=offset,
-        next_offset=offset + limit if offset + limit < total else None,
-        prev_offset=max(0, offset - limit),
-        bills=bills_out
+
+
+# Exactly what BillListItem renders; rows come back as plain tuples, no ORM identity map
+FEED_COLUMNS = (Bill.id, Bill.title, Bill.status, Bill.last_action_date, Bill.last_action)
+
+
+def _state_feed_query(state: str):
+    return (
+        select(*FEED_COLUMNS)
+        .where(Bill.state == state)
+        .order_by(Bill.last_action_date.desc().nullslast(), Bill.id.desc())
     )
 
-@router.get("/{id}")
-async def get_bill_detail(id: int, db: Session = Depends(get_db)):
-    bill = db.query(Bill).filter(Bill.id == id).first()
-    if not bill:
-        raise HTTPException(404, "Bill not found")
-    
-    # Fetch FULL if missing/changed
-    if not bill.raw_data:
-        data = await legiscan.get_bill(id)
-        bill_info = data['bill']
-        if bill.change_hash != bill_info.get('change_hash', ''):
-            bill.raw_data = bill_info  # Sponsors/history/texts!
-            # TODO: Parse relations (Step 4)
-            db.commit()
-    
-    raw = bill.raw_data or {}
+
+def _feed_queries_after(query, after_date, after_id) -> list:
+    """
+    The rows after a cursor, in feed order, as queries that are each one
+    range of ix_bills_state_last_action_date: dated rows past the cursor,
+    then the undated tail. (An OR of the two would scan the whole state.)
+    """
+    undated = query.where(Bill.last_action_date.is_(None))
+    if after_date is None:
+        return [undated.where(Bill.id < after_id)]
+    return [query.where(tuple_(Bill.last_action_date, Bill.id) < tuple_(after_date, after_id)), undated]
+
+
+async def _state_feed_page(db: AsyncSession, state: str, limit: int, offset: int, cursor: Optional[str], include_total: bool):
+    query = _state_feed_query(state)
+
+    # One extra row tells us whether another page exists without counting
+    if cursor:
+        try:
+            after_date, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        offset = 0
+        total = await _state_total(db, state) if include_total else None
+        rows = []
+        for part in _feed_queries_after(query, after_date, after_id):
+            rows += (await db.execute(part.limit(limit + 1 - len(rows)))).all()
+            if len(rows) > limit:
+                break  # the undated tail is only read when the dated rows run out
+    else:
+        total = await _count_state_bills(db, state) if include_total else None
+        rows = (await db.execute(query.offset(offset).limit(limit + 1))).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Trusted DB rows in the PaginatedBills shape, serialized as is (no per-row model validation)
     return {
-        **bill.__dict__,
-        "sponsors": raw.get('sponsors', []),
-        "history": raw.get('history', []),
-        "texts": raw.get('texts', []),
-        "referrals": raw.get('referrals', [])
-    }
\ No newline at end of file
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if has_more and not cursor else None,
+        "prev_offset": max(0, offset - limit) if not cursor else None,
+        "next_cursor": encode_cursor(rows[-1].last_action_date, rows[-1].id) if has_more else None,
+        "bills": [r._asdict() for r in rows],
+    }
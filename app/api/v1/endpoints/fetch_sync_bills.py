@@ -7,7 +7,7 @@ from app.models import bills, posts, users
 from app.models.raw_bills_queries import get_state_bills_raw_model
 from app.models import Bill, BillHistory
 from app.schemas import schemas
-import datetime
+from app.services.bill_writer import write_bills
 
 
 router = APIRouter()
@@ -28,7 +28,8 @@ async def get_bill(bill_id: str, db: Session = Depends(get_db)):
                 fetch_needed = False  # No changes
             else:
                 # Update DB with new data
-                await update_bill_in_db(db, db_bill, bill_info)
+                db_bill = await update_bill_in_db(db, db_bill, bill_info)
+                fetch_needed = False
         else:
             raise HTTPException(status_code=404, detail="Bill not found in API")
 
@@ -38,184 +39,22 @@ async def get_bill(bill_id: str, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Bill not found")
         
         bill_info = bill_data['bill']
-        if not db_bill:
-            db_bill = bills.Bill(id=bill_id)
-        
-        await update_bill_in_db(db, db_bill, bill_info)
+        db_bill = await update_bill_in_db(db, db_bill, bill_info)
     
     return db_bill
 
 async def update_bill_in_db(db: Session, db_bill: bills.Bill, bill_info: dict):
-    # Update core bill fields
-    db_bill.bill_number = bill_info['bill_number']
-    db_bill.change_hash = bill_info['change_hash']
-    db_bill.title = bill_info['title']
-    db_bill.description = bill_info['description']
-    db_bill.status = bill_info['status']
-    db_bill.status_date = datetime.datetime.strptime(bill_info['status_date'], '%Y-%m-%d') if bill_info['status_date'] else None
-    db_bill.state = bill_info['state']
-    db_bill.url = bill_info['url']
-    db_bill.state_link = bill_info['state_link']
-    db_bill.completed = bill_info['completed']
-    db_bill.bill_type = bill_info['bill_type']
-    db_bill.bill_type_id = bill_info['bill_type_id']
-    db_bill.body = bill_info['body']
-    db_bill.body_id = bill_info['body_id']
-    db_bill.current_body = bill_info['current_body']
-    db_bill.current_body_id = bill_info['current_body_id']
-    db_bill.pending_committee_id = bill_info['pending_committee_id']
-    db_bill.raw_data = bill_info
-
-    # Set last_updated: Use max of status_date or latest history date
-    last_updated = db_bill.status_date
-    if bill_info['history']:
-        last_history_date = max(datetime.datetime.strptime(h['date'], '%Y-%m-%d') for h in bill_info['history'] if h['date'])
-        if last_history_date > last_updated:
-            last_updated = last_history_date
-    db_bill.last_updated = last_updated
-
-    # Handle session
-    session_info = bill_info['session']
-    db_session = db.query(bills.Session).filter(bills.Session.id == session_info['session_id']).first()
-    if not db_session:
-        db_session = bills.Session(
-            id=session_info['session_id'],
-            state_id=session_info['state_id'],
-            year_start=session_info['year_start'],
-            year_end=session_info['year_end'],
-            prefile=session_info['prefile'],
-            sine_die=session_info['sine_die'],
-            prior=session_info['prior'],
-            special=session_info['special'],
-            session_tag=session_info['session_tag'],
-            session_title=session_info['session_title'],
-            session_name=session_info['session_name']
-        )
-        db.add(db_session)
-        db.commit()
-        db.refresh(db_session)
-    db_bill.session_id = db_session.id
-
-    # Clear existing sub-records to avoid duplicates
-    db.query(bills.Sponsor).filter(bills.Sponsor.bill_id == db_bill.id).delete()
-    db.query(bills.Referral).filter(bills.Referral.bill_id == db_bill.id).delete()
-    db.query(bills.BillHistory).filter(bills.BillHistory.bill_id == db_bill.id).delete()
-    db.query(bills.BillText).filter(bills.BillText.bill_id == db_bill.id).delete()
-    db.query(bills.CalendarEvent).filter(bills.CalendarEvent.bill_id == db_bill.id).delete()
-    db.query(bills.Vote).filter(bills.Vote.bill_id == db_bill.id).delete()
-    db.query(bills.Amendment).filter(bills.Amendment.bill_id == db_bill.id).delete()
-    db.query(bills.Supplement).filter(bills.Supplement.bill_id == db_bill.id).delete()
-    db.query(bills.Sast).filter(bills.Sast.bill_id == db_bill.id).delete()
-
-    # Add sponsors
-    for sponsor in bill_info['sponsors']:
-        db_sponsor = bills.Sponsor(
-            people_id=sponsor['people_id'],
-            person_hash=sponsor['person_hash'],
-            party_id=sponsor['party_id'],
-            party=sponsor['party'],
-            role_id=sponsor['role_id'],
-            role=sponsor['role'],
-            name=sponsor['name'],
-            first_name=sponsor['first_name'],
-            middle_name=sponsor['middle_name'],
-            last_name=sponsor['last_name'],
-            suffix=sponsor['suffix'],
-            nickname=sponsor['nickname'],
-            district=sponsor['district'],
-            ftm_eid=sponsor['ftm_eid'],
-            votesmart_id=sponsor['votesmart_id'],
-            opensecrets_id=sponsor['opensecrets_id'],
-            knowwho_pid=sponsor['knowwho_pid'],
-            ballotpedia=sponsor['ballotpedia'],
-            bioguide_id=sponsor['bioguide_id'],
-            sponsor_type_id=sponsor['sponsor_type_id'],
-            sponsor_order=sponsor['sponsor_order'],
-            committee_sponsor=sponsor['committee_sponsor'],
-            committee_id=sponsor['committee_id'],
-            state_federal=sponsor['state_federal'],
-            bill_id=db_bill.id
-        )
-        db.add(db_sponsor)
-
-    # Add referrals
-    for referral in bill_info['referrals']:
-        db_referral = bills.Referral(
-            date=datetime.datetime.strptime(referral['date'], '%Y-%m-%d') if referral['date'] else None,
-            committee_id=referral['committee_id'],
-            chamber=referral['chamber'],
-            chamber_id=referral['chamber_id'],
-            name=referral['name'],
-            bill_id=db_bill.id
-        )
-        db.add(db_referral)
-
-    # Add history
-    for hist in bill_info['history']:
-        db_hist = bills.BillHistory(
-            date=datetime.datetime.strptime(hist['date'], '%Y-%m-%d') if hist['date'] else None,
-            action=hist['action'],
-            chamber=hist['chamber'],
-            chamber_id=hist['chamber_id'],
-            importance=hist['importance'],
-            bill_id=db_bill.id
-        )
-        db.add(db_hist)
-
-    # Add texts
-    for text in bill_info['texts']:
-        db_text = bills.BillText(
-            doc_id=text['doc_id'],
-            date=datetime.datetime.strptime(text['date'], '%Y-%m-%d') if text['date'] else None,
-            type=text['type'],
-            type_id=text['type_id'],
-            mime=text['mime'],
-            mime_id=text['mime_id'],
-            url=text['url'],
-            state_link=text['state_link'],
-            text_size=text['text_size'],
-            text_hash=text['text_hash'],
-            bill_id=db_bill.id
-        )
-        db.add(db_text)
-
-    # Add calendar events
-    for cal in bill_info['calendar']:
-        db_cal = bills.CalendarEvent(
-            type_id=cal['type_id'],
-            type=cal['type'],
-            event_hash=cal.get('event_hash'),
-            date=datetime.datetime.strptime(cal['date'], '%Y-%m-%d') if cal['date'] else None,
-            time=cal['time'],
-            location=cal['location'],
-            description=cal['description'],
-            bill_id=db_bill.id
-        )
-        db.add(db_cal)
-
-    # Add sasts (similar bills)
-    for sast in bill_info['sasts']:
-        db_sast = bills.Sast(
-            type_id=sast['type_id'],
-            type=sast['type'],
-            sast_bill_number=sast['sast_bill_number'],
-            sast_bill_id=sast['sast_bill_id'],
-            bill_id=db_bill.id
-        )
-        db.add(db_sast)
-
-    # Add votes, amendments, supplements if present (expand as data becomes available)
-    # For example:
-    # for vote in bill_info['votes']:
-    #     db_vote = bills.Vote(... )
-    #     db.add(db_vote)
-
-    db.add(db_bill)
-    db.commit()
-    db.refresh(db_bill)
+    """
+    Write a getBill payload (bill row, session and all child records) in one
+    transaction and return the refreshed Bill. Children are diffed against
+    what is stored, so only changed sponsors/history/texts/... are rewritten.
+    """
+    write_bills(db, [bill_info])
+    db.expire_all()
 
     # Trigger AI regeneration if text changed (using text_hash comparison)
     # For example, compare latest text_hash with previous; if changed, call LLM and update ai_* fields
+    return db.get(bills.Bill, bill_info['bill_id'])
 
 
 @router.get("/states/{state}", response_model=list[schemas.Bill])
@@ -248,42 +87,18 @@ def get_state_bills(
     offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
-    # Subquery: find latest date per bill
-    subq = (
-        db.query(
-            BillHistory.bill_id,
-            func.max(BillHistory.date).label("latest_date")
-        )
-        .group_by(BillHistory.bill_id)
-        .subquery()
-    )
-
-    # Join bills with their latest history
+    # last_action/last_action_date live on the bill row itself
     query = (
-        db.query(
-            Bill,
-            BillHistory.date.label("last_action_date"),
-            BillHistory.action.label("last_action"),
-        )
-        .outerjoin(subq, Bill.id == subq.c.bill_id)
-        .outerjoin(
-            BillHistory,
-            (BillHistory.bill_id == subq.c.bill_id) &
-            (BillHistory.date == subq.c.latest_date)
-        )
+        db.query(Bill)
         .filter(Bill.state == state)
+        .order_by(Bill.last_action_date.desc().nullslast(), Bill.id.desc())
     )
 
     total = query.count()
     rows = query.offset(offset).limit(limit).all()
 
     # Map into response
-    bills_out = []
-    for bill, last_date, last_action in rows:
-        bill_dict = schemas.BillOut.from_orm(bill).dict()
-        bill_dict["last_action_date"] = last_date
-        bill_dict["last_action"] = last_action
-        bills_out.append(bill_dict)
+    bills_out = [schemas.BillOut.from_orm(bill).dict() for bill in rows]
 
     next_offset = offset + limit if offset + limit < total else None
     prev_offset = offset - limit if offset - limit >= 0 else None
@@ -1,24 +1,29 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List
-from app.db.session import get_db
-from app.models import Bill, State
+from app.db.session import get_async_db
+from app.models import State, StateBillCount as BillCounts
 from app.schemas.schemas import StateBillCount
+from app.services.cache_service import cached_response_async
 
 router = APIRouter()
 
 @router.get("/", response_model=List[StateBillCount])
-def get_states_with_bill_counts(db: Session = Depends(get_db)):
-    results = (
-        db.query(
-            State.code.label("state"),
-            State.name.label("name"),
-            func.count(Bill.id).label("active_bills")
+async def get_states_with_bill_counts(request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        # Served from the sync-maintained summary: ~50 states x a handful of statuses
+        results = await db.execute(
+            select(
+                State.code.label("state"),
+                State.name.label("name"),
+                func.coalesce(func.sum(BillCounts.bill_count), 0).label("active_bills")
+            )
+            .outerjoin(BillCounts, (BillCounts.state == State.code) & (BillCounts.status > 0))
+            .group_by(State.code, State.name)
+            .order_by(State.code)
         )
-        .outerjoin(Bill, (Bill.state == State.code) & (Bill.status > 0))
-        .group_by(State.code, State.name)
-        .order_by(State.code)
-        .all()
-    )
-    return [StateBillCount(state=row.state, name=row.name, active_bills=row.active_bills) for row in results]
+        # SUM comes back as Decimal on PostgreSQL
+        return [{"state": row.state, "name": row.name, "active_bills": int(row.active_bills)} for row in results]
+
+    return await cached_response_async(request, "states", build)
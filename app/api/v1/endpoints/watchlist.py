@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.users import User
 from app.models.bills import Bill
 from app.models.followed_bills import FollowedBill
 from app.schemas.schemas import WatchlistOut
-from app.core.security import jwt  # From security.py
+from app.core.responses import FastJSONResponse
+from app.core.config import settings
+from app.core.security import jwt, ALGORITHM  # From security.py
 from typing import List
 
 router = APIRouter(prefix="/watchlist")
@@ -30,7 +33,14 @@ def follow_bill(bill_id: int, user: User = Depends(get_current_user), db: Sessio
         raise HTTPException(409, "Already following")
     followed = FollowedBill(user_id=user.id, bill_id=bill_id)
     db.add(followed)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request followed it between the check and the insert
+        db.rollback()
+        if db.query(FollowedBill).filter(FollowedBill.user_id == user.id, FollowedBill.bill_id == bill_id).first():
+            raise HTTPException(409, "Already following")
+        raise
     return {"success": True}
 
 @router.delete("/{bill_id}")
@@ -44,10 +54,17 @@ def unfollow_bill(bill_id: int, user: User = Depends(get_current_user), db: Sess
 
 @router.get("/", response_model=WatchlistOut)
 def get_watchlist(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    items = db.query(FollowedBill).filter(FollowedBill.user_id == user.id).all()
-    return {
+    # One joined query for the titles instead of lazy-loading fb.bill per row
+    items = (
+        db.query(FollowedBill.bill_id, Bill.title)
+        .join(Bill, Bill.id == FollowedBill.bill_id)
+        .filter(FollowedBill.user_id == user.id)
+        .order_by(FollowedBill.id)
+        .all()
+    )
+    return FastJSONResponse({
         "watchlist": [
-            {"bill_id": fb.bill_id, "title": fb.bill.title}
-            for fb in items
+            {"bill_id": bill_id, "title": title}
+            for bill_id, title in items
         ]
-    }
\ No newline at end of file
+    })
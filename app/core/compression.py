@@ -0,0 +1,73 @@
+# app/core/compression.py
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        out = self.compressor.process(body)
+        return out + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Codings the client accepts, leaving out any it disabled with q=0."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip()
+        q = params[2:] if params.startswith("q=") else "1"
+        try:
+            if float(q) > 0:
+                accepted.add(coding.strip())
+        except ValueError:
+            continue
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Negotiates br (when the brotli package is installed) or gzip for
+    responses of at least COMPRESS_MINIMUM_SIZE bytes; smaller ones are not
+    worth the CPU. Strong ETags become weak on compressed responses, since
+    the bytes on the wire differ from the ones the tag was computed over.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            responder = BrotliResponder(self.app, settings.COMPRESS_MINIMUM_SIZE, settings.BROTLI_QUALITY)
+        elif "gzip" in accepted:
+            responder = GZipResponder(self.app, settings.COMPRESS_MINIMUM_SIZE, compresslevel=settings.GZIP_LEVEL)
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_weak_etag(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if "content-encoding" in headers and etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+            await send(message)
+
+        await responder(scope, receive, send_weak_etag)
@@ -5,12 +5,54 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_ASYNC_URL: str = os.getenv("DATABASE_ASYNC_URL")  # defaults to DATABASE_URL via asyncpg
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
     REDIS_URL: str = os.getenv("REDIS_URL")
     LEGISCAN_API_KEY: str = os.getenv("LEGISCAN_API_KEY")
+    LEGISCAN_BASE_URL: str = os.getenv("LEGISCAN_BASE_URL", "https://api.legiscan.com")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     OPENAI_ORGANIZATION: str = os.getenv("OPENAI_ORGANIZATION")
+    LEGISCAN_MAX_CONNECTIONS: int = int(os.getenv("LEGISCAN_MAX_CONNECTIONS", 20))
+    LEGISCAN_MAX_CONCURRENCY: int = int(os.getenv("LEGISCAN_MAX_CONCURRENCY", 10))
+    LEGISCAN_TIMEOUT: float = float(os.getenv("LEGISCAN_TIMEOUT", 30))
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", 300))
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")  # false: build every response
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 2048))
+    CACHE_REDIS_RETRY: int = int(os.getenv("CACHE_REDIS_RETRY", 30))  # seconds on the in-process cache after a Redis error
+    FEED_COUNT_TTL: int = int(os.getenv("FEED_COUNT_TTL", 300))
+    SYNC_UPSERT_CHUNK_SIZE: int = int(os.getenv("SYNC_UPSERT_CHUNK_SIZE", 1000))
+    SYNC_FETCH_CONCURRENCY: int = int(os.getenv("SYNC_FETCH_CONCURRENCY", 10))
+    SYNC_FETCH_RETRIES: int = int(os.getenv("SYNC_FETCH_RETRIES", 3))
+    SYNC_WRITE_BATCH_SIZE: int = int(os.getenv("SYNC_WRITE_BATCH_SIZE", 50))
+    SYNC_FETCH_BACKOFF: float = float(os.getenv("SYNC_FETCH_BACKOFF", 0.5))
+    AI_TIMEOUT: float = float(os.getenv("AI_TIMEOUT", 60))
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", 4))
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", 2))
+    PDF_DOWNLOAD_TIMEOUT: float = float(os.getenv("PDF_DOWNLOAD_TIMEOUT", 15))
+    PDF_PARSE_TIMEOUT: float = float(os.getenv("PDF_PARSE_TIMEOUT", 30))
+    PDF_MAX_CONCURRENCY: int = int(os.getenv("PDF_MAX_CONCURRENCY", 4))
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL") or "memory://"
+    CELERY_ALWAYS_EAGER: bool = os.getenv("CELERY_ALWAYS_EAGER", "false").lower() in ("1", "true", "yes")
+    AI_RATE_LIMIT: str = os.getenv("AI_RATE_LIMIT", "20/m")  # per worker, Celery rate_limit syntax
+    AI_JOB_TTL: int = int(os.getenv("AI_JOB_TTL", 3600))
+    AI_PRIORITY_STATES: list = [s.strip().upper() for s in os.getenv("AI_PRIORITY_STATES", "").split(",") if s.strip()]
+    DATASET_WORKERS: int = int(os.getenv("DATASET_WORKERS", 4))
+    DATASET_CHUNK_SIZE: int = int(os.getenv("DATASET_CHUNK_SIZE", 100))
+    DATASET_DIR: str = os.getenv("DATASET_DIR", "datasets")
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", 500))
+    SLOW_REQUEST_QUERIES: int = int(os.getenv("SLOW_REQUEST_QUERIES", 25))
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", 200))
+    COMPRESS_MINIMUM_SIZE: int = int(os.getenv("COMPRESS_MINIMUM_SIZE", 1024))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", 5))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", 4))
+    SEARCH_MAX_CANDIDATES: int = int(os.getenv("SEARCH_MAX_CANDIDATES", 1000))  # matches ranked per query
+    SEARCH_TEXT_MAX_CHARS: int = int(os.getenv("SEARCH_TEXT_MAX_CHARS", 200_000))  # of each extracted document
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))  # rows per cursor fetch / bills per chunk
 
 settings = Settings()
\ No newline at end of file
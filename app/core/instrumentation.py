@@ -0,0 +1,197 @@
+# app/core/instrumentation.py
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from app.core.config import settings
+
+# Upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """DB activity of one request, filled in by the engine event hooks."""
+
+    __slots__ = ("queries", "db_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# Set per request by the middleware; threadpool endpoints inherit a copy of the
+# context, and since the stats object is shared their queries land on it too
+current_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    metrics.observe_statement(seconds)
+    if seconds * 1000 >= settings.SLOW_QUERY_MS:
+        print(f"🐢 Slow query {seconds * 1000:.1f}ms: {_shorten(statement)}")
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Time every statement on `engine` (pass `async_engine.sync_engine` for the asyncio engine)."""
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "…"
+
+
+class Metrics:
+    """
+    Per-route request counters and histograms in Prometheus text format.
+
+    Kept in-process, so with several uvicorn workers each process reports
+    its own numbers; scrape every worker or run one per container.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))  # (method, route) -> cumulative counts
+        self.duration_sum = defaultdict(float)
+        self.duration_count = defaultdict(int)
+        self.db_queries = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.slow_requests = defaultdict(int)
+        self.statements = 0
+        self.statement_seconds = 0.0
+
+    def observe_statement(self, seconds: float):
+        with self._lock:
+            self.statements += 1
+            self.statement_seconds += seconds
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, slow: bool):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            counts = self.buckets[key]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+            self.duration_sum[key] += seconds
+            self.duration_count[key] += 1
+            self.db_queries[key] += stats.queries
+            self.db_seconds[key] += stats.db_seconds
+            if slow:
+                self.slow_requests[key] += 1
+
+    def render(self) -> str:
+        def labels(**values) -> str:
+            return "{" + ",".join(f'{k}="{v}"' for k, v in values.items()) + "}"
+
+        lines = []
+        with self._lock:
+            lines += ["# HELP http_requests_total Requests served.", "# TYPE http_requests_total counter"]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{labels(method=method, route=route, status=status)} {count}")
+
+            lines += ["# HELP http_request_duration_seconds Request wall time.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (method, route), counts in sorted(self.buckets.items()):
+                for bound, count in zip(DURATION_BUCKETS, counts):
+                    lines.append(f"http_request_duration_seconds_bucket{labels(method=method, route=route, le=bound)} {count}")
+                total = self.duration_count[(method, route)]
+                lines.append(f"http_request_duration_seconds_bucket{labels(method=method, route=route, le='+Inf')} {total}")
+                lines.append(f"http_request_duration_seconds_sum{labels(method=method, route=route)} {self.duration_sum[(method, route)]:.6f}")
+                lines.append(f"http_request_duration_seconds_count{labels(method=method, route=route)} {total}")
+
+            for name, help_text, values, fmt in (
+                ("http_request_db_queries_total", "SQL statements issued while serving requests.", self.db_queries, "{}"),
+                ("http_request_db_seconds_total", "Time spent in SQL statements while serving requests.", self.db_seconds, "{:.6f}"),
+                ("http_slow_requests_total", "Requests over SLOW_REQUEST_MS or SLOW_REQUEST_QUERIES.", self.slow_requests, "{}"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), value in sorted(values.items()):
+                    lines.append(f"{name}{labels(method=method, route=route)} {fmt.format(value)}")
+
+            lines += ["# HELP db_statements_total SQL statements on all engines, requests and workers alike.",
+                      "# TYPE db_statements_total counter", f"db_statements_total {self.statements}",
+                      "# HELP db_statement_seconds_total Time spent in SQL statements on all engines.",
+                      "# TYPE db_statement_seconds_total counter", f"db_statement_seconds_total {self.statement_seconds:.6f}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class QueryStatsMiddleware:
+    """
+    Counts queries and DB time per request, reports them in a Server-Timing
+    header, feeds the /metrics registry and logs requests over the
+    SLOW_REQUEST_MS / SLOW_REQUEST_QUERIES thresholds with their slowest
+    statement. Plain ASGI so streaming responses pass through untouched;
+    queries issued after the headers went out still count in the metrics
+    and the log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                timing = (f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                          f"app;dur={total_ms:.1f}")
+                message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_stats.reset(token)
+            seconds = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            slow = seconds * 1000 >= settings.SLOW_REQUEST_MS or stats.queries >= settings.SLOW_REQUEST_QUERIES
+            metrics.observe_request(scope["method"], route, status, seconds, stats, slow)
+            if slow:
+                print(
+                    f"⚠️ Slow request {scope['method']} {scope['path']} {status}: {seconds * 1000:.1f}ms, "
+                    f"{stats.queries} queries, {stats.db_seconds * 1000:.1f}ms in DB; slowest "
+                    f"{stats.slowest_seconds * 1000:.1f}ms: {_shorten(stats.slowest_statement or '-')}"
+                )
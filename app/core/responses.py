@@ -0,0 +1,34 @@
+# app/core/responses.py
+import json
+from typing import Any
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Compact JSON bytes. Plain dicts/lists of DB values (str, int, datetime,
+    ...) go straight through orjson; anything it does not know, such as
+    Pydantic models or Decimal, is handed to FastAPI's jsonable_encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=jsonable_encoder)
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    Opt-in JSON response for list endpoints that build plain dicts from
+    trusted DB rows. Returning it directly skips response_model validation
+    of every row; keep response_model on the route for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
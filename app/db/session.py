@@ -1,13 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _engine_kwargs(url) -> dict:
+    # SQLite (local checks) uses its own pool classes that take no sizing args
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _async_url(url: str):
+    """Same database as DATABASE_URL, through the asyncio driver."""
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+# Sync stack: sync workers, scripts and the remaining `def` endpoints
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async stack (asyncpg): `async def` endpoints, so queries never block the event loop
+async_database_url = settings.DATABASE_ASYNC_URL or _async_url(settings.DATABASE_URL)
+async_engine = create_async_engine(async_database_url, **_engine_kwargs(async_database_url))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Per-request query counts / DB time for Server-Timing, /metrics and the slow-request log
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,14 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 # from app.api.v1.endpoints import users
-from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.instrumentation import QueryStatsMiddleware, metrics
 from app.api.v1.endpoints import bills, users, states, ai, watchlist#, posts, auth
 from app.db.session import SessionLocal
 from app.api.v1.endpoints import ai
+from app.services.legiscan_service import legiscan
+from app.services.ai_generator_service import close_pdf_client, shutdown_pdf_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled LegiScan client for the lifetime of the worker
+    await legiscan.startup()
+    yield
+    await legiscan.shutdown()
+    await close_pdf_client()
+    shutdown_pdf_pool()
 
 
-app = FastAPI(title="BillTracker API", version="1.0.0")
+app = FastAPI(title="BillTracker API", version="1.0.0", lifespan=lifespan)
 
 # CORS Middleware
 app.add_middleware(
@@ -17,8 +32,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# br/gzip for large bodies, e.g. feed pages and the state map
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so its timing covers compression, CORS and everything below it
+app.add_middleware(QueryStatsMiddleware)
+
 
 
 # app = FastAPI(docs_url=None, redoc_url=None)  # disable docs in production
@@ -36,6 +58,10 @@ def health_check():
     except Exception as e:
         return {"status": "error", "database": str(e)}
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 
 # Users
 app.include_router(users.router, prefix=f"{API_PREFIX}/users", tags=["Users"])
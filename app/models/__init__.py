@@ -1,6 +1,7 @@
 from .base import Base
 from .users import User
-from .bills import Bill, Session, BillHistory, BillText
+from .bills import Bill, Session, BillHistory, BillText, BillPayload, ExtractedText
 from .followed_bills import FollowedBill
 from .posts import Post
-from .state import State
+from .state import State, StateBillCount
+from .sync import SessionSync
@@ -1,11 +1,17 @@
 # models.py (Rewritten to include all relevant fields from LegiScan API response)
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 import datetime
+import json
+import zlib
 
 from app.models.base import Base
 
+# tsvector on PostgreSQL; plain text elsewhere so SQLite test databases still build
+SearchVector = Text().with_variant(TSVECTOR(), "postgresql")
+
 class Session(Base):
     __tablename__ = "sessions"
     id = Column(Integer, primary_key=True)
@@ -26,14 +32,17 @@ class Bill(Base):
     __tablename__ = "bills"
     id = Column(Integer, primary_key=True)  # bill_id from API
     bill_number = Column(String, nullable=False) #number from API
-    change_hash = Column(String)  # For detecting updates
+    change_hash = Column(String)  # For detecting updates; set when getBill details are written
+    masterlist_hash = Column(String, nullable=True)  # change_hash as of the last masterlist or getBill write
     title = Column(Text)
     description = Column(Text)
     ai_summary = Column(Text, nullable=True)  # AI-generated plain-English summary
     ai_impacts = Column(JSON, nullable=True)  # List of who/what affected
     ai_pro_con = Column(JSON, nullable=True)  # Pro/con arguments
-    raw_data = Column(JSON, nullable=True)  # Full original API response for reference
+    ai_input_key = Column(String, nullable=True)  # Fingerprint of the inputs behind the ai_* columns
     last_updated = Column(DateTime, nullable=True)  # Derived from status_date or latest history date
+    last_action = Column(Text, nullable=True)  # Latest history action, maintained by the sync path
+    last_action_date = Column(DateTime, nullable=True)  # Latest history date (falls back to last_updated)
     status = Column(Integer, nullable=True)
     status_date = Column(DateTime)
     state = Column(String)
@@ -47,8 +56,10 @@ class Bill(Base):
     current_body = Column(String)
     current_body_id = Column(Integer)
     pending_committee_id = Column(Integer)
+    # Title (A), description (B) and latest extracted text (C); see search_service
+    search_vector = deferred(Column(SearchVector, nullable=True))
 
-    session_id = Column(Integer, ForeignKey("sessions.id"))
+    session_id = Column(Integer, ForeignKey("sessions.id"), index=True)
     session = relationship("Session", back_populates="bills")
 
     sponsors = relationship("Sponsor", back_populates="bill")
@@ -61,6 +72,27 @@ class Bill(Base):
     supplements = relationship("Supplement", back_populates="bill")  # Placeholder
     sasts = relationship("Sast", back_populates="bill")  # Similar bills
     posts = relationship("Post", back_populates="bill")  # Community posts
+    # Full getBill response, in its own table so bill queries never drag it along
+    payload = relationship("BillPayload", uselist=False, back_populates="bill")
+
+    @property
+    def raw_data(self):
+        """Original getBill payload; one extra query, on first access only."""
+        return self.payload.data if self.payload else None
+
+    __table_args__ = (
+        # State feed: WHERE state = ? ORDER BY last_action_date DESC, id DESC
+        Index(
+            "ix_bills_state_last_action_date",
+            "state",
+            last_action_date.desc().nullslast(),
+            id.desc(),
+        ).ddl_if(dialect="postgresql"),  # NULLS LAST in an index is PostgreSQL-only
+        # States map: WHERE state = ? AND status > 0
+        Index("ix_bills_state_status", "state", "status"),
+        # Search: WHERE search_vector @@ query
+        Index("ix_bills_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 class Sponsor(Base):
     __tablename__ = "sponsors"
@@ -90,7 +122,7 @@ class Sponsor(Base):
     committee_id = Column(Integer)
     state_federal = Column(Integer)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="sponsors")
 
 class Referral(Base):
@@ -102,7 +134,7 @@ class Referral(Base):
     chamber_id = Column(Integer)
     name = Column(String)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="referrals")
 
 class BillHistory(Base):
@@ -114,7 +146,7 @@ class BillHistory(Base):
     chamber_id = Column(Integer)
     importance = Column(Integer)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="history")
 
 class BillText(Base):
@@ -131,7 +163,7 @@ class BillText(Base):
     text_size = Column(Integer)
     text_hash = Column(String)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="texts")
 
 class CalendarEvent(Base):
@@ -145,7 +177,7 @@ class CalendarEvent(Base):
     location = Column(String)
     description = Column(Text)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="calendar")
 
 class Vote(Base):
@@ -156,7 +188,7 @@ class Vote(Base):
     # date = Column(DateTime)
     # etc.
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="votes")
 
 class Amendment(Base):
@@ -164,7 +196,7 @@ class Amendment(Base):
     id = Column(Integer, primary_key=True)
     # Placeholder; expand as needed (e.g., amendment_id, date, title, url)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="amendments")
 
 class Supplement(Base):
@@ -172,7 +204,7 @@ class Supplement(Base):
     id = Column(Integer, primary_key=True)
     # Placeholder; expand as needed (e.g., supplement_id, type, date, title, url)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="supplements")
 
 class Sast(Base):
@@ -183,5 +215,39 @@ class Sast(Base):
     sast_bill_number = Column(String)
     sast_bill_id = Column(Integer)
 
-    bill_id = Column(Integer, ForeignKey("bills.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
     bill = relationship("Bill", back_populates="sasts")
+
+class BillPayload(Base):
+    """
+    Last getBill response stored for a bill, as zlib-compressed JSON.
+    `change_hash` is the bill's hash at the time, so the writer can skip
+    rewriting payloads that have not changed.
+    """
+    __tablename__ = "bill_payloads"
+    bill_id = Column(Integer, ForeignKey("bills.id"), primary_key=True)
+    change_hash = Column(String)
+    content = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+    bill = relationship("Bill", back_populates="payload")
+
+    @property
+    def data(self) -> dict:
+        return json.loads(zlib.decompress(self.content))
+
+
+def pack_payload(bill_info: dict) -> bytes:
+    return zlib.compress(json.dumps(bill_info, separators=(",", ":")).encode("utf-8"), 6)
+
+class ExtractedText(Base):
+    """
+    Text layer of a bill document, keyed by LegiScan's text_hash so each
+    distinct document is downloaded and parsed once. `content` is
+    zlib-compressed UTF-8.
+    """
+    __tablename__ = "extracted_texts"
+    text_hash = Column(String, primary_key=True)
+    doc_id = Column(Integer, index=True)
+    content = Column(LargeBinary, nullable=False)
+    search_vector = deferred(Column(SearchVector, nullable=True))  # weight C, folded into bills.search_vector
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
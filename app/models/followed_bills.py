@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -7,7 +7,12 @@ class FollowedBill(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    bill_id = Column(Integer, ForeignKey("bills.id"), nullable=False)
+    bill_id = Column(Integer, ForeignKey("bills.id"), nullable=False, index=True)
 
     user = relationship("User", back_populates="watchlist")
-    bill = relationship("Bill")
\ No newline at end of file
+    bill = relationship("Bill")
+
+    __table_args__ = (
+        # One follow per (user, bill); also serves the user's watchlist lookup
+        UniqueConstraint("user_id", "bill_id", name="uq_followed_bills_user_bill"),
+    )
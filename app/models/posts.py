@@ -10,8 +10,8 @@ class Post(Base):
     __tablename__ = "posts"
 
     id = Column(Integer, primary_key=True, index=True)
-    bill_id = Column(Integer, ForeignKey("bills.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    bill_id = Column(Integer, ForeignKey("bills.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     content = Column(String)
     upvotes = Column(Integer, default=0)
     downvotes = Column(Integer, default=0)
@@ -12,16 +12,9 @@ def get_state_bills_raw_model(db, state: str, limit: int, offset: int):
             b.status,
             b.title,
             b.description,
-            h.date AS last_action_date,
-            h.action AS last_action
+            b.last_action_date,
+            b.last_action
         FROM bills b
-        LEFT JOIN bill_history h
-            ON h.bill_id = b.id
-           AND h.date = (
-               SELECT MAX(date)
-               FROM bill_history
-               WHERE bill_id = b.id
-           )
         WHERE b.state = :state
         ORDER BY b.id
         LIMIT :limit OFFSET :offset;
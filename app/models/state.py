@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Integer
 from app.models.base import Base
 
 class State(Base):
@@ -6,3 +6,11 @@ class State(Base):
 
     code = Column(String, primary_key=True, index=True)  # e.g. "MN"
     name = Column(String, nullable=False)                # e.g. "Minnesota"
+
+class StateBillCount(Base):
+    """Bills per (state, status); bill writers apply their deltas, the masterlist sync recounts its state."""
+    __tablename__ = "state_bill_counts"
+
+    state = Column(String, primary_key=True)
+    status = Column(Integer, primary_key=True)
+    bill_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.models.base import Base
+
+
+class SessionSync(Base):
+    """Last LegiScan session_hash the sync planner fully applied, per session."""
+    __tablename__ = "session_syncs"
+
+    session_id = Column(Integer, primary_key=True)  # LegiScan session_id
+    state = Column(String, nullable=False, index=True)
+    session_hash = Column(String)
+    synced_at = Column(DateTime)
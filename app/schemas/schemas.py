@@ -273,8 +273,9 @@ class Bill(BaseModel):
     ai_summary: Optional[str] = None
     ai_impacts: Optional[Union[List[Dict], str]] = None
     ai_pro_con: Optional[Union[List[Dict], str]] = None
-    raw_data: Optional[Dict] = None  # ← Make Optional
     last_updated: Optional[datetime] = None
+    last_action: Optional[str] = None
+    last_action_date: Optional[datetime] = None
     status: Optional[int] = None  # ← Changed from int to Optional[int]
     status_date: Optional[datetime] = None
     state: Optional[str] = None
@@ -348,13 +349,30 @@ class BillListItem(BaseModel):
     last_action: Optional[str]
 
 class PaginatedBills(BaseModel):
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     limit: int
     offset: int
     next_offset: Optional[int] = None
     prev_offset: Optional[int] = None
+    next_cursor: Optional[str] = None  # Opaque keyset cursor for the next page
     bills: List[BillListItem]
 
+class BillSearchItem(BaseModel):
+    id: int
+    bill_number: str
+    state: Optional[str]
+    title: Optional[str]
+    status: Optional[int]
+    last_action_date: Optional[datetime]
+    last_action: Optional[str]
+    rank: float
+
+class BillSearchResults(BaseModel):
+    limit: int
+    truncated: bool = False  # More matches than SEARCH_MAX_CANDIDATES; only the newest were ranked
+    next_cursor: Optional[str] = None  # Opaque keyset cursor for the next page
+    bills: List[BillSearchItem]
+
 # For states endpoint
 class StateBillCountOut(StateBillCount):
     pass
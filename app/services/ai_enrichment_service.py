@@ -1,23 +1,44 @@
 # app/services/ai_enrichment_service.py
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import bills
-from app.services.ai_generator_service import generate_bill_ai_summary
+from app.services.cache_service import invalidate_async
+from app.services.ai_generator_service import ai_input_key, generate_bill_ai_summary, select_bill_texts
 import json
 
 
-async def enrich_bill_with_ai(db: Session, bill_id: int, mode: str = "latest"):
+def _from_json(value):
+    # ai_impacts / ai_pro_con are stored as JSON-encoded strings
+    return json.loads(value) if isinstance(value, str) else value
+
+
+async def enrich_bill_with_ai(db: AsyncSession, bill_id: int, mode: str = "latest", force: bool = False):
     """
     Fetches bill text, runs AI analysis, and updates the Bill record
     with structured data (summary, impacts, pros/cons).
+
+    The stored analysis is returned without calling the LLM when the bill's
+    texts, mode, prompt version and model match the last run (`force` skips this).
     """
-    db_bill = db.query(bills.Bill).filter(bills.Bill.id == bill_id).first()
+    db_bill = await db.get(bills.Bill, bill_id)
     print(f"Found bill: {db_bill.title if db_bill else 'None'}")
     
     if not db_bill:
         return {"error": "Bill not found"}
 
+    texts = await select_bill_texts(db, bill_id, mode)
+    input_key = ai_input_key(texts, mode)
+    if not force and texts and db_bill.ai_input_key == input_key and db_bill.ai_summary:
+        return {
+            "success": True,
+            "cached": True,
+            "bill_id": bill_id,
+            "ai_summary": db_bill.ai_summary,
+            "ai_impacts": _from_json(db_bill.ai_impacts),
+            "ai_pro_con": _from_json(db_bill.ai_pro_con),
+        }
+
     # Generate AI insights
-    ai_result = await generate_bill_ai_summary(db, bill_id, mode)
+    ai_result = await generate_bill_ai_summary(db, bill_id, mode, texts=texts)
 
     if ai_result.get("error"):
         return ai_result
@@ -30,9 +51,10 @@ async def enrich_bill_with_ai(db: Session, bill_id: int, mode: str = "latest"):
     
     # Store pros/cons as JSON
     db_bill.ai_pro_con = json.dumps(ai_result.get("ai_pro_con", []))
+    db_bill.ai_input_key = input_key
 
-    db.commit()
-    db.refresh(db_bill)
+    await db.commit()
+    await invalidate_async(f"bill:{bill_id}")  # cached detail pages carry the ai_* fields
     
     return {
         "success": True,
@@ -1,41 +1,166 @@
 # app/services/ai_generator_service.py
+import asyncio
+import hashlib
 import io
 import json
-import requests
-from typing import Optional, Literal, Dict, List
-from openai import OpenAI
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Literal, Dict, List, Tuple
+
+import httpx
 from PyPDF2 import PdfReader
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BillText
-from app.db.session import get_db
 from app.core.config import settings
+from app.services.ai_service import get_client, llm_slots
+from app.services.text_store_service import load_extracted_texts, save_extracted_texts
+
+# Part of the AI result cache key: bump PROMPT_VERSION whenever the prompt
+# below changes so stored analyses are regenerated.
+AI_MODEL = "mistralai/mistral-7b-instruct"
+PROMPT_VERSION = "bill-analysis-v1"
+
+# PyPDF2 is pure Python and CPU-bound, so parsing runs in worker processes
+# (not threads) to keep the GIL free for the event loop. Created lazily.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _recycle_pdf_pool(pool: ProcessPoolExecutor):
+    """
+    Kill a pool whose worker is stuck on a parse: a running job cannot be
+    cancelled, and it would hold the worker for good. Jobs still on the
+    pool fail; the next parse starts a fresh pool.
+    """
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    for process in list((pool._processes or {}).values()):  # no public API before Python 3.14
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
 
-client = OpenAI(
-    api_key=settings.OPENAI_ORGANIZATION,
-    base_url="https://openrouter.ai/api/v1",
+
+# One pooled download client and one semaphore per event loop (both bind to
+# the loop that first uses them). The semaphore caps downloads and the parse
+# jobs queued behind them, however many texts a caller asks for at once.
+_pdf_per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
 )
 
-def extract_pdf_text(url: str) -> Optional[str]:
+
+def _pdf_loop_state() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    state = _pdf_per_loop.get(loop)
+    if state is None or state[0].is_closed:
+        http = httpx.AsyncClient(
+            timeout=settings.PDF_DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=settings.PDF_MAX_CONCURRENCY),
+        )
+        state = _pdf_per_loop[loop] = (http, asyncio.Semaphore(settings.PDF_MAX_CONCURRENCY))
+    return state
+
+
+async def close_pdf_client():
+    """Close the running loop's download client; call on shutdown."""
+    state = _pdf_per_loop.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state[0].aclose()
+
+
+def parse_pdf_bytes(data: bytes) -> str:
+    """Extract the text layer of a PDF. Runs inside the PDF worker pool."""
+    with io.BytesIO(data) as pdf_file:
+        reader = PdfReader(pdf_file)
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return text.strip()
+
+
+async def extract_pdf_text(url: str) -> Optional[str]:
     """
     Download and extract text from a PDF at the given URL.
-    Returns None if download or extraction fails.
+    Returns None if download or extraction fails or times out. At most
+    PDF_MAX_CONCURRENCY run at once per event loop.
     """
-    try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        with io.BytesIO(response.content) as pdf_file:
-            reader = PdfReader(pdf_file)
-            text = "\n".join(page.extract_text() or "" for page in reader.pages)
-        return text.strip()
-    except Exception as e:
-        print(f"⚠️ Failed to extract PDF from {url}: {e}")
-        return None
+    http, slots = _pdf_loop_state()
+    async with slots:
+        try:
+            response = await http.get(url)
+            response.raise_for_status()
+            pool = _get_pdf_pool()
+            parse = asyncio.get_running_loop().run_in_executor(pool, parse_pdf_bytes, response.content)
+            try:
+                return await asyncio.wait_for(parse, settings.PDF_PARSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                _recycle_pdf_pool(pool)
+                raise
+        except Exception as e:
+            print(f"⚠️ Failed to extract PDF from {url}: {e!r}")
+            return None
+
+
+async def load_bill_texts(db: AsyncSession, texts: List[BillText]) -> List[Optional[str]]:
+    """
+    Extracted text for each BillText, in order. Documents already in the
+    text store (by text_hash) cost no network or PDF work; the rest are
+    downloaded concurrently (up to PDF_MAX_CONCURRENCY), parsed in the PDF
+    pool and stored.
+    """
+    stored = await load_extracted_texts(db, (t.text_hash for t in texts))
+
+    missing: Dict[str, BillText] = {}
+    for t in texts:
+        if t.text_hash not in stored:
+            missing.setdefault(t.text_hash or t.state_link, t)
+    fetched = dict(zip(
+        missing,
+        await asyncio.gather(*(extract_pdf_text(t.state_link) for t in missing.values())),
+    ))
+
+    await save_extracted_texts(db, {
+        t.text_hash: (t.doc_id, fetched[t.text_hash])
+        for t in missing.values()
+        if t.text_hash and fetched[t.text_hash]
+    })
+    return [stored.get(t.text_hash) or fetched.get(t.text_hash or t.state_link) for t in texts]
+
+
+async def select_bill_texts(db: AsyncSession, bill_id: int, mode: str = "latest") -> List[BillText]:
+    """The BillText rows an analysis in `mode` is built from."""
+    query = select(BillText).where(BillText.bill_id == bill_id)
+    if mode == "latest":
+        query = query.order_by(BillText.date.desc()).limit(1)
+    else:
+        query = query.order_by(BillText.date.asc())
+    return list((await db.scalars(query)).all())
+
+
+def ai_input_key(texts: List[BillText], mode: str) -> str:
+    """Fingerprint of everything an analysis depends on: texts, mode, prompt and model."""
+    parts = [PROMPT_VERSION, AI_MODEL, mode, *(t.text_hash or t.state_link or "" for t in texts)]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
 
 
 async def generate_bill_ai_summary(
-    db,
+    db: AsyncSession,
     bill_id: int,
-    mode: Literal["latest", "full"] = "latest"
+    mode: Literal["latest", "full"] = "latest",
+    texts: Optional[List[BillText]] = None,
 ) -> Dict:
     """
     Generates structured AI analysis for a bill including:
@@ -47,34 +172,19 @@ async def generate_bill_ai_summary(
         - 'latest' → use the most recent bill text
         - 'full' → combine all bill versions
     """
-    # Step 1: Fetch bill texts from DB
-    if mode == "latest":
-        texts = (
-            db.query(BillText)
-            .filter(BillText.bill_id == bill_id)
-            .order_by(BillText.date.desc())
-            .limit(1)
-            .all()
-        )
-    else:
-        texts = (
-            db.query(BillText)
-            .filter(BillText.bill_id == bill_id)
-            .order_by(BillText.date.asc())
-            .all()
-        )
+    # Step 1: Fetch bill texts from DB (unless the caller already did)
+    if texts is None:
+        texts = await select_bill_texts(db, bill_id, mode)
 
     if not texts:
         return {"error": "No bill texts found for this bill."}
 
     # Step 2: Extract text from PDFs
     print(f"Extracting text from {len(texts)} bill version(s)...")
+    pdf_texts = [t for t in texts if t.state_link and t.state_link.endswith("=pdf")]
+    extracted = await load_bill_texts(db, pdf_texts)
     combined_texts = []
-    for t in texts:
-        print(f"Processing bill text ID {t.id} from {t.state_link}")
-        if not t.state_link or not t.state_link.endswith("=pdf"):
-            continue
-        pdf_text = extract_pdf_text(t.state_link)
+    for t, pdf_text in zip(pdf_texts, extracted):
         print(f"Extracted {len(pdf_text) if pdf_text else 0} chars from {t.state_link}")
         if pdf_text:
             combined_texts.append(
@@ -117,17 +227,18 @@ Guidelines:
 Respond with ONLY the JSON object, no other text.
 """
 
-        response = client.chat.completions.create(
-            model="mistralai/mistral-7b-instruct",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are an expert legislative analyst. Always respond with valid JSON only."
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
+        async with llm_slots():
+            response = await get_client().chat.completions.create(
+                model=AI_MODEL,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": "You are an expert legislative analyst. Always respond with valid JSON only."
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+            )
 
         ai_output = response.choices[0].message.content.strip()
         
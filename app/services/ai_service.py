@@ -1,15 +1,42 @@
 # app/services/ai_service.py
-from openai import OpenAI
+import asyncio
+import weakref
+from openai import AsyncOpenAI
 from app.core.config import settings
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import json
 
-# client = OpenAI(api_key=settings.OPENAI_ORGANIZATION)
-client = OpenAI(
-    api_key=settings.OPENAI_ORGANIZATION,
-    base_url="https://openrouter.ai/api/v1",  # 👈 OpenRouter base
+# Client and semaphore per event loop: both bind to the loop that first
+# uses them, and the API, Celery's worker loop and scripts each run their own
+_per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
 )
 
+
+def _loop_state() -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    state = _per_loop.get(loop)
+    if state is None:
+        # client = OpenAI(api_key=settings.OPENAI_ORGANIZATION)
+        client = AsyncOpenAI(
+            api_key=settings.OPENAI_ORGANIZATION,
+            base_url="https://openrouter.ai/api/v1",  # 👈 OpenRouter base
+            timeout=settings.AI_TIMEOUT,
+        )
+        state = _per_loop[loop] = (client, asyncio.Semaphore(settings.AI_MAX_CONCURRENCY))
+    return state
+
+
+def get_client() -> AsyncOpenAI:
+    """The running loop's OpenRouter client (pooled connections are per loop)."""
+    return _loop_state()[0]
+
+
+def llm_slots() -> asyncio.Semaphore:
+    """Caps in-flight LLM calls per loop, shared by every AI code path on it."""
+    return _loop_state()[1]
+
+
 async def generate_bill_summary(bill_text: str) -> dict:
     """
     Uses OpenAI to analyze a legislative bill text and return:
@@ -47,18 +74,19 @@ async def generate_bill_summary(bill_text: str) -> dict:
     #     temperature=0.4,
     # )
 
-    response = client.chat.completions.create(
-        model="mistralai/mistral-7b-instruct",
-        messages=[
-            {"role": "system", "content": "You are an expert legislative policy analyst."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.7,
-        extra_headers={
-            "HTTP-Referer": "http://localhost",
-            "X-Title": "Sphere Legislative Analyzer"
-        }
-    )
+    async with llm_slots():
+        response = await get_client().chat.completions.create(
+            model="mistralai/mistral-7b-instruct",
+            messages=[
+                {"role": "system", "content": "You are an expert legislative policy analyst."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.7,
+            extra_headers={
+                "HTTP-Referer": "http://localhost",
+                "X-Title": "Sphere Legislative Analyzer"
+            }
+        )
     # Parse JSON directly from OpenAI structured output
     ai_data = response.choices[0].message.parsed
 
@@ -92,15 +120,16 @@ async def generate_openai_summary(title: str, description: str, text_content: st
     #     messages=[{"role": "user", "content": prompt}],
     #     temperature=0.7,
     # )
-    response = client.chat.completions.create(
-        model="mistralai/mistral-7b-instruct",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.7,
-        extra_headers={
-            "HTTP-Referer": "http://localhost",
-            "X-Title": "Sphere Legislative Analyzer"
-        }
-    )
+    async with llm_slots():
+        response = await get_client().chat.completions.create(
+            model="mistralai/mistral-7b-instruct",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            extra_headers={
+                "HTTP-Referer": "http://localhost",
+                "X-Title": "Sphere Legislative Analyzer"
+            }
+        )
 
     content = response.choices[0].message.content
     return parse_ai_response(content)
@@ -137,10 +166,11 @@ async def generate_bill_ai(bill: Dict) -> Dict[str, Any]:
 
     Neutral • Factual • Concise • Key stakeholders only."""
         
-    resp = client.chat.completions.create(
-        model="mistralai/mistral-7b-instruct",
-        messages=[{"role": "user", "content": prompt}],
-        response_format={"type": "json_object"},
-        max_tokens=800
-    )
+    async with llm_slots():
+        resp = await get_client().chat.completions.create(
+            model="mistralai/mistral-7b-instruct",
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            max_tokens=800
+        )
     return json.loads(resp.choices[0].message.content)
\ No newline at end of file
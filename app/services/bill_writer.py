@@ -0,0 +1,288 @@
+# app/services/bill_writer.py
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models import bills
+from app.services.sync_legiscan import upsert_session
+from app.services.cache_service import response_cache
+from app.services.state_count_service import apply_state_count_deltas, bill_statuses, lock_state_counts
+from app.services.search_service import refresh_search_vectors
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%d") if value else None
+
+
+# ---------- getBill payload -> row dicts ----------
+
+def bill_row(bill_info: Dict[str, Any]) -> Dict[str, Any]:
+    status_date = _parse_date(bill_info.get("status_date"))
+
+    # Latest history entry; on equal dates LegiScan lists the newer action last
+    dated = [(_parse_date(h["date"]), i, h) for i, h in enumerate(bill_info.get("history", [])) if h.get("date")]
+    last_action_date, _, last_hist = max(dated, key=lambda d: d[:2]) if dated else (None, None, {})
+
+    # last_updated: max of status_date and the latest history date
+    last_updated = status_date
+    if last_action_date and (not last_updated or last_action_date > last_updated):
+        last_updated = last_action_date
+
+    return {
+        "id": bill_info["bill_id"],
+        "bill_number": bill_info["bill_number"],
+        "change_hash": bill_info["change_hash"],
+        "masterlist_hash": bill_info["change_hash"],  # details are current, so the masterlist row is too
+        "title": bill_info.get("title"),
+        "description": bill_info.get("description"),
+        "status": bill_info.get("status"),
+        "status_date": status_date,
+        "state": bill_info.get("state"),
+        "url": bill_info.get("url"),
+        "state_link": bill_info.get("state_link"),
+        "completed": bill_info.get("completed"),
+        "bill_type": bill_info.get("bill_type"),
+        "bill_type_id": bill_info.get("bill_type_id"),
+        "body": bill_info.get("body"),
+        "body_id": bill_info.get("body_id"),
+        "current_body": bill_info.get("current_body"),
+        "current_body_id": bill_info.get("current_body_id"),
+        "pending_committee_id": bill_info.get("pending_committee_id"),
+        "last_updated": last_updated,
+        "last_action": last_hist.get("action"),
+        "last_action_date": last_action_date or last_updated,
+        "session_id": (bill_info.get("session") or {}).get("session_id"),
+    }
+
+
+def sponsor_row(sponsor: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "people_id": sponsor.get("people_id"),
+        "person_hash": sponsor.get("person_hash"),
+        "party_id": sponsor.get("party_id"),
+        "party": sponsor.get("party"),
+        "role_id": sponsor.get("role_id"),
+        "role": sponsor.get("role"),
+        "name": sponsor.get("name"),
+        "first_name": sponsor.get("first_name"),
+        "middle_name": sponsor.get("middle_name"),
+        "last_name": sponsor.get("last_name"),
+        "suffix": sponsor.get("suffix"),
+        "nickname": sponsor.get("nickname"),
+        "district": sponsor.get("district"),
+        "ftm_eid": sponsor.get("ftm_eid"),
+        "votesmart_id": sponsor.get("votesmart_id"),
+        "opensecrets_id": sponsor.get("opensecrets_id"),
+        "knowwho_pid": sponsor.get("knowwho_pid"),
+        "ballotpedia": sponsor.get("ballotpedia"),
+        "bioguide_id": sponsor.get("bioguide_id"),
+        "sponsor_type_id": sponsor.get("sponsor_type_id"),
+        "sponsor_order": sponsor.get("sponsor_order"),
+        "committee_sponsor": sponsor.get("committee_sponsor"),
+        "committee_id": sponsor.get("committee_id"),
+        "state_federal": sponsor.get("state_federal"),
+    }
+
+
+def referral_row(referral: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "date": _parse_date(referral.get("date")),
+        "committee_id": referral.get("committee_id"),
+        "chamber": referral.get("chamber"),
+        "chamber_id": referral.get("chamber_id"),
+        "name": referral.get("name"),
+    }
+
+
+def history_row(hist: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "date": _parse_date(hist.get("date")),
+        "action": hist.get("action"),
+        "chamber": hist.get("chamber"),
+        "chamber_id": hist.get("chamber_id"),
+        "importance": hist.get("importance"),
+    }
+
+
+def text_row(text: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "doc_id": text.get("doc_id"),
+        "date": _parse_date(text.get("date")),
+        "type": text.get("type"),
+        "type_id": text.get("type_id"),
+        "mime": text.get("mime"),
+        "mime_id": text.get("mime_id"),
+        "url": text.get("url"),
+        "state_link": text.get("state_link"),
+        "text_size": text.get("text_size"),
+        "text_hash": text.get("text_hash"),
+    }
+
+
+def calendar_row(cal: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type_id": cal.get("type_id"),
+        "type": cal.get("type"),
+        "event_hash": cal.get("event_hash"),
+        "date": _parse_date(cal.get("date")),
+        "time": cal.get("time"),
+        "location": cal.get("location"),
+        "description": cal.get("description"),
+    }
+
+
+def sast_row(sast: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type_id": sast.get("type_id"),
+        "type": sast.get("type"),
+        "sast_bill_number": sast.get("sast_bill_number"),
+        "sast_bill_id": sast.get("sast_bill_id"),
+    }
+
+
+# (model, getBill key, row builder). Votes, amendments and supplements are
+# still placeholder tables that nothing populates, so there is nothing to diff.
+CHILD_TABLES = (
+    (bills.Sponsor, "sponsors", sponsor_row),
+    (bills.Referral, "referrals", referral_row),
+    (bills.BillHistory, "history", history_row),
+    (bills.BillText, "texts", text_row),
+    (bills.CalendarEvent, "calendar", calendar_row),
+    (bills.Sast, "sasts", sast_row),
+)
+
+
+# ---------- writers ----------
+
+def _content_key(model, columns):
+    """
+    Build a row -> tuple function that coerces payload values to the column
+    types, so e.g. LegiScan's string `party_id` compares equal to the stored int.
+    """
+    types = [getattr(model, c).type.python_type for c in columns]
+
+    def coerce(value, type_):
+        if value is None or isinstance(value, type_):
+            return value
+        try:
+            return type_(value)
+        except (TypeError, ValueError):
+            return value
+
+    def key(row):
+        return tuple(coerce(row[c], t) for c, t in zip(columns, types))
+    return key
+
+
+def upsert_bills(db: Session, rows: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT DO UPDATE for full getBill rows; leaves ai_* alone."""
+    if not rows:
+        return
+    stmt = pg_insert(bills.Bill).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[bills.Bill.id],
+        set_={col: stmt.excluded[col] for col in rows[0] if col != "id"},
+    )
+    db.execute(stmt)
+
+
+def upsert_payloads(db: Session, bill_infos: List[Dict[str, Any]]):
+    """Store each raw getBill payload compressed; rows whose change_hash is unchanged are not rewritten."""
+    if not bill_infos:
+        return
+    rows = [
+        {"bill_id": b["bill_id"], "change_hash": b.get("change_hash"), "content": bills.pack_payload(b),
+         "updated_at": datetime.utcnow()}
+        for b in bill_infos
+    ]
+    stmt = pg_insert(bills.BillPayload).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[bills.BillPayload.bill_id],
+        set_={col: stmt.excluded[col] for col in ("change_hash", "content", "updated_at")},
+        where=bills.BillPayload.change_hash.is_distinct_from(stmt.excluded.change_hash),
+    )
+    db.execute(stmt)
+
+
+def replace_children(db: Session, bill_infos: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Bring every child table in line with the getBill payloads for many
+    bills at once. Rows are compared by content, so children that did not
+    change are neither deleted nor re-inserted: per table this is one
+    SELECT, at most one DELETE and one executemany INSERT.
+    """
+    bill_ids = [b["bill_id"] for b in bill_infos]
+    stats = {}
+
+    for model, payload_key, build in CHILD_TABLES:
+        wanted = {b["bill_id"]: [build(item) for item in b.get(payload_key) or []] for b in bill_infos}
+        columns = list(build({}))
+        content = _content_key(model, columns)
+
+        existing = defaultdict(list)
+        for row in (
+            db.query(model.id, model.bill_id, *[getattr(model, c) for c in columns])
+            .filter(model.bill_id.in_(bill_ids))
+        ):
+            existing[row.bill_id].append((row.id, tuple(getattr(row, c) for c in columns)))
+
+        stale_ids, new_rows, changed = [], [], set()
+        for bill_id, rows in wanted.items():
+            keep = Counter(content(r) for r in rows)
+            for child_id, stored in existing.get(bill_id, []):
+                if keep[stored] > 0:
+                    keep[stored] -= 1  # unchanged child, leave it in place
+                else:
+                    stale_ids.append(child_id)
+                    changed.add(bill_id)
+            for r in rows:
+                row_key = content(r)
+                if keep[row_key] > 0:
+                    keep[row_key] -= 1
+                    new_rows.append({**r, "bill_id": bill_id})
+                    changed.add(bill_id)
+
+        if stale_ids:
+            db.query(model).filter(model.id.in_(stale_ids)).delete(synchronize_session=False)
+        if new_rows:
+            db.execute(insert(model), new_rows)
+
+        stats[model.__tablename__] = {
+            "deleted": len(stale_ids),
+            "inserted": len(new_rows),
+            "changed_bill_ids": sorted(changed),
+        }
+
+    return stats
+
+
+def write_bills(db: Session, bill_infos: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Persist a batch of getBill payloads (sessions, bill rows, children)
+    in one transaction. Returns per-table child insert/delete counts and
+    the ids of the bills whose rows in that table changed.
+    """
+    if not bill_infos:
+        return {}
+    try:
+        sessions = {b["session"]["session_id"]: b["session"] for b in bill_infos if b.get("session")}
+        for session_info in sessions.values():
+            upsert_session(db, session_info)
+        bill_ids = [b["bill_id"] for b in bill_infos]
+        lock_state_counts(db, (b.get("state") for b in bill_infos))
+        statuses_before = bill_statuses(db, bill_ids)
+        upsert_bills(db, [bill_row(b) for b in bill_infos])
+        upsert_payloads(db, bill_infos)
+        stats = replace_children(db, bill_infos)
+        refresh_search_vectors(db, bill_ids)
+        # Per-state summary moves by this batch's status changes only
+        apply_state_count_deltas(db, statuses_before, bill_statuses(db, bill_ids))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    response_cache.invalidate_bills((b["bill_id"] for b in bill_infos), (b.get("state") for b in bill_infos))
+    return stats
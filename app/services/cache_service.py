@@ -0,0 +1,240 @@
+# app/services/cache_service.py
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.responses import dumps
+
+try:
+    import redis
+except ImportError:  # cache still works in-process without the redis package
+    redis = None
+
+
+class LRUBackend:
+    """In-process LRU with per-entry TTL; used when Redis is not reachable."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class ResponseCache:
+    """
+    JSON response cache keyed by namespace + query params.
+
+    Invalidation is by namespace generation: every key embeds the current
+    generation of its namespace (`bill:<id>`, `feed:<STATE>`, `states`), so
+    replacing the generation drops all of a namespace's entries in O(1) on
+    either backend. Generations are random tokens that expire a while after
+    the entries they guard, so Redis keeps no per-bill key for good. A
+    missing generation (expired or evicted) gets a fresh token, never a
+    fixed default, so entries cached under an older one stay unreachable.
+    In-process generations live outside the LRU: evicting one with the
+    entries would bring stale ones back.
+
+    Falls back to an in-process LRU if Redis is unset or stops answering,
+    and tries Redis again CACHE_REDIS_RETRY seconds later. Invalidations
+    made during an outage are replayed to Redis on reconnect.
+    """
+
+    def __init__(self, client=None, ttl: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl or settings.CACHE_TTL
+        self.lru = LRUBackend(max_entries or settings.CACHE_MAX_ENTRIES)
+        if client is None and redis is not None and settings.REDIS_URL:
+            client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+        self.redis = client
+        self._retry_at = 0.0
+        self._missed = set()  # namespaces invalidated while Redis was down
+        self._generations: Dict[str, Tuple[float, str]] = {}  # namespace -> (expires_at, token), in-process
+        self._lock = threading.Lock()
+
+    @property
+    def generation_ttl(self) -> int:
+        # Outlives every entry written under the generation
+        return 2 * self.ttl
+
+    @property
+    def backend(self):
+        if self.redis is None or time.monotonic() < self._retry_at:
+            return self.lru
+        if self._missed:
+            with self._lock:
+                missed, self._missed = self._missed, set()
+            try:
+                self._bump_redis(missed)
+            except Exception as e:
+                self._redis_failed(e, missed)
+                return self.lru
+        return self.redis
+
+    def _redis_failed(self, error: Exception, namespaces: Iterable[str] = ()):
+        print(f"⚠️ Redis unavailable ({error}); using the in-process cache for {settings.CACHE_REDIS_RETRY}s")
+        with self._lock:
+            self._retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY
+            self._missed.update(namespaces)
+
+    def _call(self, method: str, *args):
+        backend = self.backend
+        try:
+            return getattr(backend, method)(*args)
+        except Exception as e:
+            if backend is self.lru:
+                raise
+            self._redis_failed(e)
+            return getattr(self.lru, method)(*args)
+
+    def _local_generation(self, namespace: str, replace: bool = False) -> str:
+        now = time.monotonic()
+        with self._lock:
+            item = self._generations.get(namespace)
+            if replace or item is None or item[0] < now:
+                if len(self._generations) >= 2 * self.lru.max_entries:
+                    self._generations = {ns: gen for ns, gen in self._generations.items() if gen[0] >= now}
+                item = self._generations[namespace] = (now + self.generation_ttl, uuid.uuid4().hex)
+            return item[1]
+
+    def _redis_generation(self, namespace: str) -> str:
+        key = f"gen:{namespace}"
+        value = self.redis.get(key)
+        if value is None:
+            # NX: workers racing on a missing generation all settle on one token
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(key, uuid.uuid4().hex, nx=True, ex=self.generation_ttl)
+            pipe.get(key)
+            value = pipe.execute()[1]
+        return value.decode()
+
+    def _generation(self, namespace: str) -> str:
+        if self.backend is self.lru:
+            return self._local_generation(namespace)
+        try:
+            return self._redis_generation(namespace)
+        except Exception as e:
+            self._redis_failed(e)
+            return self._local_generation(namespace)
+
+    def key_for(self, namespace: str, params: Iterable) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(params))
+        return f"cache:{namespace}:{self._generation(namespace)}:{query}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call("get", key)
+
+    def set(self, key: str, value: bytes):
+        backend = self.backend
+        if backend is self.lru:
+            self.lru.set(key, value, self.ttl)
+            return
+        try:
+            backend.set(key, value, ex=self.ttl)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _bump_redis(self, namespaces: Iterable[str]):
+        # One round trip no matter how many bills a sync touched
+        pipe = self.redis.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.set(f"gen:{namespace}", uuid.uuid4().hex, ex=self.generation_ttl)
+        pipe.execute()
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self._local_generation(namespace, replace=True)
+        backend = self.backend
+        if backend is self.lru:
+            if self.redis is not None:
+                with self._lock:
+                    self._missed.update(namespaces)
+            return
+        try:
+            self._bump_redis(namespaces)
+        except Exception as e:
+            self._redis_failed(e, namespaces)
+
+    def invalidate_bills(self, bill_ids: Iterable[int], states: Iterable[str]):
+        """Drop detail entries for the bills plus the feeds and map they show up in."""
+        self.invalidate(
+            *(f"bill:{bill_id}" for bill_id in bill_ids),
+            *(f"feed:{state.upper()}" for state in set(states) if state),
+            "states",
+        )
+
+
+def _etag_response(request: Request, body: bytes) -> Response:
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    # Weak comparison: compressed responses go out with W/ in front of the same tag
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_response(request: Request, namespace: str, build: Callable[[], Any]) -> Response:
+    """
+    Serve `build()` as JSON through the response cache, with a strong ETag
+    so repeat clients sending If-None-Match get a bodiless 304.
+    """
+    if not settings.CACHE_ENABLED:
+        return _etag_response(request, dumps(build()))
+    key = response_cache.key_for(namespace, request.query_params.multi_items())
+    body = response_cache.get(key)
+    if body is None:
+        body = dumps(build())
+        response_cache.set(key, body)
+    return _etag_response(request, body)
+
+
+async def _cache_io(fn, *args):
+    # Redis calls are blocking; keep them off the event loop
+    if response_cache.redis is None:
+        return fn(*args)
+    return await run_in_threadpool(fn, *args)
+
+
+async def cached_response_async(request: Request, namespace: str, build: Callable[[], Awaitable[Any]]) -> Response:
+    """cached_response() for `async def` routes; `build` is a coroutine function."""
+    if not settings.CACHE_ENABLED:
+        return _etag_response(request, dumps(await build()))
+    key = await _cache_io(response_cache.key_for, namespace, request.query_params.multi_items())
+    body = await _cache_io(response_cache.get, key)
+    if body is None:
+        body = dumps(await build())
+        await _cache_io(response_cache.set, key, body)
+    return _etag_response(request, body)
+
+
+async def invalidate_async(*namespaces: str):
+    """response_cache.invalidate() for async code paths."""
+    await _cache_io(response_cache.invalidate, *namespaces)
+
+
+response_cache = ResponseCache()
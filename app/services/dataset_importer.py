@@ -0,0 +1,150 @@
+# app/services/dataset_importer.py
+import base64
+import json
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.bill_writer import write_bills
+from app.services.legiscan_service import legiscan
+
+READ_CHUNK = 1 << 20  # bytes of the saved response read per step
+ZIP_FIELD = re.compile(rb'"zip"\s*:\s*"')
+
+
+def unpack_dataset_response(raw_path: str, zip_path: str) -> Dict[str, Any]:
+    """
+    Split a saved getDataset response into its ZIP, base64-decoded in
+    chunks straight into `zip_path`, and the rest of the payload, which is
+    returned (its `zip` left empty). Memory stays at a few chunks however
+    large the archive. Raises ValueError if the response is not OK.
+    """
+    head, carry = b"", b""
+    with open(raw_path, "rb") as src, open(zip_path, "wb") as dst:
+        while True:
+            chunk = src.read(READ_CHUNK)
+            buf = carry + chunk
+            match = ZIP_FIELD.search(buf)
+            if match:
+                head += buf[:match.end()]
+                rest = buf[match.end():]
+                break
+            if not chunk:
+                raise ValueError(f"LegiScan getDataset failed: {(head + buf)[:2000].decode(errors='replace')}")
+            head, carry = head + buf[:-16], buf[-16:]  # the field name may straddle two chunks
+
+        pending = b""
+        while True:
+            end = rest.find(b'"')
+            # Base64 has no quotes or backslashes; json_encode writes "/" as "\/"
+            pending += (rest if end < 0 else rest[:end]).replace(b"\\", b"")
+            usable = len(pending) - len(pending) % 4
+            dst.write(base64.b64decode(pending[:usable]))
+            pending = pending[usable:]
+            if end >= 0:
+                tail = rest[end:] + src.read()  # the closing quote and the few fields after the ZIP
+                break
+            rest = src.read(READ_CHUNK)
+            if not rest:
+                raise ValueError("LegiScan getDataset response ended inside the ZIP")
+        dst.write(base64.b64decode(pending))
+
+    data = json.loads(head + tail)
+    if data.get("status") != "OK":
+        raise ValueError(f"LegiScan getDataset failed: {data}")
+    return data["dataset"]
+
+
+async def download_dataset_zip(session_id: int, access_key: str, directory: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Fetch a session's dataset into `<session_id>_<dataset_hash>.zip` under
+    DATASET_DIR. The response is streamed to a temp file and decoded from
+    there, so neither the JSON nor the ZIP is ever held in memory.
+    Returns (dataset metadata, ZIP path).
+    """
+    directory = directory or settings.DATASET_DIR
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        raw_path, zip_path = os.path.join(tmp, "response.json"), os.path.join(tmp, "dataset.zip")
+        with open(raw_path, "wb") as fh:
+            await legiscan.stream_dataset(session_id, access_key, fh)
+        dataset = unpack_dataset_response(raw_path, zip_path)
+        path = os.path.join(directory, f"{session_id}_{dataset.get('dataset_hash', 'latest')}.zip")
+        os.replace(zip_path, path)
+    return dataset, path
+
+
+def bill_members(path: str) -> List[str]:
+    """Names of the bill JSON files (`<STATE>/<session>/bill/*.json`); reads only the ZIP directory."""
+    with zipfile.ZipFile(path) as zf:
+        return [name for name in zf.namelist() if "/bill/" in name and name.endswith(".json")]
+
+
+def parse_bill_members(path: str, names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Runs in the importer's process pool: open the archive independently and
+    decode just `names`, so only parsed bills cross the process boundary.
+    """
+    bills = []
+    with zipfile.ZipFile(path) as zf:
+        for name in names:
+            with zf.open(name) as fh:
+                bills.append(json.load(fh)["bill"])
+    return bills
+
+
+def iter_dataset_bills(path: str, workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield getBill-shaped payloads from a dataset ZIP in chunks, parsed in a
+    process pool. At most two chunks per worker are in flight, so memory
+    stays flat however large the archive is.
+    """
+    workers = workers or settings.DATASET_WORKERS
+    chunk_size = chunk_size or settings.DATASET_CHUNK_SIZE
+    names = bill_members(path)
+    chunks = iter([names[i:i + chunk_size] for i in range(0, len(names), chunk_size)])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(parse_bill_members, path, chunk))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(parse_bill_members, path, chunk))
+                yield future.result()
+
+
+def import_dataset_zip(db: Session, path: str, workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bulk-load a LegiScan dataset ZIP into `bills` and its child tables
+    through write_bills (one transaction per chunk, same upserts and
+    child diffing as the getBill path). Votes and people files are not
+    imported: sponsors come embedded in each bill.
+    """
+    t0 = time.perf_counter()
+    bills, states, sessions = 0, set(), set()
+    for batch in iter_dataset_bills(path, workers, chunk_size):
+        write_bills(db, batch)
+        bills += len(batch)
+        states.update(b.get("state") for b in batch if b.get("state"))
+        sessions.update(b.get("session_id") for b in batch if b.get("session_id"))
+
+    stats = {
+        "path": path,
+        "bills": bills,
+        "states": sorted(states),
+        "sessions": sorted(sessions),
+        "seconds": round(time.perf_counter() - t0, 4),
+    }
+    print(f"[dataset] {path} bills={bills} states={stats['states']} in {stats['seconds']}s")
+    return stats
@@ -0,0 +1,131 @@
+# app/services/enrichment_queue.py
+import json
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Bill, FollowedBill
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Celery on Redis: lower number = served first
+PRIORITY_WATCHED = 0
+PRIORITY_HOT_STATE = 3
+PRIORITY_DEFAULT = 6
+
+STATUS_TTL = 24 * 3600
+
+
+class MemoryStore:
+    """The slice of the Redis API the queue needs; for eager mode / single-process runs."""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or (item[0] is not None and item[0] < time.monotonic()):
+                self._data.pop(key, None)
+                return None
+            return item[1]
+
+    def set(self, key: str, value, nx: bool = False, ex: Optional[int] = None):
+        with self._lock:
+            item = self._data.get(key)
+            if nx and item is not None and (item[0] is None or item[0] >= time.monotonic()):
+                return None
+            value = value if isinstance(value, bytes) else str(value).encode()
+            self._data[key] = (time.monotonic() + ex if ex else None, value)
+            return True
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class EnrichmentQueue:
+    """
+    Enqueues background AI enrichment and tracks per-bill job status.
+
+    At most one job per bill is queued or running at a time: enqueue()
+    claims `enrich:inflight:<bill_id>` with SET NX (expiring after
+    AI_JOB_TTL in case a worker dies) and the task releases it when done.
+    Status lives under `enrich:status:<bill_id>` for the status endpoint.
+    """
+
+    def __init__(self, client=None):
+        if client is None and redis is not None and settings.REDIS_URL:
+            client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2)
+        self.store = client or MemoryStore()
+
+    def status(self, bill_id: int) -> Optional[dict]:
+        raw = self.store.get(f"enrich:status:{bill_id}")
+        return json.loads(raw) if raw else None
+
+    def mark(self, bill_id: int, **fields) -> dict:
+        status = {**(self.status(bill_id) or {"bill_id": bill_id}), **fields, "updated_at": time.time()}
+        self.store.set(f"enrich:status:{bill_id}", json.dumps(status), ex=STATUS_TTL)
+        return status
+
+    def release(self, bill_id: int):
+        self.store.delete(f"enrich:inflight:{bill_id}")
+
+    def enqueue(self, bill_id: int, priority: int = PRIORITY_DEFAULT, mode: str = "latest") -> dict:
+        """Queue one bill; returns its job status (the existing one if already in flight)."""
+        from app.workers.celery_tasks import enrich_bill  # workers import services, not the reverse
+
+        job_id = uuid.uuid4().hex
+        if not self.store.set(f"enrich:inflight:{bill_id}", job_id, nx=True, ex=settings.AI_JOB_TTL):
+            return {**(self.status(bill_id) or {"bill_id": bill_id}), "deduplicated": True}
+
+        self.mark(bill_id, job_id=job_id, state="queued", priority=priority, mode=mode,
+                  queued_at=time.time(), error=None)
+        try:
+            enrich_bill.apply_async((bill_id, mode), task_id=job_id, priority=priority)
+        except Exception as e:
+            self.release(bill_id)
+            self.mark(bill_id, state="failed", error=f"enqueue failed: {e}")
+            raise
+        return self.status(bill_id)
+
+
+def bill_priorities(db: Session, bill_ids: Iterable[int]) -> Dict[int, int]:
+    """Watched bills first, then AI_PRIORITY_STATES, then everything else."""
+    bill_ids = set(bill_ids)
+    if not bill_ids:
+        return {}
+    watched = {
+        bill_id for (bill_id,) in
+        db.query(FollowedBill.bill_id).filter(FollowedBill.bill_id.in_(bill_ids)).distinct()
+    }
+    priorities = {}
+    for bill_id, state in db.query(Bill.id, Bill.state).filter(Bill.id.in_(bill_ids)):
+        if bill_id in watched:
+            priorities[bill_id] = PRIORITY_WATCHED
+        elif (state or "").upper() in settings.AI_PRIORITY_STATES:
+            priorities[bill_id] = PRIORITY_HOT_STATE
+        else:
+            priorities[bill_id] = PRIORITY_DEFAULT
+    return priorities
+
+
+def enqueue_enrichment(db: Session, bill_ids: Iterable[int], mode: str = "latest") -> List[dict]:
+    """Queue enrichment for many bills, highest priority first."""
+    priorities = bill_priorities(db, bill_ids)
+    return [
+        enrichment_queue.enqueue(bill_id, priority, mode)
+        for bill_id, priority in sorted(priorities.items(), key=lambda item: item[1])
+    ]
+
+
+enrichment_queue = EnrichmentQueue()
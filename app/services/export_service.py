@@ -0,0 +1,109 @@
+# app/services/export_service.py
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.models import Bill
+from app.models.bills import Sponsor
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# The latest action is already denormalized onto the bill by the sync path
+BILL_FIELDS = (
+    Bill.id, Bill.bill_number, Bill.state, Bill.session_id, Bill.status, Bill.status_date,
+    Bill.title, Bill.description, Bill.last_action_date, Bill.last_action, Bill.last_updated,
+    Bill.url, Bill.state_link, Bill.change_hash,
+)
+SPONSOR_FIELDS = (
+    Sponsor.people_id, Sponsor.name, Sponsor.party, Sponsor.role, Sponsor.district, Sponsor.sponsor_type_id,
+)
+BILL_KEYS = [c.key for c in BILL_FIELDS]
+SPONSOR_KEYS = [c.key for c in SPONSOR_FIELDS]
+
+
+def export_query(state: Optional[str] = None, session_id: Optional[int] = None, since: Optional[datetime] = None):
+    """One row per (bill, sponsor), bills in id order so each bill's rows arrive together."""
+    query = (
+        select(*BILL_FIELDS, *[c.label(f"sponsor_{c.key}") for c in SPONSOR_FIELDS])
+        .outerjoin(Sponsor, Sponsor.bill_id == Bill.id)
+        .order_by(Bill.id, Sponsor.sponsor_order, Sponsor.id)
+    )
+    if state:
+        query = query.where(Bill.state == state.upper())
+    if session_id is not None:
+        query = query.where(Bill.session_id == session_id)
+    if since is not None:
+        query = query.where(Bill.last_updated >= since)
+    return query
+
+
+async def iter_bills(db: AsyncSession, query) -> AsyncIterator[dict]:
+    """
+    Bills from a server-side cursor, each with its sponsors folded into a
+    list. Rows are fetched EXPORT_BATCH_SIZE at a time and only the current
+    batch is held in memory, however many rows the export has.
+    """
+    result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    bill = None
+    async for rows in result.partitions():
+        for row in rows:
+            if bill is None or bill["id"] != row.id:
+                if bill is not None:
+                    yield bill
+                bill = {key: getattr(row, key) for key in BILL_KEYS}
+                bill["sponsors"] = []
+            if row.sponsor_people_id is not None or row.sponsor_name is not None:
+                bill["sponsors"].append({key: getattr(row, f"sponsor_{key}") for key in SPONSOR_KEYS})
+    if bill is not None:
+        yield bill
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def export_bills(db: AsyncSession, fmt: str, query) -> AsyncIterator[bytes]:
+    """
+    Encoded export body in chunks of EXPORT_BATCH_SIZE bills. NDJSON has
+    one bill per line with its sponsors nested; CSV has one bill per row
+    with the sponsor names joined by "; ".
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    chunk, count = [], 0
+
+    if fmt == "csv":
+        writer.writerow(BILL_KEYS + ["sponsors"])
+
+    async for bill in iter_bills(db, query):
+        if fmt == "csv":
+            sponsors = bill.pop("sponsors")
+            writer.writerow([_csv_value(bill[key]) for key in BILL_KEYS]
+                            + ["; ".join(s["name"] or "" for s in sponsors)])
+        else:
+            chunk.append(dumps(bill))
+        count += 1
+        if count % settings.EXPORT_BATCH_SIZE == 0:
+            yield _flush(buffer, chunk)
+
+    yield _flush(buffer, chunk)
+
+
+def _flush(buffer: io.StringIO, chunk: list) -> bytes:
+    if chunk:
+        data = b"\n".join(chunk) + b"\n"
+        chunk.clear()
+        return data
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
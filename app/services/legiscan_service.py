@@ -1,51 +1,118 @@
+import asyncio
 import httpx
 from app.core.config import settings
-from typing import Dict, Any
+from typing import BinaryIO, Dict, Any, List, Optional
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
 class LegiScanService:
-    def __init__(self):
-        self.base_url = "https://api.legiscan.com"
+    """
+    Thin async wrapper around the LegiScan API.
+
+    Owns one long-lived pooled `httpx.AsyncClient` (keep-alive, HTTP/2 when
+    `h2` is installed) and a semaphore that caps in-flight requests. Call
+    `startup()`/`shutdown()` from the app lifespan; scripts that never call
+    `startup()` get a client lazily on first request.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.base_url = settings.LEGISCAN_BASE_URL
         self.api_key = settings.LEGISCAN_API_KEY
+        self.max_connections = max_connections or settings.LEGISCAN_MAX_CONNECTIONS
+        self.max_concurrency = max_concurrency or settings.LEGISCAN_MAX_CONCURRENCY
+        self.timeout = timeout or settings.LEGISCAN_TIMEOUT
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
 
-    async def get_bill(self, bill_id: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/?key={self.api_key}&op=getBill&id={bill_id}"
+    async def startup(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
             )
-            if response.status_code == 200:
-                return response.json()
-            return {"error": "Failed to fetch bill"}
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+
+    async def _get(self, op: str, **params) -> httpx.Response:
+        await self.startup()
+        async with self._semaphore:
+            return await self._client.get("/", params={"key": self.api_key, "op": op, **params})
+
+    async def _get_ok(self, op: str, **params) -> Dict[str, Any]:
+        """`_get` for ops whose payload we need: raises on HTTP errors and non-OK status."""
+        resp = await self._get(op, **params)
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("status") != "OK":
+            raise ValueError(f"LegiScan {op} failed: {data}")
+        return data
 
     async def get_bills_for_state(self, state: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/?key={self.api_key}&op=getMasterList&state={state}"
-            )
-            print(f"LegiScan response status: {response.status_code}")
-            if response.status_code == 200:
-                return response.json()
-            return {"error": "Failed to fetch bills"}
+        response = await self._get("getMasterList", state=state.upper())
+        print(f"LegiScan response status: {response.status_code}")
+        if response.status_code == 200:
+            return response.json()
+        return {"error": "Failed to fetch bills"}
 
     async def get_master_list(self, state: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(self.base_url, params={
-                "key": self.api_key,
-                "op": "getMasterList",
-                "state": state.upper()
-            })
-            data = resp.json()
-            if data.get("status") != "OK":
-                raise ValueError(f"LegiScan: {data}")
-            return data["masterlist"]
+        data = await self._get_ok("getMasterList", state=state.upper())
+        return data["masterlist"]
+
+    async def get_master_list_raw(self, state: Optional[str] = None, session_id: Optional[int] = None) -> Dict[str, Any]:
+        """getMasterListRaw: just bill_id, number and change_hash per bill (current session, or `session_id`)."""
+        params = {"id": session_id} if session_id else {"state": state.upper()}
+        data = await self._get_ok("getMasterListRaw", **params)
+        return data["masterlist"]
+
+    async def get_session_list(self, state: str) -> List[Dict[str, Any]]:
+        data = await self._get_ok("getSessionList", state=state.upper())
+        return data["sessions"]
+
+    async def get_dataset_list(self, state: Optional[str] = None, year: Optional[int] = None) -> List[Dict[str, Any]]:
+        """getDatasetList: one entry per session with its dataset_hash (changes when any bill in it does)."""
+        params = {}
+        if state:
+            params["state"] = state.upper()
+        if year:
+            params["year"] = year
+        data = await self._get_ok("getDatasetList", **params)
+        return data["datasetlist"]
+
+    async def stream_dataset(self, session_id: int, access_key: str, fh: BinaryIO):
+        """
+        getDataset (session metadata plus the base64 ZIP of every bill/people/
+        vote JSON file), written to `fh` as the raw JSON response chunk by
+        chunk: a large session's payload never sits in memory.
+        """
+        await self.startup()
+        params = {"key": self.api_key, "op": "getDataset", "id": session_id, "access_key": access_key}
+        async with self._semaphore:
+            async with self._client.stream("GET", "/", params=params) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    fh.write(chunk)
 
     async def get_bill(self, bill_id: int) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(self.base_url, params={
-                "key": self.api_key,
-                "op": "getBill",
-                "id": bill_id
-            })
-            data = resp.json()
-            if data.get("status") != "OK":
-                raise ValueError(f"LegiScan getBill failed: {data}")
-            return data
-legiscan = LegiScanService()
\ No newline at end of file
+        return await self._get_ok("getBill", id=bill_id)
+
+legiscan = LegiScanService()
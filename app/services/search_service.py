@@ -0,0 +1,122 @@
+# app/services/search_service.py
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import Integer, String, bindparam, func, literal_column, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Bill
+from app.utils.pagination import decode_rank_cursor, encode_rank_cursor
+
+SEARCH_CONFIG = "english"
+
+# bills.search_vector: title (A) + description (B) + the vector of the bill's
+# latest extracted text (C). Recomputed in SQL for just the bills a writer touched.
+_REFRESH_SQL = """
+UPDATE bills AS b SET search_vector =
+    setweight(to_tsvector('{config}', coalesce(b.title, '')), 'A')
+    || setweight(to_tsvector('{config}', coalesce(b.description, '')), 'B')
+    || coalesce((
+        SELECT e.search_vector
+        FROM bill_texts AS t JOIN extracted_texts AS e ON e.text_hash = t.text_hash
+        WHERE t.bill_id = b.id AND e.search_vector IS NOT NULL
+        ORDER BY t.date DESC NULLS LAST, t.id DESC
+        LIMIT 1
+    ), ''::tsvector)
+WHERE {where}
+""".replace("{config}", SEARCH_CONFIG)
+
+FORCE_CUSTOM_PLAN = text("SET LOCAL plan_cache_mode = force_custom_plan")
+
+REFRESH_BILLS = text(_REFRESH_SQL.format(where="b.id = ANY(:ids)")).bindparams(
+    bindparam("ids", type_=ARRAY(Integer))
+)
+REFRESH_BILLS_FOR_TEXTS = text(_REFRESH_SQL.format(
+    where="b.id IN (SELECT bill_id FROM bill_texts WHERE text_hash = ANY(:hashes))"
+)).bindparams(bindparam("hashes", type_=ARRAY(String)))
+
+
+def text_vector(content: str):
+    """SQL expression for an extracted document's weight-C vector (capped at SEARCH_TEXT_MAX_CHARS)."""
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, content[:settings.SEARCH_TEXT_MAX_CHARS]), literal_column("'C'"))
+
+
+def refresh_search_vectors(db: Session, bill_ids: Iterable[int]):
+    """Recompute search_vector for the given bills. Does not commit."""
+    bill_ids = sorted(set(bill_ids))
+    if bill_ids:
+        db.execute(REFRESH_BILLS, {"ids": bill_ids})
+
+
+async def refresh_search_vectors_for_texts(db: AsyncSession, text_hashes: Iterable[str]):
+    """Recompute search_vector for every bill that carries one of the documents. Does not commit."""
+    text_hashes = sorted({h for h in text_hashes if h})
+    if text_hashes:
+        await db.execute(REFRESH_BILLS_FOR_TEXTS, {"hashes": text_hashes})
+
+
+async def search_bills(
+    db: AsyncSession,
+    q: str,
+    state: Optional[str] = None,
+    session_id: Optional[int] = None,
+    status: Optional[int] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ranked full-text search. The GIN index finds the matches and, when
+    there are at most SEARCH_MAX_CANDIDATES of them, all are ranked, so
+    results are best match first. Broader queries (e.g. "tax") rank only
+    the newest SEARCH_MAX_CANDIDATES matches rather than detoasting
+    hundreds of thousands of vectors, and come back with truncated=True.
+    Pages are keyset on (rank, id). Raises ValueError on a malformed cursor.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    filters = [Bill.search_vector.op("@@")(query)]
+    if state:
+        filters.append(Bill.state == state.upper())
+    if session_id is not None:
+        filters.append(Bill.session_id == session_id)
+    if status is not None:
+        filters.append(Bill.status == status)
+
+    cap = settings.SEARCH_MAX_CANDIDATES
+    # One pass over the index: the newest cap + 1 matches, whose count tells
+    # whether the cap cut anything off. Broad terms walk bills_pkey backwards
+    # and stop there; narrow ones bitmap-scan the GIN index. Only a plan made
+    # for the actual term can tell which, and asyncpg's prepared statements
+    # switch to a generic plan (always the bitmap scan) after five runs.
+    matches = select(Bill.id).where(*filters).order_by(Bill.id.desc()).limit(cap + 1).cte("matches")
+    candidates = select(matches.c.id).order_by(matches.c.id.desc()).limit(cap).subquery()
+    ranked = (
+        select(
+            Bill.id, Bill.bill_number, Bill.state, Bill.title, Bill.status,
+            Bill.last_action_date, Bill.last_action,
+            func.ts_rank(Bill.search_vector, query, 1).label("rank"),
+            select(func.count()).select_from(matches).scalar_subquery().label("matched"),
+        )
+        .join(candidates, candidates.c.id == Bill.id)
+        .subquery()
+    )
+    page = select(ranked)
+    if cursor:
+        after_rank, after_id = decode_rank_cursor(cursor)
+        page = page.where(tuple_(ranked.c.rank, ranked.c.id) < tuple_(after_rank, after_id))
+    page = page.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(limit + 1)
+
+    await db.execute(FORCE_CUSTOM_PLAN)
+    rows = (await db.execute(page)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    bills = [r._asdict() for r in rows]
+    for bill in bills:
+        del bill["matched"]
+    return {
+        "limit": limit,
+        "truncated": bool(rows) and rows[0].matched > cap,
+        "next_cursor": encode_rank_cursor(rows[-1].rank, rows[-1].id) if has_more else None,
+        "bills": bills,
+    }
@@ -0,0 +1,83 @@
+# app/services/state_count_service.py
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models import Bill, StateBillCount
+
+# bill id -> (state, status) as the summary counts it
+BillStatuses = Dict[int, Tuple[str, int]]
+
+
+def lock_state_counts(db: Session, states: Iterable[str]):
+    """
+    Serialize summary writers per state until the caller's transaction ends.
+    Statements after the lock see every bill committed by the writer that
+    held it before, so counts and deltas never race. PostgreSQL only; other
+    databases have a single writer anyway.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for state in sorted({s.upper() for s in states if s}):  # fixed order, no deadlocks
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"state_bill_counts:{state}"))))
+
+
+def bill_statuses(db: Session, bill_ids: Iterable[int]) -> BillStatuses:
+    """Current (state, status) of the bills; call under lock_state_counts, before and after writing them."""
+    bill_ids = list(set(bill_ids))
+    if not bill_ids:
+        return {}
+    rows = db.query(Bill.id, Bill.state, Bill.status).filter(Bill.id.in_(bill_ids))
+    return {bill_id: (state, status or 0) for bill_id, state, status in rows}
+
+
+def apply_state_count_deltas(db: Session, before: BillStatuses, after: BillStatuses):
+    """
+    Move the summary from `before` to `after` for just those bills: one
+    upsert of +/- counts, however large the state. Does not commit.
+    """
+    deltas = Counter()
+    for bill_id, key in before.items():
+        if after.get(bill_id) != key:
+            deltas[key] -= 1
+    for bill_id, key in after.items():
+        if before.get(bill_id) != key:
+            deltas[key] += 1
+    rows = [{"state": state, "status": status, "bill_count": n} for (state, status), n in deltas.items() if n and state]
+    if not rows:
+        return
+
+    stmt = pg_insert(StateBillCount).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[StateBillCount.state, StateBillCount.status],
+        set_={"bill_count": StateBillCount.bill_count + stmt.excluded.bill_count},
+    ))
+    db.execute(delete(StateBillCount).where(
+        StateBillCount.state.in_({row["state"] for row in rows}), StateBillCount.bill_count <= 0,
+    ))
+
+
+def refresh_state_counts(db: Session, states: Iterable[str]):
+    """
+    Recompute the (state, status) -> bill count summary for the given states
+    from `bills`. Runs in the caller's transaction so the summary commits
+    together with the bill writes; each state is a single index range scan.
+    For whole-state writers such as the masterlist sync; per-batch writers
+    use apply_state_count_deltas.
+    """
+    states = sorted({s.upper() for s in states if s})
+    if not states:
+        return
+
+    lock_state_counts(db, states)
+    db.query(StateBillCount).filter(StateBillCount.state.in_(states)).delete(synchronize_session=False)
+    status = func.coalesce(Bill.status, 0)
+    db.execute(
+        insert(StateBillCount).from_select(
+            ["state", "status", "bill_count"],
+            select(Bill.state, status, func.count(Bill.id))
+            .where(Bill.state.in_(states))
+            .group_by(Bill.state, status),
+        )
+    )
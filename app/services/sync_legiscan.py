@@ -1,12 +1,178 @@
 # app/services/sync_legiscan.py
 import asyncio
+import time
 from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.db.session import SessionLocal
 from app.models import Bill, Session as BillSession
 from app.core.config import settings
 from app.services.legiscan_service import legiscan
-
-
+from app.services.cache_service import response_cache
+from app.services.state_count_service import refresh_state_counts
+from app.services.search_service import refresh_search_vectors
+from app.utils.variables import states as STATE_CODES
+
+
+# Columns the masterlist owns. Everything else on `bills` (ai_*, search_vector, ...)
+# is written by the getBill path and must survive a masterlist upsert. That
+# includes change_hash: it marks the bill's details (history, sponsors, texts)
+# as fetched, and the planner would skip bills whose details never were. The
+# masterlist diffs against its own masterlist_hash instead.
+MASTERLIST_COLUMNS = (
+    "bill_number",
+    "masterlist_hash",
+    "title",
+    "description",
+    "url",
+    "status",
+    "status_date",
+    "last_updated",
+    "last_action",
+    "last_action_date",
+    "state",
+    "session_id",
+)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%d") if value else None
+
+
+def upsert_session(db: Session, session_info: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Insert the masterlist session if it is new and return its id."""
+    if not session_info:
+        return None
+
+    stmt = pg_insert(BillSession).values(
+        id=session_info["session_id"],
+        state_id=session_info["state_id"],
+        year_start=session_info["year_start"],
+        year_end=session_info["year_end"],
+        prefile=session_info.get("prefile", 0),
+        sine_die=session_info.get("sine_die", 0),
+        prior=session_info.get("prior", 0),
+        special=session_info.get("special", 0),
+        session_tag=session_info["session_tag"],
+        session_title=session_info["session_title"],
+        session_name=session_info["session_name"],
+    ).on_conflict_do_nothing(index_elements=[BillSession.id])
+    db.execute(stmt)
+    return session_info["session_id"]
+
+
+def masterlist_rows(masterlist: Dict[str, Any], state: str, session_id: Optional[int]) -> List[Dict[str, Any]]:
+    """Flatten a getMasterList payload into `bills` rows (skips the `session` entry)."""
+    rows = []
+    for item in masterlist.values():
+        if not isinstance(item, dict) or "bill_id" not in item:
+            continue
+        rows.append({
+            "id": int(item["bill_id"]),
+            "bill_number": item.get("number"),
+            "masterlist_hash": item.get("change_hash"),
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "url": item.get("url"),
+            "status": item.get("status"),
+            "status_date": _parse_date(item.get("status_date")),
+            "last_updated": _parse_date(item.get("last_action_date")),
+            "last_action": item.get("last_action"),
+            "last_action_date": _parse_date(item.get("last_action_date")),
+            "state": state,
+            "session_id": session_id,
+        })
+    return rows
+
+
+def load_masterlist_hashes(db: Session, state: str) -> Dict[int, Optional[str]]:
+    """One round trip: every (id, masterlist_hash) we already hold for the state."""
+    return dict(db.query(Bill.id, Bill.masterlist_hash).filter(Bill.state == state).all())
+
+
+def upsert_bill_rows(db: Session, rows: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+    """
+    Batched INSERT ... ON CONFLICT (id) DO UPDATE for masterlist rows.
+    Only masterlist-owned columns are overwritten, and only when the
+    masterlist_hash actually differs. Does not commit.
+    """
+    chunk_size = chunk_size or settings.SYNC_UPSERT_CHUNK_SIZE
+    written = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = [{"id": r["id"], **{col: r[col] for col in MASTERLIST_COLUMNS}} for r in rows[start:start + chunk_size]]
+        stmt = pg_insert(Bill).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Bill.id],
+            set_={col: stmt.excluded[col] for col in MASTERLIST_COLUMNS},
+            where=Bill.masterlist_hash.is_distinct_from(stmt.excluded.masterlist_hash),
+        )
+        db.execute(stmt)
+        written += len(chunk)
+    return written
+
+
+def bulk_sync_masterlist(db: Session, state: str, masterlist: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Set-based masterlist sync: load existing hashes once, diff in memory,
+    upsert new/changed rows in chunks, commit once.
+
+    Returns row counts, per-phase timings (seconds) and the ids whose
+    masterlist change_hash moved so callers can fetch full details for
+    just those. Bills are diffed on masterlist_hash; the stored change_hash
+    is left to write_bills, so the planner keeps fetching details for bills
+    that have only been through the masterlist.
+    """
+    state = state.upper()
+    timings = {}
+
+    t0 = time.perf_counter()
+    try:
+        session_id = upsert_session(db, masterlist.get("session"))
+        rows = masterlist_rows(masterlist, state, session_id)
+        timings["parse"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        existing = load_masterlist_hashes(db, state)
+        timings["load"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new_rows, changed_rows = [], []
+        for row in rows:
+            if row["id"] not in existing:
+                new_rows.append(row)
+            elif existing[row["id"]] != row["masterlist_hash"]:
+                changed_rows.append(row)
+        timings["diff"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        upsert_bill_rows(db, new_rows + changed_rows)
+        if new_rows or changed_rows:
+            refresh_search_vectors(db, (r["id"] for r in new_rows + changed_rows))
+            refresh_state_counts(db, [state])
+        db.commit()
+        timings["write"] = time.perf_counter() - t0
+    except Exception:
+        db.rollback()
+        raise
+
+    if new_rows or changed_rows:
+        response_cache.invalidate_bills((r["id"] for r in new_rows + changed_rows), [state])
+
+    stats = {
+        "state": state,
+        "synced": len(rows),
+        "inserted": len(new_rows),
+        "updated": len(changed_rows),
+        "unchanged": len(rows) - len(new_rows) - len(changed_rows),
+        "changed_ids": [r["id"] for r in new_rows + changed_rows],
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+    }
+    print(
+        f"[sync {state}] rows={stats['synced']} inserted={stats['inserted']} "
+        f"updated={stats['updated']} unchanged={stats['unchanged']} timings={stats['timings']}"
+    )
+    return stats
 
 
 async def sync_state_bills(state: str):
@@ -14,90 +180,28 @@ async def sync_state_bills(state: str):
     db = SessionLocal()
 
     try:
+        t0 = time.perf_counter()
         data = await legiscan.get_bills_for_state(state)
-        if data.get("status") != "OK":
-            return {"error": data}
-
         if data.get("status") != "OK":
             return {"error": f"Failed to fetch data: {data}"}
+        fetch_time = time.perf_counter() - t0
 
-        masterlist = data["masterlist"]
-
-        # --- handle session ---
-        session_info = masterlist.pop("session", None)
-        if session_info:
-            db_session = (
-                db.query(BillSession)
-                .filter(BillSession.id == session_info["session_id"])
-                .first()
-            )
-            if not db_session:
-                db_session = BillSession(
-                    id=session_info["session_id"],
-                    state_id=session_info["state_id"],
-                    year_start=session_info["year_start"],
-                    year_end=session_info["year_end"],
-                    prefile=session_info.get("prefile", 0),
-                    sine_die=session_info.get("sine_die", 0),
-                    prior=session_info.get("prior", 0),
-                    special=session_info.get("special", 0),
-                    session_tag=session_info["session_tag"],
-                    session_title=session_info["session_title"],
-                    session_name=session_info["session_name"],
-                )
-                db.add(db_session)
-                db.commit()
-            session_id = db_session.id
-        else:
-            session_id = None
-
-        updated, skipped = [], []
-
-        # --- loop over bills ---
-        for key, item in masterlist.items():
-            if not isinstance(item, dict) or "bill_id" not in item:
-                continue
-
-            bill_id = item["bill_id"]
-            db_bill = db.query(Bill).filter(Bill.id == bill_id).first()
-
-            # Skip if change_hash is unchanged
-            if db_bill and db_bill.change_hash == item["change_hash"]:
-                skipped.append(bill_id)
-                continue
-
-            if not db_bill:
-                db_bill = Bill(id=bill_id, state=state, session_id=session_id)
-                db.add(db_bill)
-
-            db_bill.bill_number = item["number"]
-            db_bill.change_hash = item["change_hash"]
-            db_bill.title = item["title"]
-            db_bill.description = item["description"]
-            db_bill.url = item["url"]
-            db_bill.status = item["status"]
-            db_bill.status_date = (
-                datetime.strptime(item["status_date"], "%Y-%m-%d")
-                if item["status_date"]
-                else None
-            )
-            db_bill.last_action = item.get("last_action")
-            db_bill.last_action_date = (
-                datetime.strptime(item["last_action_date"], "%Y-%m-%d")
-                if item.get("last_action_date")
-                else None
-            )
-            db_bill.last_synced = datetime.now(timezone.utc)
-
-            db.commit()
-            updated.append(bill_id)
-
-        return {"updated": updated, "skipped": skipped}
+        stats = bulk_sync_masterlist(db, state, data["masterlist"])
+        stats["timings"]["fetch"] = round(fetch_time, 4)
+        return stats
     finally:
         db.close()
 
 
+async def sync_all_states(states: Optional[List[str]] = None):
+    """Run the masterlist sync for every state (each prints its own summary)."""
+    results = []
+    for code in states or STATE_CODES.values():
+        results.append(await sync_state_bills(code))
+    return results
+
+
 if __name__ == "__main__":
     # Manual run: sync MN bills
     result = asyncio.run(sync_state_bills("MN"))
-    print(result)
+    print({k: v for k, v in result.items() if k != "changed_ids"})
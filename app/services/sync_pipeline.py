@@ -0,0 +1,83 @@
+# app/services/sync_pipeline.py
+import asyncio
+import random
+from typing import AsyncIterator, Dict, Any, Iterable, Optional, Tuple
+import httpx
+from app.core.config import settings
+from app.services.legiscan_service import legiscan
+
+# Statuses worth retrying: rate limiting and upstream hiccups
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+_DONE = object()
+
+
+def is_transient(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in TRANSIENT_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+async def fetch_bill_with_retry(
+    bill_id: int,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    getBill with exponential backoff (plus jitter) on transient errors.
+    Returns the `bill` payload, or None if LegiScan rejects the id or
+    retries run out.
+    """
+    retries = settings.SYNC_FETCH_RETRIES if retries is None else retries
+    backoff = settings.SYNC_FETCH_BACKOFF if backoff is None else backoff
+
+    for attempt in range(retries + 1):
+        try:
+            data = await legiscan.get_bill(bill_id)
+            return data["bill"]
+        except Exception as e:
+            if not is_transient(e) or attempt == retries:
+                print(f"⚠️ getBill {bill_id} failed after {attempt + 1} attempt(s): {e}")
+                return None
+            await asyncio.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+
+
+async def iter_bill_details(
+    bill_ids: Iterable[int],
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Fetch getBill for `bill_ids` with at most `concurrency` requests in
+    flight and yield `(bill_id, bill_info)` in completion order, so the
+    caller can upsert each bill while the rest are still downloading.
+    `bill_info` is None for ids that could not be fetched.
+    """
+    concurrency = concurrency or settings.SYNC_FETCH_CONCURRENCY
+    pending: asyncio.Queue = asyncio.Queue()
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    for bill_id in bill_ids:
+        pending.put_nowait(bill_id)
+
+    async def worker():
+        while True:
+            try:
+                bill_id = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            await results.put((bill_id, await fetch_bill_with_retry(bill_id)))
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, pending.qsize()))]
+    remaining = len(workers)
+    try:
+        while remaining:
+            item = await results.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
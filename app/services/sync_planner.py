@@ -0,0 +1,79 @@
+# app/services/sync_planner.py
+import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models import Bill, SessionSync
+from app.services.legiscan_service import legiscan
+
+
+def raw_change_hashes(raw_masterlist: Dict[str, Any]) -> Dict[int, Optional[str]]:
+    """bill_id -> change_hash from a getMasterListRaw payload (skips the `session` entry)."""
+    return {
+        int(item["bill_id"]): item.get("change_hash")
+        for item in raw_masterlist.values()
+        if isinstance(item, dict) and "bill_id" in item
+    }
+
+
+def changed_bill_ids(db: Session, hashes: Dict[int, Optional[str]]) -> List[int]:
+    """Ids that are new to us or whose change_hash moved; one query."""
+    if not hashes:
+        return []
+    stored = dict(db.query(Bill.id, Bill.change_hash).filter(Bill.id.in_(list(hashes))))
+    return [bill_id for bill_id, change_hash in hashes.items() if bill_id not in stored or stored[bill_id] != change_hash]
+
+
+def record_session_synced(db: Session, state: str, session_id: int, session_hash: Optional[str]):
+    """Remember the session_hash we just applied so the next run can skip the session."""
+    db.merge(SessionSync(
+        session_id=session_id,
+        state=state.upper(),
+        session_hash=session_hash,
+        synced_at=datetime.datetime.utcnow(),
+    ))
+    db.commit()
+
+
+async def plan_state_sync(db: Session, state: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Decide what a state sync has to fetch, spending as few LegiScan queries
+    as possible:
+
+    1. getSessionList (one query) gives the state's current sessions, each
+       with a session_hash that moves whenever anything in the session does.
+       (dataset_hash is no use here: datasets are only rebuilt weekly.)
+    2. Sessions whose hash matches the one stored in `session_syncs` are
+       skipped outright. Sessions without a hash are always checked.
+    3. For the rest, getMasterListRaw (one query per session) is diffed
+       against stored change_hashes, so only new/changed ids go to getBill.
+
+    `force` ignores stored session hashes (the change_hash diff still applies).
+    """
+    state = state.upper()
+    sessions = [s for s in await legiscan.get_session_list(state) if not s.get("prior")]
+    stored = dict(
+        db.query(SessionSync.session_id, SessionSync.session_hash)
+        .filter(SessionSync.session_id.in_([s["session_id"] for s in sessions]))
+    )
+
+    planned, skipped = [], []
+    for session in sessions:
+        session_id = session["session_id"]
+        session_hash = session.get("session_hash")
+        if not force and session_hash and stored.get(session_id) == session_hash:
+            skipped.append(session_id)
+            continue
+        raw = await legiscan.get_master_list_raw(session_id=session_id)
+        bill_hashes = raw_change_hashes(raw)
+        planned.append({
+            "session_id": session_id,
+            "session_hash": session_hash,
+            "bills": len(bill_hashes),
+            "changed_ids": changed_bill_ids(db, bill_hashes),
+        })
+
+    print(
+        f"[plan {state}] sessions={len(sessions)} skipped={len(skipped)} "
+        f"changed_bills={sum(len(p['changed_ids']) for p in planned)}"
+    )
+    return {"state": state, "sessions": planned, "skipped_sessions": skipped}
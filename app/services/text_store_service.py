@@ -0,0 +1,42 @@
+# app/services/text_store_service.py
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import ExtractedText
+from app.services.search_service import refresh_search_vectors_for_texts, text_vector
+
+
+async def load_extracted_texts(db: AsyncSession, text_hashes: Iterable[str]) -> Dict[str, str]:
+    """text_hash -> extracted text for every hash already in the store (one query)."""
+    text_hashes = {h for h in text_hashes if h}
+    if not text_hashes:
+        return {}
+    rows = await db.execute(
+        select(ExtractedText.text_hash, ExtractedText.content)
+        .where(ExtractedText.text_hash.in_(text_hashes))
+    )
+    return {text_hash: zlib.decompress(content).decode("utf-8") for text_hash, content in rows}
+
+
+async def save_extracted_texts(db: AsyncSession, texts: Dict[str, Tuple[Optional[int], str]]):
+    """
+    Store text_hash -> (doc_id, text). Content-addressed, so a hash that is
+    already stored (e.g. by a concurrent enrichment) is left as is. Bills
+    carrying the new documents get their search vectors refreshed.
+    """
+    if not texts:
+        return
+    rows = [
+        {
+            "text_hash": text_hash,
+            "doc_id": doc_id,
+            "content": zlib.compress(text.encode("utf-8"), 6),
+            "search_vector": text_vector(text),
+        }
+        for text_hash, (doc_id, text) in texts.items()
+    ]
+    await db.execute(pg_insert(ExtractedText).values(rows).on_conflict_do_nothing(index_elements=["text_hash"]))
+    await refresh_search_vectors_for_texts(db, texts)
+    await db.commit()
@@ -0,0 +1,44 @@
+# Shared fixtures. Tests that need PostgreSQL take `pg_engine` or `pg_session`
+# and are skipped unless TEST_DATABASE_URL points at a THROWAWAY database
+# (every table is created and dropped around each test):
+#
+#   TEST_DATABASE_URL=postgresql://localhost/sphere_test pytest app/test
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def _pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture
+def pg_engine():
+    """Engine on TEST_DATABASE_URL with every table created for one test and dropped after it."""
+    yield from _pg_engine()
+
+
+@pytest.fixture(scope="module")
+def pg_module_engine():
+    """pg_engine shared by a whole module, for checks that write nothing (e.g. EXPLAIN)."""
+    yield from _pg_engine()
+
+
+@pytest.fixture
+def pg_session(pg_engine):
+    session = sessionmaker(bind=pg_engine)()
+    yield session
+    session.close()
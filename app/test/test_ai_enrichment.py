@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints import ai as ai_endpoints
+from app.models import Base, Bill, BillText
+from app.services import ai_enrichment_service
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    path = tmp_path / "ai.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Bill(id=1, bill_number="HF1", title="Bill 1", description="About bill 1", state="MN"))
+    db.add(BillText(id=1, bill_id=1, doc_id=10, text_hash="hash-1"))
+    db.commit()
+    db.close()
+
+    calls = []
+
+    async def fake_generate(db, bill_id, mode, texts=None):
+        calls.append(bill_id)
+        return {"ai_summary": f"Summary {len(calls)}", "ai_impacts": ["impact"], "ai_pro_con": {"pros": [], "cons": []}}
+
+    async def fake_openai(title, description):
+        return {"summary": "Other generator", "impacts": "free text", "pros_cons": "free text"}
+
+    monkeypatch.setattr(ai_enrichment_service, "generate_bill_ai_summary", fake_generate)
+    monkeypatch.setattr(ai_endpoints, "generate_openai_summary", fake_openai)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    Session.calls = calls
+    yield Session
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+
+def enrich(Session, **kwargs):
+    async def run():
+        async with Session() as db:
+            return await ai_enrichment_service.enrich_bill_with_ai(db, 1, **kwargs)
+    return asyncio.run(run())
+
+
+def test_unchanged_inputs_are_served_from_the_stored_analysis(Session):
+    first = enrich(Session)
+    assert first["ai_summary"] == "Summary 1" and "cached" not in first
+
+    second = enrich(Session)
+    assert second["cached"] is True
+    assert second["ai_summary"] == "Summary 1" and second["ai_impacts"] == ["impact"]
+    assert Session.calls == [1]
+
+    assert enrich(Session, force=True)["ai_summary"] == "Summary 2"
+
+
+def test_other_ai_writers_invalidate_the_stored_analysis(Session):
+    enrich(Session)
+
+    async def regenerate():
+        async with Session() as db:
+            await ai_endpoints.regenerate_ai_for_bill(1, db=db)
+
+    asyncio.run(regenerate())
+    result = enrich(Session)
+    assert "cached" not in result
+    assert result["ai_summary"] == "Summary 2"
+    assert Session.calls == [1, 1]
+
+
+def test_enrichment_invalidates_the_cached_detail(Session):
+    from app.services.cache_service import response_cache
+
+    key = response_cache.key_for("bill:1", [])
+    response_cache.set(key, b"stale detail")
+    enrich(Session)
+    assert response_cache.get(response_cache.key_for("bill:1", [])) is None
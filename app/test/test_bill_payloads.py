@@ -0,0 +1,40 @@
+import json
+import os
+import pytest
+
+from app.models import Bill, BillPayload
+from app.models.bills import pack_payload
+from app.services.bill_writer import write_bills
+
+RESPONSE = os.path.join(os.path.dirname(__file__), "..", "..", "response.txt")
+
+
+@pytest.fixture
+def bill_info():
+    with open(RESPONSE) as fh:
+        return json.load(fh)["bill"]
+
+
+def test_payload_is_off_the_bills_row_and_compressed(bill_info):
+    assert "raw_data" not in Bill.__table__.c
+    content = pack_payload(bill_info)
+    assert len(content) < len(json.dumps(bill_info)) / 2
+    assert BillPayload(content=content).data == bill_info
+
+
+def test_payload_is_rewritten_only_when_change_hash_moves(pg_session, bill_info):
+    db = pg_session
+    bill_id = bill_info["bill_id"]
+    write_bills(db, [bill_info])
+    assert db.get(Bill, bill_id).raw_data == bill_info
+    written_at = db.get(BillPayload, bill_id).updated_at
+
+    write_bills(db, [bill_info])
+    db.expire_all()
+    assert db.get(BillPayload, bill_id).updated_at == written_at
+
+    changed = {**bill_info, "change_hash": "new-hash", "title": "Amended title"}
+    write_bills(db, [changed])
+    db.expire_all()
+    payload = db.get(BillPayload, bill_id)
+    assert payload.change_hash == "new-hash" and payload.data["title"] == "Amended title"
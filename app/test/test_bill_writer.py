@@ -0,0 +1,67 @@
+import copy
+import json
+import os
+import pytest
+
+from app.models import BillHistory
+from app.models.bills import Sponsor
+from app.services.bill_writer import _content_key, sponsor_row, write_bills
+
+RESPONSE = os.path.join(os.path.dirname(__file__), "..", "..", "response.txt")
+
+
+@pytest.fixture
+def bill_info():
+    with open(RESPONSE) as fh:
+        return json.load(fh)["bill"]
+
+
+def test_content_key_coerces_payload_values_to_column_types(bill_info):
+    key = _content_key(Sponsor, list(sponsor_row({})))
+    payload = sponsor_row(bill_info["sponsors"][0])
+    assert payload["party_id"] == "2"  # LegiScan sends it as a string
+    stored = {**payload, "party_id": 2}
+    assert key(payload) == key(stored)
+
+
+@pytest.fixture
+def db(pg_session):
+    return pg_session
+
+
+def child_ids(db, model, bill_id):
+    return {row.id for row in db.query(model.id).filter(model.bill_id == bill_id)}
+
+
+def test_unchanged_children_are_not_rewritten(db, bill_info):
+    bill_id = bill_info["bill_id"]
+    write_bills(db, [bill_info])
+    sponsors, history = child_ids(db, Sponsor, bill_id), child_ids(db, BillHistory, bill_id)
+    assert len(sponsors) == len(bill_info["sponsors"])
+
+    stats = write_bills(db, [copy.deepcopy(bill_info)])
+    assert all(s["deleted"] == s["inserted"] == 0 and s["changed_bill_ids"] == [] for s in stats.values())
+    assert child_ids(db, Sponsor, bill_id) == sponsors
+    assert child_ids(db, BillHistory, bill_id) == history
+
+
+def test_changed_and_removed_children_are_rewritten(db, bill_info):
+    bill_id = bill_info["bill_id"]
+    write_bills(db, [bill_info])
+    sponsors, history = child_ids(db, Sponsor, bill_id), child_ids(db, BillHistory, bill_id)
+
+    changed = copy.deepcopy(bill_info)
+    changed["history"][0]["action"] = "Amended action"
+    changed["history"].append(dict(changed["history"][1]))  # an exact duplicate is still a row of its own
+    removed = changed["sponsors"].pop()
+    stats = write_bills(db, [changed])
+
+    assert stats["bill_history"] == {"deleted": 1, "inserted": 2, "changed_bill_ids": [bill_id]}
+    assert stats["sponsors"] == {"deleted": 1, "inserted": 0, "changed_bill_ids": [bill_id]}
+    assert stats["bill_texts"]["changed_bill_ids"] == []
+
+    new_history = child_ids(db, BillHistory, bill_id)
+    assert len(history - new_history) == 1 and len(new_history - history) == 2
+    assert {a for (a,) in db.query(BillHistory.action).filter(BillHistory.bill_id == bill_id)} >= {"Amended action"}
+    assert len(child_ids(db, Sponsor, bill_id)) == len(sponsors) - 1
+    assert db.query(Sponsor).filter(Sponsor.bill_id == bill_id, Sponsor.people_id == removed["people_id"]).count() == 0
@@ -0,0 +1,117 @@
+import pytest
+from app.services.cache_service import ResponseCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class DeadRedis:
+    """Stands in for a Redis server that went away."""
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis down")
+        return fail
+
+
+@pytest.fixture(params=["redis", "lru"])
+def cache(request):
+    client = fakeredis.FakeRedis() if request.param == "redis" else None
+    cache = ResponseCache(client=client, ttl=60, max_entries=16)
+    if request.param == "lru":
+        cache.redis = None
+    return cache
+
+
+def test_roundtrip_is_keyed_by_params(cache):
+    key = cache.key_for("feed:MN", [("limit", "20"), ("offset", "0")])
+    assert cache.key_for("feed:MN", [("offset", "0"), ("limit", "20")]) == key
+    cache.set(key, b"page-1")
+    assert cache.get(key) == b"page-1"
+    assert cache.get(cache.key_for("feed:MN", [("limit", "20"), ("offset", "20")])) is None
+
+
+def test_invalidate_bills_drops_detail_feed_and_map(cache):
+    detail = cache.key_for("bill:7", [])
+    feed = cache.key_for("feed:MN", [])
+    other_feed = cache.key_for("feed:CA", [])
+    states = cache.key_for("states", [])
+    for key in (detail, feed, other_feed, states):
+        cache.set(key, b"x")
+
+    cache.invalidate_bills([7], ["mn"])
+
+    assert cache.get(cache.key_for("bill:7", [])) is None
+    assert cache.get(cache.key_for("feed:MN", [])) is None
+    assert cache.get(cache.key_for("states", [])) is None
+    assert cache.get(cache.key_for("feed:CA", [])) == b"x"
+
+
+def test_falls_back_to_lru_when_redis_is_down():
+    cache = ResponseCache(client=DeadRedis(), ttl=60, max_entries=16)
+    key = cache.key_for("bill:1", [])
+    cache.set(key, b"body")
+    assert cache.backend is cache.lru
+    assert cache.get(key) == b"body"
+
+
+def test_generation_keys_expire(cache):
+    cache.invalidate("bill:7")
+    if cache.redis is not None:
+        assert 0 < cache.redis.ttl("gen:bill:7") <= cache.generation_ttl
+
+
+def test_lost_generation_never_revives_old_entries(cache):
+    old = cache.key_for("bill:7", [])
+    cache.set(old, b"old")
+    cache.invalidate("bill:7")
+    # The generation expires or is evicted while entries from before it live on
+    if cache.redis is not None:
+        cache.redis.delete("gen:bill:7")
+    else:
+        cache._generations.clear()
+    fresh = cache.key_for("bill:7", [])
+    assert fresh != old and cache.get(fresh) is None
+    assert cache.key_for("bill:7", []) == fresh
+
+
+def test_lru_eviction_keeps_generations():
+    cache = ResponseCache(client=None, ttl=60, max_entries=16)
+    cache.redis = None
+    old = cache.key_for("bill:7", [])
+    cache.set(old, b"old")
+    cache.invalidate("bill:7")
+    cache.get(old)  # keep the stale entry hot while the LRU churns
+    for i in range(cache.lru.max_entries * 2):
+        cache.set(cache.key_for(f"bill:{100 + i}", []), b"x")
+        cache.get(old)
+    assert cache.get(cache.key_for("bill:7", [])) is None
+
+
+def test_reconnects_to_redis_and_replays_missed_invalidations(monkeypatch):
+    server = fakeredis.FakeRedis()
+    cache = ResponseCache(client=DeadRedis(), ttl=60, max_entries=16)
+    cache.get("anything")
+    assert cache.backend is cache.lru
+
+    # Another worker cached the detail page while this one was cut off
+    stale = ResponseCache(client=server, ttl=60)
+    stale.set(stale.key_for("bill:7", []), b"old")
+    cache.invalidate_bills([7], ["MN"])
+
+    cache.redis = server  # Redis is back ...
+    assert cache.backend is cache.lru  # ... but not retried before the backoff runs out
+    monkeypatch.setattr(cache, "_retry_at", 0.0)
+    assert cache.backend is server
+    assert cache.get(cache.key_for("bill:7", [])) is None
+
+
+def test_disabled_cache_builds_every_response(monkeypatch):
+    from starlette.requests import Request
+    from app.services import cache_service
+
+    monkeypatch.setattr(cache_service.settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(cache_service, "response_cache", ResponseCache(client=fakeredis.FakeRedis(), ttl=60))
+    request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+    builds = []
+    for _ in range(2):
+        response = cache_service.cached_response(request, "states", lambda: builds.append(1) or {"n": len(builds)})
+    assert builds == [1, 1] and response.body == b'{"n":2}'
@@ -0,0 +1,55 @@
+import datetime
+import json
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, accepted_encodings
+from app.core.responses import FastJSONResponse, dumps
+from app.services.cache_service import cached_response
+
+ROWS = [{"id": i, "title": f"Bill {i}", "last_action_date": datetime.datetime(2025, 5, 19, 12, 30)} for i in range(200)]
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/feed")
+    def feed(request: Request):
+        return cached_response(request, "test-feed", lambda: {"bills": ROWS})
+
+    @app.get("/small")
+    def small():
+        return FastJSONResponse({"ok": True})
+
+    return TestClient(app)
+
+
+def test_dumps_matches_the_default_encoder():
+    assert json.loads(dumps(ROWS[:2])) == [
+        {"id": 0, "title": "Bill 0", "last_action_date": "2025-05-19T12:30:00"},
+        {"id": 1, "title": "Bill 1", "last_action_date": "2025-05-19T12:30:00"},
+    ]
+
+
+def test_accepted_encodings_drop_q_zero():
+    assert accepted_encodings("gzip;q=0, br;q=0.5, deflate") == {"br", "deflate"}
+
+
+def test_large_bodies_are_gzipped_and_revalidate_with_weak_etag():
+    client = make_client()
+    resp = client.get("/feed", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["etag"].startswith('W/"')
+    assert len(resp.json()["bills"]) == 200  # httpx decodes transparently
+
+    again = client.get("/feed", headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_small_or_unaccepted_bodies_pass_through():
+    client = make_client()
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    plain = client.get("/feed", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and not plain.headers["etag"].startswith("W/")
@@ -0,0 +1,118 @@
+import asyncio
+import base64
+import json
+import os
+import zipfile
+import pytest
+
+from app.models import Bill, BillHistory, BillText
+from app.models.bills import Sponsor
+from app.services import dataset_importer
+from app.services.dataset_importer import bill_members, import_dataset_zip, iter_dataset_bills
+
+RESPONSE = os.path.join(os.path.dirname(__file__), "..", "..", "response.txt")
+
+
+@pytest.fixture
+def dataset_zip(tmp_path):
+    """A dataset archive laid out like getDataset's: three bills plus people and vote files."""
+    with open(RESPONSE) as fh:
+        bill = json.load(fh)["bill"]
+    path = tmp_path / "MN_2151.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for offset in range(3):
+            copy = {**bill, "bill_id": bill["bill_id"] + offset, "bill_number": f"HF{1 + offset}"}
+            zf.writestr(f"MN/2025-2026_94th_Legislature/bill/HF{1 + offset}.json", json.dumps({"bill": copy}))
+        zf.writestr("MN/2025-2026_94th_Legislature/people/1.json", json.dumps({"person": {"people_id": 1}}))
+        zf.writestr("MN/2025-2026_94th_Legislature/vote/1.json", json.dumps({"roll_call": {"roll_call_id": 1}}))
+    return str(path), bill
+
+
+def dataset_response(path):
+    """getDataset's JSON for the archive, written the way PHP's json_encode does ("/" as "\\/")."""
+    with open(path, "rb") as fh:
+        payload = base64.b64encode(fh.read()).decode()
+    dataset = {"session_id": 2151, "dataset_hash": "abc123", "mime": "application/zip", "zip": payload, "dataset_size": 1}
+    return json.dumps({"status": "OK", "dataset": dataset}).replace("/", "\\/").encode()
+
+
+class StreamingLegiScan:
+    def __init__(self, body):
+        self.body = body
+
+    async def stream_dataset(self, session_id, access_key, fh):
+        for i in range(0, len(self.body), 1000):
+            fh.write(self.body[i:i + 1000])
+
+
+def test_dataset_response_is_unpacked_in_chunks(dataset_zip, tmp_path, monkeypatch):
+    path, _ = dataset_zip
+    body = dataset_response(path)
+    assert b"\\/" in body
+    monkeypatch.setattr(dataset_importer, "READ_CHUNK", 7)  # field name, escapes and padding all straddle chunks
+    monkeypatch.setattr(dataset_importer, "legiscan", StreamingLegiScan(body))
+
+    dataset, saved = asyncio.run(dataset_importer.download_dataset_zip(2151, "key", str(tmp_path / "datasets")))
+    assert saved == str(tmp_path / "datasets" / "2151_abc123.zip")
+    assert dataset["dataset_hash"] == "abc123" and dataset["dataset_size"] == 1 and dataset["zip"] == ""
+    with open(path, "rb") as original, open(saved, "rb") as copy:
+        assert copy.read() == original.read()
+    assert os.listdir(tmp_path / "datasets") == ["2151_abc123.zip"]  # no temp files left behind
+
+
+def test_failed_dataset_response_raises(tmp_path, monkeypatch):
+    body = json.dumps({"status": "ERROR", "alert": {"message": "Invalid access key"}}).encode()
+    monkeypatch.setattr(dataset_importer, "legiscan", StreamingLegiScan(body))
+    with pytest.raises(ValueError, match="Invalid access key"):
+        asyncio.run(dataset_importer.download_dataset_zip(2151, "bad", str(tmp_path)))
+
+
+def test_only_bill_files_are_parsed(dataset_zip):
+    path, bill = dataset_zip
+    assert len(bill_members(path)) == 3
+
+    chunks = list(iter_dataset_bills(path, workers=2, chunk_size=2))
+    assert sorted(len(c) for c in chunks) == [1, 2]
+    ids = sorted(b["bill_id"] for c in chunks for b in c)
+    assert ids == [bill["bill_id"], bill["bill_id"] + 1, bill["bill_id"] + 2]
+
+
+def test_import_loads_bills_and_children(pg_session, dataset_zip):
+    db = pg_session
+    path, bill = dataset_zip
+    stats = import_dataset_zip(db, path, workers=2, chunk_size=2)
+    assert stats["bills"] == 3 and stats["states"] == ["MN"]
+
+    ids = [bill["bill_id"] + i for i in range(3)]
+    assert db.query(Bill).filter(Bill.id.in_(ids)).count() == 3
+    for model, key in ((Sponsor, "sponsors"), (BillHistory, "history"), (BillText, "texts")):
+        assert db.query(model).filter(model.bill_id.in_(ids)).count() == 3 * len(bill[key])
+
+    # Re-importing the same archive changes nothing
+    import_dataset_zip(db, path, workers=2, chunk_size=2)
+    assert db.query(BillHistory).filter(BillHistory.bill_id.in_(ids)).count() == 3 * len(bill["history"])
+
+
+def test_legiscan_streams_the_dataset_to_a_file(dataset_zip, tmp_path):
+    import httpx
+    from app.services.legiscan_service import LegiScanService
+
+    path, _ = dataset_zip
+    body = dataset_response(path)
+
+    def handler(request):
+        assert request.url.params["op"] == "getDataset" and request.url.params["access_key"] == "key"
+        return httpx.Response(200, content=body)
+
+    async def fetch(fh):
+        service = LegiScanService()
+        service._client = httpx.AsyncClient(base_url="https://api.legiscan.invalid", transport=httpx.MockTransport(handler))
+        service._semaphore = asyncio.Semaphore(1)
+        try:
+            await service.stream_dataset(2151, "key", fh)
+        finally:
+            await service.shutdown()
+
+    with open(tmp_path / "response.json", "wb") as fh:
+        asyncio.run(fetch(fh))
+    assert (tmp_path / "response.json").read_bytes() == body
@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Bill, FollowedBill, User
+from app.services import enrichment_queue as eq
+
+fakeredis = pytest.importorskip("fakeredis")
+celery_tasks = pytest.importorskip("app.workers.celery_tasks")
+
+
+@pytest.fixture(params=["redis", "memory"])
+def queue(request, monkeypatch):
+    client = fakeredis.FakeRedis() if request.param == "redis" else eq.MemoryStore()
+    queue = eq.EnrichmentQueue(client=client)
+    monkeypatch.setattr(eq, "enrichment_queue", queue)
+    monkeypatch.setattr(celery_tasks, "enrichment_queue", queue)
+    monkeypatch.setattr(celery_tasks.celery.conf, "task_always_eager", True)
+    return queue
+
+
+@pytest.fixture
+def enriched(monkeypatch):
+    calls = []
+
+    async def fake_enrich(bill_id, mode):
+        calls.append((bill_id, mode))
+        return {"success": True, "bill_id": bill_id}
+
+    monkeypatch.setattr(celery_tasks, "_enrich", fake_enrich)
+    return calls
+
+
+def test_eager_job_runs_and_reports_done(queue, enriched):
+    queue.enqueue(7, eq.PRIORITY_DEFAULT)
+    assert enriched == [(7, "latest")]
+    status = queue.status(7)
+    assert status["state"] == "done"
+    assert status["priority"] == eq.PRIORITY_DEFAULT
+    # in-flight claim is released, so the bill can be queued again
+    queue.enqueue(7)
+    assert len(enriched) == 2
+
+
+def test_in_flight_bill_is_not_queued_twice(queue, enriched):
+    queue.store.set("enrich:inflight:7", "other-job", nx=True, ex=60)
+    status = queue.enqueue(7)
+    assert status["deduplicated"] is True
+    assert enriched == []
+
+
+def test_failed_enrichment_is_reported(queue, monkeypatch):
+    async def no_text(bill_id, mode):
+        return {"error": "No bill texts found for this bill."}
+
+    monkeypatch.setattr(celery_tasks, "_enrich", no_text)
+    queue.enqueue(7)
+    assert queue.status(7)["state"] == "failed"
+    assert queue.status(7)["error"] == "No bill texts found for this bill."
+
+
+def test_watched_bills_and_priority_states_go_first(queue, enriched, monkeypatch):
+    monkeypatch.setattr(eq.settings, "AI_PRIORITY_STATES", ["CA"])
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        Bill(id=1, bill_number="HF1", state="MN"),
+        Bill(id=2, bill_number="AB2", state="CA"),
+        Bill(id=3, bill_number="HF3", state="MN"),
+        User(id=1, email="a@example.com"),
+    ])
+    db.add(FollowedBill(user_id=1, bill_id=3))
+    db.commit()
+
+    assert eq.bill_priorities(db, [1, 2, 3]) == {
+        1: eq.PRIORITY_DEFAULT,
+        2: eq.PRIORITY_HOT_STATE,
+        3: eq.PRIORITY_WATCHED,
+    }
+    eq.enqueue_enrichment(db, [1, 2, 3])
+    assert [bill_id for bill_id, _ in enriched] == [3, 2, 1]
+
+
+def test_eager_sync_enqueues_without_deadlocking(queue, enriched, monkeypatch):
+    # sync.state_bills runs on the worker loop; its eager enrich jobs must not block that loop
+    from sqlalchemy.pool import StaticPool
+    from app.workers import sync_bills
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    db.add_all([Bill(id=1, bill_number="HF1", state="MN"), Bill(id=2, bill_number="HF2", state="MN")])
+    db.commit()
+    db.close()
+
+    async def plan(db, state, force=False):
+        return {"sessions": [{"session_id": 1, "changed_ids": [1, 2], "session_hash": "h"}], "skipped_sessions": []}
+
+    async def fetch_and_write(db, bill_ids):
+        return list(bill_ids), [], set(bill_ids)
+
+    monkeypatch.setattr(sync_bills, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(sync_bills, "plan_state_sync", plan)
+    monkeypatch.setattr(sync_bills, "fetch_and_write", fetch_and_write)
+    monkeypatch.setattr(sync_bills, "record_session_synced", lambda *args: None)
+
+    result = celery_tasks.sync_state.apply(("MN",), timeout=10).get(timeout=10)
+    assert result == {"state": "MN", "updated": 2}
+
+    # The jobs run on the worker loop after the sync; wait for them there
+    async def drain():
+        while celery_tasks._background:
+            await asyncio.gather(*list(celery_tasks._background), return_exceptions=True)
+
+    celery_tasks.run_async(drain())
+    assert sorted(enriched) == [(1, "latest"), (2, "latest")]
+    assert queue.status(1)["state"] == queue.status(2)["state"] == "done"
+
+    async def nested():
+        celery_tasks.run_async(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):  # instead of hanging
+        celery_tasks.run_async(nested())
+
+
+def test_ai_client_and_slots_belong_to_the_running_loop(monkeypatch):
+    from app.services import ai_service
+
+    monkeypatch.setattr(ai_service.settings, "OPENAI_ORGANIZATION", "test")  # no calls are made
+
+    async def grab():
+        return ai_service.get_client(), ai_service.llm_slots(), ai_service.get_client(), ai_service.llm_slots()
+
+    first, second = asyncio.run(grab()), asyncio.run(grab())
+    assert first[0] is first[2] and first[1] is first[3]
+    assert first[0] is not second[0] and first[1] is not second[1]
@@ -0,0 +1,69 @@
+import csv
+import gc
+import io
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.models import Base, Bill
+from app.models.bills import Sponsor
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "export.db"
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    for i in range(1, 8):
+        db.add(Bill(id=i, bill_number=f"HF{i}", title=f"Bill, \"{i}\"", state="MN" if i < 6 else "WI",
+                    session_id=1, last_updated=datetime(2025, 1, i)))
+        for order in range(i % 3):
+            db.add(Sponsor(bill_id=i, people_id=i * 10 + order, name=f"Sponsor {i}.{order}", sponsor_order=order))
+    db.commit()
+    db.close()
+
+    # Small batches so the export spans several cursor fetches and body chunks
+    monkeypatch.setattr("app.core.config.settings.EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr("app.api.v1.endpoints.bills.AsyncSessionLocal",
+                        async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False))
+    gc.collect()  # see test_instrumentation.make_app
+    with TestClient(app) as client:
+        yield client
+    engine.dispose()
+
+
+def test_ndjson_export_nests_sponsors_and_filters_since(client):
+    response = client.get("/api/v1/bills/export", params={"state": "mn"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    bills = [json.loads(line) for line in response.text.splitlines()]
+    assert [b["id"] for b in bills] == [1, 2, 3, 4, 5]
+    assert [s["name"] for s in bills[1]["sponsors"]] == ["Sponsor 2.0", "Sponsor 2.1"]
+    assert bills[2]["sponsors"] == []
+
+    response = client.get("/api/v1/bills/export", params={"session_id": 1, "since": "2025-01-04T00:00:00"})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [4, 5, 6, 7]
+
+
+def test_csv_export(client):
+    response = client.get("/api/v1/bills/export", params={"state": "WI", "format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="bills-WI.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["id"], r["title"], r["sponsors"]) for r in rows] == [
+        ("6", 'Bill, "6"', ""),
+        ("7", 'Bill, "7"', "Sponsor 7.0"),
+    ]
+
+
+def test_export_needs_a_scope(client):
+    assert client.get("/api/v1/bills/export").status_code == 400
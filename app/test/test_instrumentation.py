@@ -0,0 +1,71 @@
+import gc
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core import instrumentation
+from app.core.instrumentation import Metrics, QueryStatsMiddleware, instrument_engine
+
+
+def make_app():
+    # Earlier tests leave unreferenced SQLite pools behind; collect them now rather
+    # than have their finalizers fire inside the TestClient's first import of anyio
+    gc.collect()
+    # Endpoints run on TestClient's loop and threadpool threads; share one connection each
+    args = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_engine("sqlite:///:memory:", **args)
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:", **args)
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/sync/{n}")
+    def sync_queries(n: int):
+        with engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT 1"))
+        return {}
+
+    @app.get("/async/{n}")
+    async def async_queries(n: int):
+        async with async_engine.connect() as conn:
+            for _ in range(n):
+                await conn.execute(text("SELECT 1"))
+        return {}
+
+    return app
+
+
+def query_count(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+def test_server_timing_counts_queries_per_request(monkeypatch):
+    monkeypatch.setattr(instrumentation, "metrics", Metrics())
+    with TestClient(make_app()) as client:
+        assert query_count(client.get("/sync/3")) == 3
+        assert query_count(client.get("/async/2")) == 2
+        assert query_count(client.get("/sync/0")) == 0
+
+
+def test_metrics_and_slow_request_log(monkeypatch, capsys):
+    registry = Metrics()
+    monkeypatch.setattr(instrumentation, "metrics", registry)
+    monkeypatch.setattr(instrumentation.settings, "SLOW_REQUEST_QUERIES", 5)
+    with TestClient(make_app()) as client:
+        client.get("/sync/2")
+        client.get("/sync/6")
+        client.get("/nope")
+
+    rendered = registry.render()
+    assert 'http_requests_total{method="GET",route="/sync/{n}",status="200"} 2' in rendered
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in rendered
+    assert 'http_request_db_queries_total{method="GET",route="/sync/{n}"} 8' in rendered
+    assert 'http_slow_requests_total{method="GET",route="/sync/{n}"} 1' in rendered
+    assert "Slow request GET /sync/6 200" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services import ai_generator_service as gen
+
+
+def slow_parse(data: bytes) -> str:
+    if data == b"hang":
+        time.sleep(60)
+    return data.decode()
+
+
+def test_downloads_share_a_client_and_are_capped(monkeypatch):
+    monkeypatch.setattr(gen, "parse_pdf_bytes", slow_parse)
+    monkeypatch.setattr(gen.settings, "PDF_MAX_CONCURRENCY", 2)
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, content=request.url.path.encode())
+
+    async def run():
+        http, slots = gen._pdf_loop_state()
+        gen._pdf_per_loop[asyncio.get_running_loop()] = (httpx.AsyncClient(transport=httpx.MockTransport(handler)), slots)
+        try:
+            return await asyncio.gather(*(gen.extract_pdf_text(f"https://example.invalid/{i}") for i in range(6)))
+        finally:
+            await http.aclose()
+            await gen.close_pdf_client()
+
+    try:
+        assert asyncio.run(run()) == [f"/{i}" for i in range(6)]
+    finally:
+        gen.shutdown_pdf_pool()
+    assert peak == 2
+
+
+def test_parse_timeout_recycles_the_pool(monkeypatch):
+    monkeypatch.setattr(gen, "parse_pdf_bytes", slow_parse)
+    monkeypatch.setattr(gen.settings, "PDF_PARSE_TIMEOUT", 0.5)
+    monkeypatch.setattr(gen.settings, "PDF_WORKERS", 1)
+
+    def handler(request):
+        return httpx.Response(200, content=b"hang" if request.url.path == "/hang" else b"ok")
+
+    async def run():
+        http, slots = gen._pdf_loop_state()
+        gen._pdf_per_loop[asyncio.get_running_loop()] = (httpx.AsyncClient(transport=httpx.MockTransport(handler)), slots)
+        try:
+            hung = await gen.extract_pdf_text("https://example.invalid/hang")
+            stuck = gen._pdf_pool
+            # With the only worker killed, the next parse gets a fresh pool instead of waiting a minute
+            started = time.perf_counter()
+            return hung, stuck, await gen.extract_pdf_text("https://example.invalid/ok"), time.perf_counter() - started
+        finally:
+            await http.aclose()
+            await gen.close_pdf_client()
+
+    try:
+        hung, stuck, ok, seconds = asyncio.run(run())
+    finally:
+        gen.shutdown_pdf_pool()
+    assert hung is None and stuck is None
+    assert ok == "ok" and seconds < 5
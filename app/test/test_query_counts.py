@@ -0,0 +1,149 @@
+import datetime
+import gc
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.instrumentation import instrument_engine
+from app.core.security import create_access_token
+from app.db.session import get_async_db, get_db
+from app.main import app
+from app.models import Base, Bill, BillHistory, BillText, FollowedBill, Session as LegSession, User
+from app.models.bills import Sponsor
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "counts.db"
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def override_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    monkeypatch.setattr("app.core.config.settings.SECRET_KEY", "test")
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_async_db] = override_async_db
+    gc.collect()  # see test_instrumentation.make_app
+    with TestClient(app) as client:
+        client.db = SessionLocal
+        yield client
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+def seed_bill(db, bill_id, rows):
+    db.merge(LegSession(id=1, state_id=23, year_start=2025, year_end=2026, prefile=0, sine_die=0, prior=0,
+                        special=0, session_tag="R", session_title="Regular", session_name="2025-2026"))
+    db.add(Bill(id=bill_id, bill_number=f"HF{bill_id}", title=f"Bill {bill_id}", state="MN", session_id=1))
+    for i in range(rows):
+        db.add(BillHistory(bill_id=bill_id, action=f"Action {i}", chamber="H", chamber_id=1, importance=0))
+        db.add(Sponsor(
+            bill_id=bill_id, people_id=i, person_hash="h", party_id=1, party="D", role_id=1, role="Rep",
+            name="Name", first_name="F", middle_name="", last_name="L", suffix="", nickname="", district="1",
+            ftm_eid=0, votesmart_id=0, opensecrets_id="", knowwho_pid=0, ballotpedia="", bioguide_id="",
+            sponsor_type_id=1, sponsor_order=i, committee_sponsor=0, committee_id=0, state_federal=0,
+        ))
+        db.add(BillText(bill_id=bill_id, doc_id=bill_id * 100 + i, type="Introduced", type_id=1, mime="pdf",
+                        mime_id=2, url="u", state_link="s", text_size=1, text_hash=f"{bill_id}-{i}"))
+    db.commit()
+
+
+def test_bill_detail_query_count_is_independent_of_history_length(client):
+    db = client.db()
+    seed_bill(db, 101, 1)
+    seed_bill(db, 102, 40)
+    db.close()
+
+    short = query_count(client.get("/api/v1/bills/101"))
+    long = query_count(client.get("/api/v1/bills/102"))
+    assert short == long == 7
+
+
+def test_feed_cursor_reads_the_undated_tail_only_when_needed(client):
+    db = client.db()
+    for bill_id in range(1, 8):
+        dated = datetime.datetime(2025, 5, bill_id) if bill_id <= 4 else None
+        db.add(Bill(id=bill_id, bill_number=f"HF{bill_id}", title=f"Bill {bill_id}", state="MN", last_action_date=dated))
+    db.commit()
+    db.close()
+
+    seen, counts, cursor = [], [], None
+    while True:
+        params = {"limit": 3, "include_total": "false", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/bills/state/mn", params=params)
+        counts.append(query_count(response))
+        seen += [b["id"] for b in response.json()["bills"]]
+        cursor = response.json()["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [4, 3, 2, 1, 7, 6, 5]
+    # First page: offset query; second: dated rows run out, so the tail too; third: tail only
+    assert counts == [1, 2, 1]
+
+
+def test_watchlist_query_count_is_independent_of_size(client):
+    db = client.db()
+    for bill_id in range(1, 31):
+        db.add(Bill(id=bill_id, bill_number=f"HF{bill_id}", title=f"Bill {bill_id}", state="MN"))
+    db.add_all([User(id=1, email="one@example.com"), User(id=2, email="many@example.com")])
+    db.add(FollowedBill(user_id=1, bill_id=1))
+    db.add_all(FollowedBill(user_id=2, bill_id=bill_id) for bill_id in range(1, 31))
+    db.commit()
+    db.close()
+
+    def watchlist(email):
+        token = create_access_token({"sub": email})
+        return client.get("/api/v1/users/me/watchlist/", headers={"Authorization": f"Bearer {token}"})
+
+    one, many = watchlist("one@example.com"), watchlist("many@example.com")
+    assert len(many.json()["watchlist"]) == 30
+    assert many.json()["watchlist"][0] == {"bill_id": 1, "title": "Bill 1"}
+    assert query_count(one) == query_count(many) == 2
+
+
+def test_concurrent_follow_is_a_conflict_not_an_error(client):
+    db = client.db()
+    db.add(Bill(id=1, bill_number="HF1", title="Bill 1", state="MN"))
+    db.add(User(id=1, email="one@example.com"))
+    db.commit()
+    db.close()
+
+    # The other request's row lands after this one's duplicate check
+    raced = []
+
+    def race(session):
+        if not raced:
+            raced.append(True)
+            other = client.db()
+            other.add(FollowedBill(user_id=1, bill_id=1))
+            other.commit()
+            other.close()
+
+    event.listen(client.db, "before_commit", race)
+    token = create_access_token({"sub": "one@example.com"})
+    response = client.post("/api/v1/users/me/watchlist/1", headers={"Authorization": f"Bearer {token}"})
+    event.remove(client.db, "before_commit", race)
+    assert response.status_code == 409
@@ -0,0 +1,94 @@
+# Query-plan regression checks for the hot queries.
+# Needs a throwaway local PostgreSQL:  TEST_DATABASE_URL=postgresql://... pytest app/test/test_query_plans.py
+import datetime
+import json
+import pytest
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Bill, FollowedBill
+from app.models import bills
+
+
+@pytest.fixture(scope="module")
+def db(pg_module_engine):
+    session = sessionmaker(bind=pg_module_engine)()
+    # Tables are empty, so make any usable index win over a seq scan
+    session.execute(text("SET enable_seqscan = off"))
+    yield session
+    session.close()
+
+
+def plan_index_conds(db, query):
+    """Run EXPLAIN on an ORM query or select() and return {index name: its Index Cond} for the plan."""
+    statement = getattr(query, "statement", query)
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+
+    found, stack = {}, [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found[node["Index Name"]] = node.get("Index Cond", "")
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def plan_indexes(db, query):
+    """Every index name in the plan of an ORM query."""
+    return set(plan_index_conds(db, query))
+
+
+def test_state_feed_uses_feed_index(db):
+    query = (
+        db.query(Bill)
+        .filter(Bill.state == "MN")
+        .order_by(Bill.last_action_date.desc().nullslast(), Bill.id.desc())
+        .limit(20)
+    )
+    assert "ix_bills_state_last_action_date" in plan_indexes(db, query)
+
+
+@pytest.mark.parametrize("after_date", [datetime.date(2025, 5, 19), None])
+def test_feed_cursor_pages_are_index_ranges(db, after_date):
+    from app.api.v1.endpoints.bills import _feed_queries_after, _state_feed_query
+
+    # Each part seeks on last_action_date too, not just state with the cursor as a filter
+    for query in _feed_queries_after(_state_feed_query("MN"), after_date, 42):
+        conds = plan_index_conds(db, query.limit(21))
+        assert "last_action_date" in conds.get("ix_bills_state_last_action_date", "")
+
+
+def test_state_count_refresh_uses_state_status_index(db):
+    # Same shape as refresh_state_counts() runs after every sync write
+    query = (
+        db.query(Bill.state, Bill.status, func.count(Bill.id))
+        .filter(Bill.state.in_(["MN"]))
+        .group_by(Bill.state, Bill.status)
+    )
+    assert "ix_bills_state_status" in plan_indexes(db, query)
+
+
+@pytest.mark.parametrize("model", [
+    bills.Sponsor,
+    bills.Referral,
+    bills.BillHistory,
+    bills.BillText,
+    bills.CalendarEvent,
+    bills.Vote,
+    bills.Amendment,
+    bills.Supplement,
+    bills.Sast,
+])
+def test_child_lookup_by_bill_uses_fk_index(db, model):
+    query = db.query(model).filter(model.bill_id.in_([1, 2, 3]))
+    assert f"ix_{model.__tablename__}_bill_id" in plan_indexes(db, query)
+
+
+def test_watchlist_lookups_use_pair_constraint(db):
+    pair = db.query(FollowedBill).filter(FollowedBill.user_id == 1, FollowedBill.bill_id == 2)
+    by_user = db.query(FollowedBill).filter(FollowedBill.user_id == 1)
+    assert "uq_followed_bills_user_bill" in plan_indexes(db, pair)
+    assert "uq_followed_bills_user_bill" in plan_indexes(db, by_user)
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import _async_url
+from app.services.bill_writer import write_bills
+from app.utils.pagination import decode_rank_cursor, encode_rank_cursor
+
+RESPONSE = os.path.join(os.path.dirname(__file__), "..", "..", "response.txt")
+
+
+def test_rank_cursor_roundtrip():
+    assert decode_rank_cursor(encode_rank_cursor(0.0607927, 42)) == (0.0607927, 42)
+    with pytest.raises(ValueError):
+        decode_rank_cursor("not-a-cursor")
+
+
+@pytest.fixture
+def search_db(pg_engine):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(_async_url(pg_engine.url))
+    with open(RESPONSE) as fh:
+        template = json.load(fh)["bill"]
+
+    bills = []
+    for i in range(25):
+        topic = "rural school funding" if i % 2 else "highway maintenance"
+        bills.append({
+            **template,
+            "bill_id": 900_000 + i,
+            "bill_number": f"SF{i}",
+            "state": "MN" if i < 20 else "WI",
+            "title": f"Bill {i} relating to {topic}",
+            "description": f"Provides for {topic}",
+            "texts": [{**t, "text_hash": f"search-test-{i}-{k}"} for k, t in enumerate(template["texts"])],
+        })
+    db = sessionmaker(bind=pg_engine)()
+    write_bills(db, bills)
+    db.close()
+
+    loop = asyncio.new_event_loop()
+    yield loop, async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+
+def test_search_filters_ranks_and_pages(search_db):
+    from app.services.search_service import search_bills
+
+    loop, Session = search_db
+
+    async def search(**kwargs):
+        async with Session() as db:
+            return await search_bills(db, **kwargs)
+
+    first = loop.run_until_complete(search(q="school funding", state="mn", limit=4))
+    assert len(first["bills"]) == 4 and all("school" in b["title"] for b in first["bills"])
+    ranks = [b["rank"] for b in first["bills"]]
+    assert ranks == sorted(ranks, reverse=True)
+
+    seen, cursor = [b["id"] for b in first["bills"]], first["next_cursor"]
+    while cursor:
+        page = loop.run_until_complete(search(q="school funding", state="MN", limit=4, cursor=cursor))
+        seen += [b["id"] for b in page["bills"]]
+        cursor = page["next_cursor"]
+    assert sorted(seen) == [900_000 + i for i in range(1, 20, 2)]  # odd ids in MN, each exactly once
+
+    assert first["truncated"] is False
+    assert loop.run_until_complete(search(q="highway -maintenance"))["bills"] == []
+
+
+def test_broad_queries_report_truncation(search_db, monkeypatch):
+    from app.services.search_service import search_bills
+
+    loop, Session = search_db
+    monkeypatch.setattr("app.core.config.settings.SEARCH_MAX_CANDIDATES", 5)
+
+    async def search(**kwargs):
+        async with Session() as db:
+            return await search_bills(db, **kwargs)
+
+    async def search_and_plan_mode(**kwargs):
+        async with Session() as db:
+            result = await search_bills(db, **kwargs)
+            return result, (await db.execute(text("SHOW plan_cache_mode"))).scalar()
+
+    # A generic plan cannot tell broad terms (walk bills_pkey) from narrow ones (GIN)
+    broad, plan_mode = loop.run_until_complete(search_and_plan_mode(q="relating", limit=100))
+    assert plan_mode == "force_custom_plan"
+    assert broad["truncated"] is True
+    assert sorted(b["id"] for b in broad["bills"]) == [900_000 + i for i in range(20, 25)]  # newest five
+    assert loop.run_until_complete(search(q="relating", state="WI"))["truncated"] is False
+
+
+def test_extracted_text_becomes_searchable(search_db):
+    from app.services.search_service import search_bills
+    from app.services.text_store_service import save_extracted_texts
+
+    loop, Session = search_db
+
+    async def run():
+        async with Session() as db:
+            assert (await search_bills(db, "pothole"))["bills"] == []
+            await save_extracted_texts(db, {"search-test-3-0": (1, "The commissioner shall study pothole repair.")})
+            return await search_bills(db, "pothole")
+
+    assert [b["id"] for b in loop.run_until_complete(run())["bills"]] == [900_003]
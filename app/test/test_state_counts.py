@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Bill, StateBillCount
+from app.services.bill_writer import write_bills
+from app.services.state_count_service import refresh_state_counts
+
+RESPONSE = os.path.join(os.path.dirname(__file__), "..", "..", "response.txt")
+
+
+@pytest.fixture
+def Session(pg_engine):
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture
+def make_bill():
+    with open(RESPONSE) as fh:
+        template = json.load(fh)["bill"]
+
+    def make(bill_id, status, state="MN"):
+        return {**template, "bill_id": bill_id, "status": status, "state": state, "change_hash": f"{bill_id}-{status}",
+                "texts": [], "sponsors": [], "history": [], "referrals": [], "calendar": [], "sasts": []}
+    return make
+
+
+def counts(db):
+    return {(r.state, r.status): r.bill_count for r in db.query(StateBillCount)}
+
+
+def recount(db):
+    return dict(((state, status), n) for state, status, n in db.execute(
+        select(Bill.state, func.coalesce(Bill.status, 0), func.count()).group_by(Bill.state, func.coalesce(Bill.status, 0))
+    ))
+
+
+def test_writes_apply_deltas(Session, make_bill):
+    db = Session()
+    write_bills(db, [make_bill(1, 1), make_bill(2, 1), make_bill(3, 2, "WI")])
+    assert counts(db) == {("MN", 1): 2, ("WI", 2): 1}
+
+    write_bills(db, [make_bill(2, 4)])  # status moves: one bill changes buckets
+    write_bills(db, [make_bill(1, 1)])  # rewrite, same status: nothing moves
+    assert counts(db) == recount(db) == {("MN", 1): 1, ("MN", 4): 1, ("WI", 2): 1}
+
+    refresh_state_counts(db, ["MN"])
+    db.commit()
+    assert counts(db) == recount(db)
+    db.close()
+
+
+def test_concurrent_writers_of_one_state(Session, make_bill):
+    errors = []
+
+    def writer(start):
+        db = Session()
+        try:
+            for i in range(start, start + 20):
+                write_bills(db, [make_bill(i, i % 3)])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=writer, args=(start,)) for start in (100, 200, 300)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    db = Session()
+    assert counts(db) == recount(db)
+    assert sum(counts(db).values()) == 60
+    db.close()
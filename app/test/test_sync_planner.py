@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Bill
+from app.services import sync_planner
+
+
+class FakeLegiScan:
+    """Two current sessions and one prior one; counts queries by op."""
+
+    def __init__(self):
+        self.calls = []
+        self.session_hashes = {100: "s1", 101: None}  # 101 has no hash yet
+
+    async def get_session_list(self, state):
+        self.calls.append("getSessionList")
+        return [{"session_id": 99, "prior": 1, "session_hash": "old"}] + [
+            {"session_id": sid, "prior": 0, "session_hash": h} for sid, h in self.session_hashes.items()
+        ]
+
+    async def get_master_list_raw(self, session_id=None, state=None):
+        self.calls.append(f"getMasterListRaw:{session_id}")
+        bills = {100: [(1, "a"), (2, "b2"), (3, "c")], 101: [(10, "x")]}[session_id]
+        raw = {"session": {"session_id": session_id}}
+        raw.update({str(i): {"bill_id": bill_id, "number": f"HF{bill_id}", "change_hash": h}
+                    for i, (bill_id, h) in enumerate(bills)})
+        return raw
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Bill(id=1, bill_number="HF1", state="MN", change_hash="a"),
+        Bill(id=2, bill_number="HF2", state="MN", change_hash="b"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def legiscan(monkeypatch):
+    fake = FakeLegiScan()
+    monkeypatch.setattr(sync_planner, "legiscan", fake)
+    return fake
+
+
+def test_only_new_and_changed_bills_are_planned(db, legiscan):
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "mn"))
+    by_session = {p["session_id"]: p["changed_ids"] for p in plan["sessions"]}
+    assert by_session == {100: [2, 3], 101: [10]}  # prior session 99 never considered
+    assert plan["skipped_sessions"] == []
+
+
+def test_session_with_unchanged_session_hash_is_skipped(db, legiscan):
+    sync_planner.record_session_synced(db, "MN", 100, "s1")
+    sync_planner.record_session_synced(db, "MN", 101, None)
+
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "MN"))
+    assert plan["skipped_sessions"] == [100]
+    # 101 has no session hash to compare, so it is still diffed by change_hash
+    assert [p["session_id"] for p in plan["sessions"]] == [101]
+    assert "getMasterListRaw:100" not in legiscan.calls
+    assert legiscan.calls.count("getSessionList") == 1
+
+    legiscan.session_hashes[100] = "s2"
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "MN"))
+    assert plan["skipped_sessions"] == []
+
+
+def test_force_ignores_stored_session_hash(db, legiscan):
+    sync_planner.record_session_synced(db, "MN", 100, "s1")
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "MN", force=True))
+    assert plan["skipped_sessions"] == []
+
+
+class LocalLegiScan:
+    """The planner's LegiScan calls answered in-process by the benchmark fake."""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    async def get_session_list(self, state):
+        return self.fake.handle("getSessionList", state, None)["sessions"]
+
+    async def get_master_list_raw(self, session_id=None, state=None):
+        return self.fake.handle("getMasterListRaw", state, session_id)["masterlist"]
+
+
+def test_bill_changes_between_dataset_builds_are_planned(db, monkeypatch):
+    from benchmarks.fake_legiscan import FakeLegiScan as BenchLegiScan
+
+    fake = BenchLegiScan(states=["WI"], bills_per_state=5)
+    monkeypatch.setattr(sync_planner, "legiscan", LocalLegiScan(fake))
+    session_id = fake.session_id("WI")
+    db.add_all([Bill(id=b, bill_number=f"HF{b}", state="WI", change_hash=fake.change_hash(b)) for b in fake.bill_ids("WI")])
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "WI"))
+    assert plan["sessions"][0]["changed_ids"] == []
+    sync_planner.record_session_synced(db, "WI", session_id, plan["sessions"][0]["session_hash"])
+    assert asyncio.run(sync_planner.plan_state_sync(db, "WI"))["skipped_sessions"] == [session_id]
+
+    # Mid-week: the dataset is not rebuilt, but the session is
+    dataset_hash = fake.dataset_hash("WI")
+    changed = fake.mutate(0.2)
+    assert fake.dataset_hash("WI") == dataset_hash
+    plan = asyncio.run(sync_planner.plan_state_sync(db, "WI"))
+    assert plan["skipped_sessions"] == [] and plan["sessions"][0]["changed_ids"] == changed
+    assert fake.calls["getDatasetList"] == 0
+
+
+def test_masterlist_sync_diffs_on_its_own_hash(pg_session):
+    from app.services.sync_legiscan import bulk_sync_masterlist
+
+    db = pg_session
+    masterlist = {
+        "session": {"session_id": 7, "state_id": 23, "year_start": 2025, "year_end": 2026, "session_tag": "R",
+                    "session_title": "Regular", "session_name": "2025-2026"},
+        "0": {"bill_id": 1, "number": "HF1", "change_hash": "a", "title": "One"},
+        "1": {"bill_id": 2, "number": "HF2", "change_hash": "b", "title": "Two"},
+    }
+    assert bulk_sync_masterlist(db, "MN", masterlist)["changed_ids"] == [1, 2]
+    assert db.get(Bill, 1).title == "One" and db.get(Bill, 1).change_hash is None
+    # A rerun of an unchanged masterlist writes nothing ...
+    stats = bulk_sync_masterlist(db, "MN", masterlist)
+    assert stats["changed_ids"] == [] and stats["unchanged"] == 2
+    # ... yet with no getBill so far both still need their details
+    assert sync_planner.changed_bill_ids(db, {1: "a", 2: "b"}) == [1, 2]
+
+    db.get(Bill, 1).change_hash = "a"  # as write_bills does
+    db.commit()
+    assert sync_planner.changed_bill_ids(db, {1: "a", 2: "b"}) == [2]
+
+    masterlist["1"] = {**masterlist["1"], "change_hash": "b2", "title": "Two, amended"}
+    assert bulk_sync_masterlist(db, "MN", masterlist)["changed_ids"] == [2]
+    db.expire_all()
+    assert db.get(Bill, 2).title == "Two, amended" and db.get(Bill, 2).change_hash is None
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from sqlalchemy.pool import NullPool
+
+from app.db.session import _async_url
+from app.models import BillText
+
+
+@pytest.fixture
+def Session(pg_engine):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    # No pool to dispose: asyncpg connections are tied to the loop that opened them
+    async_engine = create_async_engine(_async_url(pg_engine.url), poolclass=NullPool)
+    return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    from app.services import ai_generator_service
+
+    urls = []
+
+    async def fake_extract(url):
+        urls.append(url)
+        return f"text of {url}"
+
+    monkeypatch.setattr(ai_generator_service, "extract_pdf_text", fake_extract)
+    return urls
+
+
+def test_stored_texts_are_reused_by_hash(Session, downloads):
+    from app.services.ai_generator_service import load_bill_texts
+
+    texts = [
+        BillText(doc_id=1, text_hash="h1", state_link="https://example.invalid/1.pdf"),
+        BillText(doc_id=2, text_hash="h1", state_link="https://example.invalid/1-copy.pdf"),  # same document
+        BillText(doc_id=3, text_hash="h2", state_link="https://example.invalid/2.pdf"),
+        BillText(doc_id=4, text_hash=None, state_link="https://example.invalid/unhashed.pdf"),
+    ]
+
+    async def load_twice():
+        async with Session() as db:
+            first = await load_bill_texts(db, texts)
+            fetched_first = list(downloads)
+            downloads.clear()
+        async with Session() as db:
+            return first, fetched_first, await load_bill_texts(db, texts)
+
+    first, fetched_first, second = asyncio.run(load_twice())
+    assert first == ["text of https://example.invalid/1.pdf"] * 2 + [
+        "text of https://example.invalid/2.pdf", "text of https://example.invalid/unhashed.pdf",
+    ]
+    assert sorted(fetched_first) == sorted(["https://example.invalid/1.pdf", "https://example.invalid/2.pdf",
+                                            "https://example.invalid/unhashed.pdf"])
+
+    # Second pass: hashed documents come from the store, only the unhashed one is fetched again
+    assert second == first
+    assert downloads == ["https://example.invalid/unhashed.pdf"]
@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(last_action_date: Optional[datetime], bill_id: int) -> str:
+    """Opaque keyset cursor for the (last_action_date DESC, id DESC) feed order."""
+    payload = [last_action_date.isoformat() if last_action_date else None, bill_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date_str, bill_id = json.loads(raw)
+        return (datetime.fromisoformat(date_str) if date_str else None), int(bill_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_rank_cursor(rank: float, bill_id: int) -> str:
+    """Opaque keyset cursor for the (rank DESC, id DESC) search order."""
+    return base64.urlsafe_b64encode(json.dumps([rank, bill_id]).encode()).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_rank_cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, bill_id = json.loads(raw)
+        return float(rank), int(bill_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -1,96 +1,114 @@
-# celery_tasks.py (New file for Celery tasks; assume Celery is set up as per earlier architecture)
+# celery_tasks.py
+#
+# Worker:  celery -A app.workers.celery_tasks worker -l info --concurrency 4
+# Local:   CELERY_ALWAYS_EAGER=true runs tasks inline, no broker or worker needed
+
+import asyncio
+import threading
+import time
 
 from celery import Celery
-# import requests
-from datetime import datetime
-from app.db.session import SessionLocal  # Assume you have a session maker
-from app.models.bills import Bill, Session as BillSession
-# from app.routers.bills import update_bill_in_db  # Import the update function; make it sync if needed
-from app.api.v1.endpoints.bills import update_bill_in_db
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import NullPool
+
 from app.core.config import settings
-from app.services.legiscan_service import legiscan
+from app.db.session import async_database_url
+from app.services.ai_enrichment_service import enrich_bill_with_ai
+from app.services.enrichment_queue import enrichment_queue
+
+celery = Celery("sphere", broker=settings.CELERY_BROKER_URL)
+celery.conf.update(
+    task_always_eager=settings.CELERY_ALWAYS_EAGER,
+    task_ignore_result=True,  # job status is kept by enrichment_queue
+    task_acks_late=True,
+    # Take one job at a time so a freshly queued watched bill can jump the line
+    worker_prefetch_multiplier=1,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
+)
 
-# celery = Celery("tasks", broker="redis://localhost:6379/0")  # As per earlier
+# Tasks get their own connections: asyncpg connections are tied to the loop
+# that opened them, and the worker loop below is not the API's loop.
+_task_engine = create_async_engine(async_database_url, poolclass=NullPool)
+TaskSession = async_sessionmaker(_task_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-base_url = "https://api.legiscan.com"
-api_key = settings.LEGISCAN_API_KEY
+_loop = None
+_loop_lock = threading.Lock()
+_background = set()  # strong refs to jobs scheduled on the worker loop until they finish
 
-# @celery.task
-async def sync_state_bills(state: str):
-    db = SessionLocal()
+
+def _on_worker_loop() -> bool:
     try:
-        response = await legiscan.get_bills_for_state(state) #requests.get(f"{base_url}/?key={api_key}&op=getMasterList&state={state}")
-        master_data = response#.json()
-        
-        # if master_data.get('status') != 'OK':
-        #     return {"error": "Failed to fetch master list"}
-        
-        masterlist = master_data['masterlist']
-        
-        # Handle session
-        session_info = masterlist.pop('session', None)
-        if session_info:
-            db_session = db.query(BillSession).filter(BillSession.id == session_info['session_id']).first()
-            if not db_session:
-                db_session = BillSession(
-                    id=session_info['session_id'],
-                    state_id=session_info['state_id'],
-                    year_start=session_info['year_start'],
-                    year_end=session_info['year_end'],
-                    prefile=session_info.get('prefile', 0),
-                    sine_die=session_info.get('sine_die', 0),
-                    prior=session_info.get('prior', 0),
-                    special=session_info.get('special', 0),
-                    session_tag=session_info['session_tag'],
-                    session_title=session_info['session_title'],
-                    session_name=session_info['session_name']
-                )
-                db.add(db_session)
-                db.commit()
-                db.refresh(db_session)
-            session_id = db_session.id
-        else:
-            session_id = None
-        
-        updated_bills = []
-        for key, item in masterlist.items():
-            if isinstance(item, dict) and 'bill_id' in item:
-                bill_id = item['bill_id']
-                db_bill = db.query(Bill).filter(Bill.id == bill_id).first()
-                
-                update_needed = True
-                if db_bill and db_bill.change_hash == item['change_hash']:
-                    update_needed = False
-                
-                # Update summary fields regardless if new or changed
-                if not db_bill:
-                    db_bill = Bill(id=bill_id, state=state, session_id=session_id)
-                    db.add(db_bill)
-                
-                db_bill.bill_number = item['number']
-                db_bill.change_hash = item['change_hash']
-                db_bill.title = item['title']
-                db_bill.description = item['description']
-                db_bill.url = item['url']
-                db_bill.status = item['status']
-                db_bill.status_date = datetime.strptime(item['status_date'], '%Y-%m-%d') if item['status_date'] else None
-                db_bill.last_updated = datetime.strptime(item['last_action_date'], '%Y-%m-%d') if item['last_action_date'] else None
-                
-                db.commit()
-                db.refresh(db_bill)
-                
-                if update_needed:
-                    # Fetch full details
-                    bill_response = requests.get(f"{base_url}/?key={api_key}&op=getBill&id={bill_id}")
-                    bill_data = bill_response.json()
-                    if bill_data.get('status') == 'OK':
-                        update_bill_in_db(db, db_bill, bill_data['bill'])  # Assuming update_bill_in_db is sync; adjust if async
-                
-                updated_bills.append(bill_id)
-        
-        return {"updated_bills": updated_bills}
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def run_async(coro):
+    """
+    Run a coroutine on this process's long-lived worker loop and wait for
+    it. One loop per process keeps the async OpenAI/httpx clients on a
+    single loop. Must not be called from that loop itself (e.g. an eager
+    task enqueued by sync.state_bills): it would wait on itself forever.
+    """
+    global _loop
+    if _on_worker_loop():
+        coro.close()
+        raise RuntimeError("run_async() called from the worker loop; schedule a task instead")
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="celery-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+async def _enrich(bill_id: int, mode: str) -> dict:
+    async with TaskSession() as db:
+        return await enrich_bill_with_ai(db, bill_id, mode)
+
+
+async def _run_enrichment(bill_id: int, mode: str) -> dict:
+    enrichment_queue.mark(bill_id, state="running", started_at=time.time())
+    try:
+        result = await _enrich(bill_id, mode)
+    except Exception as e:
+        enrichment_queue.mark(bill_id, state="failed", error=repr(e), finished_at=time.time())
+        raise
     finally:
-        db.close()
+        enrichment_queue.release(bill_id)
+
+    if result.get("error"):
+        enrichment_queue.mark(bill_id, state="failed", error=result["error"], finished_at=time.time())
+    else:
+        enrichment_queue.mark(bill_id, state="done", cached=bool(result.get("cached")), finished_at=time.time())
+    return {"bill_id": bill_id, "ok": not result.get("error")}
+
+
+def _log_failure(task: asyncio.Task):
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"❌ Enrichment task failed: {task.exception()!r}")
+
+
+@celery.task(name="ai.enrich_bill", rate_limit=settings.AI_RATE_LIMIT)
+def enrich_bill(bill_id: int, mode: str = "latest"):
+    """Background AI enrichment for one bill; rate limited per worker against the LLM provider."""
+    if _on_worker_loop():
+        # Eager mode, enqueued by a coroutine already running on the worker
+        # loop: run alongside it; the queue status reports the outcome
+        task = _loop.create_task(_run_enrichment(bill_id, mode))
+        _background.add(task)
+        task.add_done_callback(_log_failure)
+        return {"bill_id": bill_id, "scheduled": True}
+    return run_async(_run_enrichment(bill_id, mode))
+
 
-# Example usage:
-result = sync_state_bills("MN")
\ No newline at end of file
+@celery.task(name="sync.state_bills")
+def sync_state(state: str):
+    """Masterlist + getBill sync for one state (enqueues enrichment for changed texts)."""
+    from app.workers.sync_bills import sync_state_bills
+    result = run_async(sync_state_bills(state))
+    return {"state": state, "updated": len(result.get("updated_bills", []))}
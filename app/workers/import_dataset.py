@@ -0,0 +1,45 @@
+# import_dataset.py
+#
+#   python -m app.workers.import_dataset path/to/dataset.zip
+#   python -m app.workers.import_dataset --session <session_id> <access_key>
+
+import asyncio
+import sys
+from app.db.session import SessionLocal
+from app.services.dataset_importer import download_dataset_zip, import_dataset_zip
+from app.services.legiscan_service import legiscan
+
+
+def import_zip(path: str):
+    db = SessionLocal()
+    try:
+        return import_dataset_zip(db, path)
+    finally:
+        db.close()
+
+
+async def import_session_dataset(session_id: int, access_key: str):
+    """
+    Initial load of a session from its dataset ZIP: one getDataset query
+    instead of a getBill per bill. No session hash is recorded: the
+    dataset may be a week old, so the next incremental run diffs the
+    session's change_hashes and fetches only what moved since.
+    """
+    try:
+        _, path = await download_dataset_zip(session_id, access_key)
+    finally:
+        await legiscan.shutdown()
+
+    db = SessionLocal()
+    try:
+        return import_dataset_zip(db, path)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--session"]:
+        result = asyncio.run(import_session_dataset(int(sys.argv[2]), sys.argv[3]))
+    else:
+        result = import_zip(sys.argv[1])
+    print(f"--------------------> {result}")
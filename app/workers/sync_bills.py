@@ -1,97 +1,94 @@
 # sync_bills.py  (new standalone script)
 
-from datetime import datetime
+import asyncio
+import time
 from app.db.session import SessionLocal
-from app.models.bills import Bill, Session as BillSession
-from app.api.v1.endpoints.bills import update_bill_in_db
 from app.core.config import settings
+from app.services.bill_writer import write_bills
+from app.services.enrichment_queue import enqueue_enrichment
 from app.services.legiscan_service import legiscan
-
-base_url = "https://api.legiscan.com"
-api_key = settings.LEGISCAN_API_KEY
-
-
-async def sync_state_bills(state: str):
+from app.services.sync_pipeline import iter_bill_details
+from app.services.sync_planner import plan_state_sync, record_session_synced
+from app.utils.variables import states as STATE_CODES
+
+
+async def fetch_and_write(db, bill_ids):
+    """
+    Fan out getBill concurrently; write arrivals in small batches so
+    children for many bills go out in one executemany per table.
+    Returns (updated ids, failed ids, ids whose bill texts changed).
+    """
+    updated_bills, failed_bills, batch = [], [], []
+    text_changed = set()
+
+    def flush():
+        written = write_bills(db, batch)
+        updated_bills.extend(b["bill_id"] for b in batch)
+        text_changed.update(written.get("bill_texts", {}).get("changed_bill_ids", []))
+        batch.clear()
+
+    async for bill_id, bill_info in iter_bill_details(bill_ids):
+        if bill_info is None:
+            failed_bills.append(bill_id)
+            continue
+        batch.append(bill_info)
+        if len(batch) >= settings.SYNC_WRITE_BATCH_SIZE:
+            flush()
+    flush()
+    return updated_bills, failed_bills, text_changed
+
+
+async def sync_state_bills(state: str, force: bool = False):
+    """
+    Incremental sync for one state: the planner skips sessions whose
+    LegiScan session_hash is unchanged and narrows the rest to new/changed
+    bill ids, which are the only ones fetched with getBill.
+    """
     db = SessionLocal()
     try:
-        # If legiscan.get_bills_for_state is async, just replace with requests
-        response = await legiscan.get_bills_for_state(state)
-        master_data = response
-
-        # if master_data.get("status") != "OK":
-        #     return {"error": "Failed to fetch master list"}
-
-        masterlist = master_data["masterlist"]
-
-        # Handle session
-        session_info = masterlist.pop("session", None)
-        if session_info:
-            db_session = db.query(BillSession).filter(BillSession.id == session_info["session_id"]).first()
-            if not db_session:
-                db_session = BillSession(
-                    id=session_info["session_id"],
-                    state_id=session_info["state_id"],
-                    year_start=session_info["year_start"],
-                    year_end=session_info["year_end"],
-                    prefile=session_info.get("prefile", 0),
-                    sine_die=session_info.get("sine_die", 0),
-                    prior=session_info.get("prior", 0),
-                    special=session_info.get("special", 0),
-                    session_tag=session_info["session_tag"],
-                    session_title=session_info["session_title"],
-                    session_name=session_info["session_name"],
-                )
-                db.add(db_session)
-                db.commit()
-                db.refresh(db_session)
-            session_id = db_session.id
-        else:
-            session_id = None
-
-        updated_bills = []
-        for key, item in masterlist.items():
-            if isinstance(item, dict) and "bill_id" in item:
-                bill_id = item["bill_id"]
-                db_bill = db.query(Bill).filter(Bill.id == bill_id).first()
-
-                update_needed = True
-                if db_bill and db_bill.change_hash == item["change_hash"]:
-                    update_needed = False
-
-                if not db_bill:
-                    db_bill = Bill(id=bill_id, state=state, session_id=session_id)
-                    db.add(db_bill)
-
-                db_bill.bill_number = item["number"]
-                db_bill.change_hash = item["change_hash"]
-                db_bill.title = item["title"]
-                db_bill.description = item["description"]
-                db_bill.url = item["url"]
-                db_bill.status = item["status"]
-                db_bill.status_date = (
-                    datetime.strptime(item["status_date"], "%Y-%m-%d") if item["status_date"] else None
-                )
-                db_bill.last_updated = (
-                    datetime.strptime(item["last_action_date"], "%Y-%m-%d") if item["last_action_date"] else None
-                )
-
-                db.commit()
-                db.refresh(db_bill)
-
-                if update_needed:
-                    bill_response = requests.get(f"{base_url}/?key={api_key}&op=getBill&id={bill_id}")
-                    bill_data = bill_response.json()
-                    if bill_data.get("status") == "OK":
-                        update_bill_in_db(db, db_bill, bill_data["bill"])
+        timings = {}
+        t0 = time.perf_counter()
+        plan = await plan_state_sync(db, state, force=force)
+        timings["plan"] = round(time.perf_counter() - t0, 4)
+
+        t0 = time.perf_counter()
+        updated_bills, failed_bills, text_changed = [], [], set()
+        for session in plan["sessions"]:
+            updated, failed, texts = await fetch_and_write(db, session["changed_ids"])
+            updated_bills += updated
+            failed_bills += failed
+            text_changed |= texts
+            # Failed ids keep their old change_hash, so leaving the session
+            # hash unrecorded makes the next run pick exactly them up again
+            if not failed:
+                record_session_synced(db, state, session["session_id"], session["session_hash"])
+        timings["details"] = round(time.perf_counter() - t0, 4)
+
+        # New or changed bill texts -> background AI enrichment (watched bills first)
+        queued = enqueue_enrichment(db, text_changed)
+
+        print(f"[sync {state}] skipped_sessions={len(plan['skipped_sessions'])} updated={len(updated_bills)} "
+              f"failed={len(failed_bills)} enrich_queued={len(queued)} timings={timings}")
+        return {
+            "updated_bills": updated_bills,
+            "failed_bills": failed_bills,
+            "skipped_sessions": plan["skipped_sessions"],
+            "enrich_queued": len(queued),
+            "timings": timings,
+        }
+    finally:
+        db.close()
 
-                updated_bills.append(bill_id)
 
-        return {"updated_bills": updated_bills}
+async def sync_all_states():
+    """Nightly refresh: every state, planned incrementally + concurrent getBill."""
+    try:
+        return {code: await sync_state_bills(code) for code in STATE_CODES.values()}
     finally:
-        db.close()
+        await legiscan.shutdown()
 
 
 if __name__ == "__main__":
     # Example run for Minnesota
-    result = sync_state_bills("MN")
+    result = asyncio.run(sync_state_bills("MN"))
     print(f"--------------------> {result}")
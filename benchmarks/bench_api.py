@@ -0,0 +1,276 @@
+# benchmarks/bench_api.py
+#
+# Load benchmark for the hot read endpoints and the watchlist, against a
+# THROWAWAY PostgreSQL seeded with a synthetic dataset:
+#
+#   BENCH_DATABASE_URL=postgresql://localhost/sphere_bench \
+#       python -m benchmarks.bench_api --bills 500000 --history 20 --output bench_api.json
+#
+# Seeding runs server-side (INSERT ... SELECT generate_series), so 500k
+# bills / 10M history rows take minutes, not hours; pass --skip-seed to
+# reuse a seeded database between runs. The API runs under uvicorn in a
+# subprocess; each endpoint gets --duration seconds of --concurrency
+# closed-loop clients. Reports p50/p95/p99 latency (ms) and requests/sec.
+# Feed/detail/map responses are cached, so compare --no-cache runs to see
+# the database path.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine, text
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+API = "/api/v1"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="API load benchmark against a seeded throwaway PostgreSQL")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="throwaway PostgreSQL; every table is dropped when seeding (default: $BENCH_DATABASE_URL)")
+    parser.add_argument("--bills", type=int, default=50_000)
+    parser.add_argument("--history", type=int, default=20, help="history rows per bill")
+    parser.add_argument("--states", type=int, default=50, help="bills are spread over this many states")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--follows", type=int, default=20, help="followed bills per user")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in the database")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="disable the response cache (in-process and Redis) so every request reaches the database")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--endpoints", default=None, help="comma separated subset of scenario names")
+    parser.add_argument("--output", default=None, help="write results as JSON here")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    return args
+
+
+# ---------- seeding ----------
+
+SEED_SQL = [
+    """
+    INSERT INTO states (code, name)
+    SELECT 'S' || lpad(s::text, 2, '0'), 'State ' || s FROM generate_series(1, :states) s
+    """,
+    """
+    INSERT INTO sessions (id, state_id, year_start, year_end, prefile, sine_die, prior, special,
+                          session_tag, session_title, session_name)
+    SELECT s, s, 2025, 2026, 0, 0, 0, 0, 'Regular Session', '2025-2026 Regular Session', 'Session ' || s
+    FROM generate_series(1, :states) s
+    """,
+    """
+    INSERT INTO bills (id, bill_number, change_hash, title, description, status, status_date, state,
+                       url, session_id, last_updated, last_action, last_action_date)
+    SELECT b,
+           'HF' || b,
+           md5(b::text),
+           'Synthetic bill ' || b || ' relating to ' || md5(b::text),
+           repeat('Description text for a synthetic bill. ', 8),
+           1 + b % 4,
+           date '2025-01-01' + (b % 500),
+           'S' || lpad((1 + b % :states)::text, 2, '0'),
+           'https://legiscan.com/bill/' || b,
+           1 + b % :states,
+           date '2025-01-01' + (b % 500),
+           'Action ' || (b % 97),
+           CASE WHEN b % 50 = 0 THEN NULL ELSE timestamp '2025-01-01' + (b % 500) * interval '1 day' END
+    FROM generate_series(1, :bills) b
+    """,
+    """
+    INSERT INTO bill_history (bill_id, date, action, chamber, chamber_id, importance)
+    SELECT b, date '2025-01-01' + (b % 400) + h, 'History action ' || h, 'H', 55, h % 2
+    FROM generate_series(1, :bills) b, generate_series(1, :history) h
+    """,
+    """
+    INSERT INTO sponsors (bill_id, people_id, person_hash, party_id, party, role_id, role, name, first_name,
+                          middle_name, last_name, suffix, nickname, district, ftm_eid, votesmart_id,
+                          opensecrets_id, knowwho_pid, ballotpedia, bioguide_id, sponsor_type_id,
+                          sponsor_order, committee_sponsor, committee_id, state_federal)
+    SELECT b, p, md5('p' || p), 1, 'D', 1, 'Rep', 'Sponsor ' || p, 'Sponsor', '', p::text, '', '',
+           'HD-' || (p % 134), p, p, '', p, '', '', 1, k, 0, 0, 0
+    FROM generate_series(1, :bills) b, generate_series(1, 3) k, LATERAL (SELECT 1000 + (b * 7 + k) % 5000 AS p) x
+    """,
+    """
+    INSERT INTO bill_texts (bill_id, doc_id, date, type, type_id, mime, mime_id, url, state_link, text_size, text_hash)
+    SELECT b, b, date '2025-01-01' + (b % 400), 'Introduced', 1, 'application/pdf', 2,
+           'https://legiscan.com/text/' || b, 'https://example.invalid/' || b || '?format=pdf',
+           40000 + b % 10000, md5('text' || b)
+    FROM generate_series(1, :bills) b
+    """,
+    """
+    INSERT INTO users (id, email, hashed_password, full_name, is_active)
+    SELECT u, 'user' || u || '@bench.invalid', 'x', 'Bench User ' || u, true
+    FROM generate_series(1, :users) u
+    """,
+    """
+    INSERT INTO followed_bills (user_id, bill_id)
+    SELECT DISTINCT u, 1 + (u * 7919 + f * 104729) % :bills
+    FROM generate_series(1, :users) u, generate_series(1, :follows) f
+    """,
+    """
+    INSERT INTO state_bill_counts (state, status, bill_count)
+    SELECT state, COALESCE(status, 0), COUNT(*) FROM bills GROUP BY state, COALESCE(status, 0)
+    """,
+]
+
+
+def seed(args):
+    from app.models import Base
+    engine = create_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    params = {k: getattr(args, k) for k in ("states", "bills", "history", "users", "follows")}
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        for sql in SEED_SQL:
+            conn.execute(text(sql), params)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    engine.dispose()
+    print(f"seeded {args.bills} bills / {args.bills * args.history} history rows in {time.perf_counter() - t0:.1f}s")
+
+
+# ---------- load ----------
+
+def start_api(args) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=os.environ.copy(),
+    )
+    for _ in range(400):
+        try:
+            httpx.get(f"http://127.0.0.1:{args.port}/openapi.json", timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("API did not start")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_scenario(client, name, make_request, duration, concurrency):
+    latencies, errors, statuses = [], 0, {}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            method, url, headers = make_request(rng)
+            t0 = time.perf_counter()
+            try:
+                resp = await client.request(method, url, headers=headers)
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+                if resp.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    result = {
+        "endpoint": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) or 0, 2),
+        "p95_ms": round(percentile(latencies, 0.95) or 0, 2),
+        "p99_ms": round(percentile(latencies, 0.99) or 0, 2),
+    }
+    print(f"{name:<16} rps={result['rps']:<8} p50={result['p50_ms']:<8} p95={result['p95_ms']:<8} "
+          f"p99={result['p99_ms']:<8} errors={errors}")
+    return result
+
+
+def scenarios(args):
+    from app.core.security import create_access_token
+    tokens = {u: {"Authorization": f"Bearer {create_access_token({'sub': f'user{u}@bench.invalid'})}"}
+              for u in range(1, args.users + 1)}
+
+    def state(rng):
+        return f"S{rng.randint(1, args.states):02d}"
+
+    def user(rng):
+        return tokens[rng.randint(1, args.users)]
+
+    return {
+        "state_feed": lambda rng: ("GET", f"{API}/bills/state/{state(rng)}?limit=20&offset={rng.choice([0, 0, 0, 20, 40, 200])}", None),
+        "bill_detail": lambda rng: ("GET", f"{API}/bills/{rng.randint(1, args.bills)}", None),
+        "states_overview": lambda rng: ("GET", f"{API}/states_overview_count/", None),
+        "watchlist": lambda rng: ("GET", f"{API}/users/me/watchlist/", user(rng)),
+        # Follow a random bill; 409s (already following) are part of the mix
+        "watchlist_follow": lambda rng: ("POST", f"{API}/users/me/watchlist/{rng.randint(1, args.bills)}", user(rng)),
+    }
+
+
+async def load(args):
+    selected = scenarios(args)
+    if args.endpoints:
+        selected = {k: v for k, v in selected.items() if k in args.endpoints.split(",")}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=30) as client:
+        results = []
+        for name, make_request in selected.items():
+            # Short warm-up so connection setup and cold caches are not measured
+            await run_scenario(client, f"{name}:warmup", make_request, min(2.0, args.duration), args.concurrency)
+            results.append(await run_scenario(client, name, make_request, args.duration, args.concurrency))
+        return results
+
+
+def main():
+    args = parse_args()
+    os.environ.update({
+        "DATABASE_URL": args.database_url,
+        "SECRET_KEY": os.getenv("SECRET_KEY") or "bench-secret",
+        "REDIS_URL": os.getenv("BENCH_REDIS_URL", ""),
+        "CELERY_BROKER_URL": "memory://",
+    })
+    if args.no_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    sys.path.insert(0, ROOT)
+
+    if not args.skip_seed:
+        seed(args)
+
+    server = start_api(args)
+    try:
+        results = asyncio.run(load(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "params": {k: v for k, v in vars(args).items() if k != "database_url"},
+        "results": results,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
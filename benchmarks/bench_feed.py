@@ -0,0 +1,175 @@
+# benchmarks/bench_feed.py
+#
+# State feed read path: whole Bill entities vs. the column projection the
+# feed now uses, against a THROWAWAY PostgreSQL seeded with one large state:
+#
+#   BENCH_DATABASE_URL=postgresql://localhost/sphere_bench \
+#       python -m benchmarks.bench_feed --bills 20000 --output bench_feed.json
+#
+# Each variant reads the state both as one full scan and as keyset pages
+# of --page-size, building items the way that version of the route does
+# (BillListItem models from entities before, plain row dicts now).
+# Reports rows/sec and peak Python heap. Seeding reuses bench_api's
+# generator and fills the ai_* columns like an enriched bill.
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Feed query benchmark: ORM entities vs column projection")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="throwaway PostgreSQL; every table is dropped when seeding (default: $BENCH_DATABASE_URL)")
+    parser.add_argument("--bills", type=int, default=20_000, help="bills in the benchmarked state")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant; the best is reported")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--output", default=None, help="write results as JSON here")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    return args
+
+
+AI_FILL = """
+UPDATE bills SET
+    ai_summary = repeat('Plain-English summary sentence. ', 30),
+    ai_impacts = CAST(:impacts AS json),
+    ai_pro_con = CAST(:pro_con AS json)
+"""
+
+
+def seed(args):
+    from sqlalchemy import create_engine, text
+    from benchmarks import bench_api
+
+    bench_api.seed(argparse.Namespace(
+        database_url=args.database_url, states=1, bills=args.bills, history=0, users=0, follows=0,
+    ))
+    impacts = json.dumps([{"group": f"Group {i}", "impact": "Impact description " * 10} for i in range(5)])
+    pro_con = json.dumps({"pros": ["Argument in favour " * 8] * 3, "cons": ["Argument against " * 8] * 3})
+    engine = create_engine(args.database_url)
+    with engine.begin() as conn:
+        conn.execute(text(AI_FILL), {"impacts": impacts, "pro_con": pro_con})
+    engine.dispose()
+
+
+async def read_state(db, query_for, build, state, page_size=None):
+    """Read every feed row of `state`; one query, or keyset pages when page_size is set."""
+    from sqlalchemy import and_, or_, tuple_
+    from app.models import Bill
+
+    items, after = [], None
+    while True:
+        query = query_for().where(Bill.state == state).order_by(Bill.last_action_date.desc().nullslast(), Bill.id.desc())
+        if after:
+            # Same seek predicate as the feed's cursor mode
+            last_date, last_id = after
+            query = query.where(
+                or_(tuple_(Bill.last_action_date, Bill.id) < tuple_(last_date, last_id), Bill.last_action_date.is_(None))
+                if last_date is not None else
+                and_(Bill.last_action_date.is_(None), Bill.id < last_id)
+            )
+        if page_size:
+            query = query.limit(page_size)
+        page = build(await db.execute(query))
+        items.extend(page)
+        if not page_size or len(page) < page_size:
+            return items
+        last = page[-1]
+        after = (last["last_action_date"], last["id"]) if isinstance(last, dict) else (last.last_action_date, last.id)
+        db.expunge_all()  # the route uses one session per page
+
+
+def variants():
+    from sqlalchemy import select
+    from app.api.v1.endpoints.bills import FEED_COLUMNS
+    from app.models import Bill
+    from app.schemas.schemas import BillListItem
+
+    def from_entities(result):
+        return [
+            BillListItem(id=b.id, title=b.title, status=b.status, last_action_date=b.last_action_date,
+                         last_action=b.last_action)
+            for b in result.scalars()
+        ]
+
+    def from_columns(result):
+        return [r._asdict() for r in result]
+
+    return {
+        "entities": (lambda: select(Bill), from_entities),
+        "columns": (lambda: select(*FEED_COLUMNS), from_columns),
+    }
+
+
+async def run(args):
+    from app.db.session import AsyncSessionLocal, async_engine
+
+    results = []
+    for name, (query_for, build) in variants().items():
+        for mode, page_size in (("full_scan", None), ("paged", args.page_size)):
+            seconds = None
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                async with AsyncSessionLocal() as db:
+                    count = len(await read_state(db, query_for, build, "S01", page_size))
+                seconds = min(seconds or float("inf"), time.perf_counter() - t0)
+
+            # Separate pass for memory; tracemalloc slows everything down several times
+            tracemalloc.start()
+            async with AsyncSessionLocal() as db:
+                await read_state(db, query_for, build, "S01", page_size)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            result = {
+                "variant": name,
+                "mode": mode,
+                "rows": count,
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(count / seconds, 1),
+                "peak_python_mb": round(peak / 2**20, 1),
+            }
+            print(f"{name:<9} {mode:<9} rows={count:<7} {result['seconds']:>7}s  "
+                  f"{result['rows_per_sec']:>10} rows/s  heap={result['peak_python_mb']}MB")
+            results.append(result)
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    args = parse_args()
+    os.environ.update({
+        "DATABASE_URL": args.database_url,
+        "REDIS_URL": "",
+        "CELERY_BROKER_URL": "memory://",
+        "SLOW_QUERY_MS": "60000",  # full scans are slow by design; keep the log quiet
+    })
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    sys.path.insert(0, ROOT)
+
+    if not args.skip_seed:
+        seed(args)
+    results = asyncio.run(run(args))
+
+    report = {
+        "params": {k: v for k, v in vars(args).items() if k != "database_url"},
+        "results": results,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
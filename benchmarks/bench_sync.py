@@ -0,0 +1,192 @@
+# benchmarks/bench_sync.py
+#
+# Sync benchmark against the local LegiScan stand-in and a THROWAWAY
+# PostgreSQL (all tables are dropped and recreated):
+#
+#   BENCH_DATABASE_URL=postgresql://localhost/sphere_bench \
+#       python -m benchmarks.bench_sync --bills 2000 --output bench_sync.json
+#
+# Scenarios: cold sync (empty DB), no-op re-sync, incremental sync after a
+# fraction of bills change, and the per-bill update_bill_in_db path.
+# Reports bills/sec, DB round trips, LegiScan queries by op and peak memory.
+# The fake API runs in its own process so payload generation does not
+# compete with the sync for the GIL.
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync benchmark against a fake LegiScan and a throwaway PostgreSQL")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="throwaway PostgreSQL; every table is dropped (default: $BENCH_DATABASE_URL)")
+    parser.add_argument("--states", default="MN", help="comma separated state codes")
+    parser.add_argument("--bills", type=int, default=1000, help="bills per state")
+    parser.add_argument("--history", type=int, default=0, help="history rows per bill (default: as in response.txt)")
+    parser.add_argument("--change", type=float, default=0.05, help="fraction of bills changed before the incremental run")
+    parser.add_argument("--update-bills", type=int, default=100, help="bills pushed through update_bill_in_db")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also report peak Python heap (several times slower; compare runs like for like)")
+    parser.add_argument("--output", default=None, help="write results as JSON here")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    return args
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_server(args, states, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "FAKE_LEGISCAN_STATES": ",".join(states),
+        "FAKE_LEGISCAN_BILLS": str(args.bills),
+        "FAKE_LEGISCAN_HISTORY": str(args.history),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.fake_legiscan:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    for _ in range(200):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_bench/calls", timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("fake LegiScan did not start")
+
+
+class Meter:
+    """Wall time, DB round trips, LegiScan queries and peak memory for one scenario."""
+
+    def __init__(self, engine, fake_url: str, trace: bool):
+        from sqlalchemy import event
+        self.fake_url = fake_url
+        self.trace = trace
+        self.statements = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.statements += 1
+
+    def run(self, name, fn, bills):
+        httpx.get(f"{self.fake_url}/_bench/calls", params={"reset": True})
+        self.statements = 0
+        if self.trace:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - t0
+        calls = httpx.get(f"{self.fake_url}/_bench/calls").json()
+        result = {
+            "scenario": name,
+            "bills": bills,
+            "seconds": round(seconds, 3),
+            "bills_per_sec": round(bills / seconds, 1) if bills else None,
+            "db_round_trips": self.statements,
+            "legiscan_queries": calls,
+            # ru_maxrss is a high-water mark for the whole run, so it only grows across scenarios
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        if self.trace:
+            result["peak_python_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        print(
+            f"{name:<12} bills={bills:<7} {result['seconds']:>8}s  {result['bills_per_sec'] or '-':>8} bills/s  "
+            f"db={self.statements:<6} legiscan={sum(calls.values()):<6} rss={result['max_rss_mb']}MB"
+        )
+        return result
+
+
+def main():
+    args = parse_args()
+    states = [s.strip().upper() for s in args.states.split(",") if s.strip()]
+    port = free_port()
+    fake_url = f"http://127.0.0.1:{port}"
+
+    # Settings are read at import time, so point the app at the bench DB and fake API first
+    os.environ.update({
+        "DATABASE_URL": args.database_url,
+        "LEGISCAN_BASE_URL": fake_url,
+        "LEGISCAN_API_KEY": "bench",
+        "REDIS_URL": "",
+        "CELERY_BROKER_URL": "memory://",
+    })
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    sys.path.insert(0, ROOT)
+
+    from benchmarks.fake_legiscan import FakeLegiScan
+    from app.db.session import SessionLocal, engine
+    from app.models import Base
+    from app.api.v1.endpoints.fetch_sync_bills import update_bill_in_db
+    from app.services.legiscan_service import legiscan
+    from app.workers.sync_bills import sync_state_bills
+
+    server = start_fake_server(args, states, port)
+    try:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        meter = Meter(engine, fake_url, args.tracemalloc)
+        loop = asyncio.new_event_loop()
+
+        def sync_all():
+            for state in states:
+                loop.run_until_complete(sync_state_bills(state))
+
+        results = [meter.run("cold_sync", sync_all, len(states) * args.bills)]
+        results.append(meter.run("noop_sync", sync_all, 0))
+
+        changed = httpx.post(f"{fake_url}/_bench/mutate", params={"fraction": args.change}).json()["changed"]
+        results.append(meter.run("incremental", sync_all, len(changed)))
+
+        # Same generator in-process: every payload differs from what is stored
+        local = FakeLegiScan(states=states, bills_per_state=args.bills, history_per_bill=args.history or None, seed=1)
+        payloads = [local.bill(bill_id) for bill_id in local.mutate(1.0)[:args.update_bills]]
+
+        def update_each():
+            db = SessionLocal()
+            try:
+                for payload in payloads:
+                    loop.run_until_complete(update_bill_in_db(db, None, payload))
+            finally:
+                db.close()
+
+        results.append(meter.run("update_bill", update_each, len(payloads)))
+        loop.run_until_complete(legiscan.shutdown())
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "params": {k: v for k, v in vars(args).items() if k != "database_url"},
+        "results": results,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# benchmarks/fake_legiscan.py
+#
+# Local stand-in for api.legiscan.com. Payloads are cloned from the real
+# getBill response in response.txt, scaled to the requested size, and are
+# deterministic: a bill's change_hash (and its session_hash) only moves when
+# mutate() bumps it. As on LegiScan, dataset_hash only moves when the weekly
+# dataset is rebuilt, here by publish_datasets().
+#
+#   FAKE_LEGISCAN_BILLS=1000 uvicorn benchmarks.fake_legiscan:app --port 8765
+
+import copy
+import datetime
+import hashlib
+import json
+import os
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+RESPONSE_TXT = os.path.join(os.path.dirname(__file__), "..", "response.txt")
+
+# LegiScan state_id order (alphabetical by state name)
+STATE_IDS = {
+    code: i + 1 for i, code in enumerate([
+        "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL",
+        "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT",
+        "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI",
+        "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+    ])
+}
+
+
+def _hash(*parts) -> str:
+    return hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+class FakeLegiScan:
+    """
+    Generates masterlists and getBill payloads for `bills_per_state` bills
+    per state, each with `history_per_bill` history rows. Counts requests
+    per op so benchmarks can report API query spend.
+    """
+
+    def __init__(
+        self,
+        states: Iterable[str] = ("MN",),
+        bills_per_state: int = 1000,
+        history_per_bill: Optional[int] = None,
+        seed: int = 0,
+    ):
+        with open(RESPONSE_TXT) as fh:
+            self.template = json.load(fh)["bill"]
+        self.states = [s.upper() for s in states]
+        self.bills_per_state = bills_per_state
+        self.history_per_bill = history_per_bill or len(self.template["history"])
+        self.random = random.Random(seed)
+        self.versions: Dict[int, int] = {}  # bill_id -> version, default 0
+        self.published: Dict[int, int] = {}  # versions as of the last dataset build
+        self.calls: Counter = Counter()
+
+    # ---------- identity ----------
+
+    def session_id(self, state: str) -> int:
+        return 9000 + STATE_IDS[state]
+
+    def bill_ids(self, state: str) -> List[int]:
+        base = STATE_IDS[state] * 10_000_000
+        return list(range(base + 1, base + self.bills_per_state + 1))
+
+    def state_of(self, bill_id: int) -> str:
+        state_id = bill_id // 10_000_000
+        return next(code for code, sid in STATE_IDS.items() if sid == state_id)
+
+    def change_hash(self, bill_id: int) -> str:
+        return _hash(bill_id, self.versions.get(bill_id, 0))
+
+    def session_hash(self, state: str) -> str:
+        return _hash(state, *(self.versions.get(b, 0) for b in self.bill_ids(state)))
+
+    def dataset_hash(self, state: str) -> str:
+        return _hash(state, "dataset", *(self.published.get(b, 0) for b in self.bill_ids(state)))
+
+    def publish_datasets(self):
+        """Rebuild every dataset from the current bills, as LegiScan does weekly."""
+        self.published = dict(self.versions)
+
+    def mutate(self, fraction: float, states: Optional[Iterable[str]] = None) -> List[int]:
+        """Bump the version of a random `fraction` of bills (new history row, new text hash)."""
+        changed = []
+        for state in states or self.states:
+            ids = self.bill_ids(state)
+            for bill_id in self.random.sample(ids, max(1, int(len(ids) * fraction))):
+                self.versions[bill_id] = self.versions.get(bill_id, 0) + 1
+                changed.append(bill_id)
+        return changed
+
+    # ---------- payloads ----------
+
+    def session(self, state: str) -> dict:
+        return {**self.template["session"], "session_id": self.session_id(state), "state_id": STATE_IDS[state]}
+
+    def bill(self, bill_id: int) -> dict:
+        state = self.state_of(bill_id)
+        version = self.versions.get(bill_id, 0)
+        number = f"HF{bill_id % 10_000_000}"
+        bill = copy.deepcopy(self.template)
+        bill.update({
+            "bill_id": bill_id,
+            "bill_number": number,
+            "change_hash": self.change_hash(bill_id),
+            "session_id": self.session_id(state),
+            "session": self.session(state),
+            "state": state,
+            "state_id": STATE_IDS[state],
+        })
+
+        base_history = self.template["history"]
+        start = datetime.date(2025, 1, 1)
+        bill["history"] = [
+            {
+                **base_history[i % len(base_history)],
+                "date": (start + datetime.timedelta(days=i + (bill_id % 60))).isoformat(),
+            }
+            for i in range(self.history_per_bill + version)
+        ]
+        bill["texts"] = [
+            {**text, "doc_id": (bill_id % 10_000_000) * 10 + k, "text_hash": _hash("text", bill_id, k, version)}
+            for k, text in enumerate(self.template["texts"])
+        ]
+        return bill
+
+    def masterlist(self, state: str, raw: bool = False) -> dict:
+        masterlist = {"session": self.session(state)}
+        for i, bill_id in enumerate(self.bill_ids(state)):
+            item = {"bill_id": bill_id, "number": f"HF{bill_id % 10_000_000}", "change_hash": self.change_hash(bill_id)}
+            if not raw:
+                item.update({
+                    "url": self.template["url"],
+                    "status_date": self.template["status_date"],
+                    "status": self.template["status"],
+                    "last_action_date": "2025-05-19",
+                    "last_action": self.template["history"][-1]["action"],
+                    "title": self.template["title"],
+                    "description": self.template["description"],
+                })
+            masterlist[str(i)] = item
+        return masterlist
+
+    # ---------- ASGI app ----------
+
+    def handle(self, op: str, state: Optional[str], id: Optional[int]) -> dict:
+        self.calls[op] += 1
+        state = state.upper() if state else None
+        if op == "getBill":
+            return {"status": "OK", "bill": self.bill(int(id))}
+        if op in ("getMasterList", "getMasterListRaw"):
+            if id:
+                state = next(s for s in self.states if self.session_id(s) == int(id))
+            return {"status": "OK", "masterlist": self.masterlist(state, raw=op == "getMasterListRaw")}
+        if op == "getSessionList":
+            return {"status": "OK", "sessions": [{
+                **self.session(state), "session_hash": self.session_hash(state), "dataset_hash": self.dataset_hash(state),
+            }]}
+        if op == "getDatasetList":
+            states = [state] if state else self.states
+            return {"status": "OK", "datasetlist": [
+                {"session_id": self.session_id(s), "state_id": STATE_IDS[s], "dataset_hash": self.dataset_hash(s)}
+                for s in states
+            ]}
+        return {"status": "ERROR", "alert": {"message": f"Unknown op {op}"}}
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake LegiScan")
+
+        @app.get("/")
+        def api(op: str, key: str = "", state: Optional[str] = None, id: Optional[int] = Query(None)):
+            return JSONResponse(self.handle(op, state, id))
+
+        # Control endpoints for benchmarks driving the server from another process
+        @app.post("/_bench/mutate")
+        def mutate(fraction: float):
+            return {"changed": self.mutate(fraction)}
+
+        @app.get("/_bench/calls")
+        def calls(reset: bool = False):
+            counts = dict(self.calls)
+            if reset:
+                self.calls.clear()
+            return counts
+
+        return app
+
+
+fake = FakeLegiScan(
+    states=os.getenv("FAKE_LEGISCAN_STATES", "MN").split(","),
+    bills_per_state=int(os.getenv("FAKE_LEGISCAN_BILLS", 1000)),
+    history_per_bill=int(os.getenv("FAKE_LEGISCAN_HISTORY", 0)) or None,
+)
+app = fake.build_app()
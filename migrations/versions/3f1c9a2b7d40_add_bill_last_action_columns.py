@@ -0,0 +1,53 @@
+"""add bill last action columns
+
+Revision ID: 3f1c9a2b7d40
+Revises: c5bdb26d3552
+Create Date: 2026-10-18 09:12:41.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2b7d40'
+down_revision: Union[str, Sequence[str], None] = 'c5bdb26d3552'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bills', sa.Column('last_action', sa.Text(), nullable=True))
+    op.add_column('bills', sa.Column('last_action_date', sa.DateTime(), nullable=True))
+
+    # Backfill from the latest history row per bill, falling back to last_updated
+    op.execute("""
+        UPDATE bills b
+        SET last_action = h.action,
+            last_action_date = h.date
+        FROM (
+            SELECT DISTINCT ON (bill_id) bill_id, date, action
+            FROM bill_history
+            WHERE date IS NOT NULL
+            ORDER BY bill_id, date DESC, id DESC
+        ) h
+        WHERE h.bill_id = b.id
+    """)
+    op.execute("UPDATE bills SET last_action_date = last_updated WHERE last_action_date IS NULL")
+
+    op.create_index(
+        'ix_bills_state_last_action_date',
+        'bills',
+        ['state', sa.text('last_action_date DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bills_state_last_action_date', table_name='bills')
+    op.drop_column('bills', 'last_action_date')
+    op.drop_column('bills', 'last_action')
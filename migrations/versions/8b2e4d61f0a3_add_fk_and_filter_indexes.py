@@ -0,0 +1,67 @@
+"""add fk and filter indexes
+
+Revision ID: 8b2e4d61f0a3
+Revises: 3f1c9a2b7d40
+Create Date: 2026-10-18 10:03:17.884102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d61f0a3'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a2b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Child tables whose bill_id is filtered on by the sync writer and detail routes
+BILL_CHILD_TABLES = (
+    'sponsors',
+    'referrals',
+    'bill_history',
+    'bill_texts',
+    'calendar_events',
+    'votes',
+    'amendments',
+    'supplements',
+    'sasts',
+    'posts',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in BILL_CHILD_TABLES:
+        op.create_index(op.f(f'ix_{table}_bill_id'), table, ['bill_id'], unique=False)
+    op.create_index(op.f('ix_posts_user_id'), 'posts', ['user_id'], unique=False)
+
+    op.create_index(op.f('ix_bills_session_id'), 'bills', ['session_id'], unique=False)
+    op.create_index('ix_bills_state_status', 'bills', ['state', 'status'], unique=False)
+
+    # Drop duplicate follows before enforcing one row per (user, bill)
+    op.execute("""
+        DELETE FROM followed_bills a
+        USING followed_bills b
+        WHERE a.user_id = b.user_id
+          AND a.bill_id = b.bill_id
+          AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_followed_bills_user_bill', 'followed_bills', ['user_id', 'bill_id'])
+    op.create_index(op.f('ix_followed_bills_bill_id'), 'followed_bills', ['bill_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_followed_bills_bill_id'), table_name='followed_bills')
+    op.drop_constraint('uq_followed_bills_user_bill', 'followed_bills', type_='unique')
+
+    op.drop_index('ix_bills_state_status', table_name='bills')
+    op.drop_index(op.f('ix_bills_session_id'), table_name='bills')
+
+    op.drop_index(op.f('ix_posts_user_id'), table_name='posts')
+    for table in reversed(BILL_CHILD_TABLES):
+        op.drop_index(op.f(f'ix_{table}_bill_id'), table_name=table)
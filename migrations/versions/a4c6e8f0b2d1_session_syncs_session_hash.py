@@ -0,0 +1,31 @@
+"""session_syncs session_hash
+
+Revision ID: a4c6e8f0b2d1
+Revises: d8b3f5a1c7e9
+Create Date: 2026-10-18 20:31:47.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e8f0b2d1'
+down_revision: Union[str, Sequence[str], None] = 'd8b3f5a1c7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('session_syncs', 'dataset_hash', new_column_name='session_hash')
+    # Stored dataset hashes never match a session_hash; the next sync diffs each session once
+    op.execute(sa.text("UPDATE session_syncs SET session_hash = NULL"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("UPDATE session_syncs SET session_hash = NULL"))
+    op.alter_column('session_syncs', 'session_hash', new_column_name='dataset_hash')
@@ -0,0 +1,40 @@
+"""add state bill counts
+
+Revision ID: a7d35c0e9b12
+Revises: 8b2e4d61f0a3
+Create Date: 2026-10-18 11:26:05.217730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d35c0e9b12'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d61f0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('state_bill_counts',
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('bill_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('state', 'status')
+    )
+    op.execute("""
+        INSERT INTO state_bill_counts (state, status, bill_count)
+        SELECT state, COALESCE(status, 0), COUNT(id)
+        FROM bills
+        WHERE state IS NOT NULL
+        GROUP BY state, COALESCE(status, 0)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('state_bill_counts')
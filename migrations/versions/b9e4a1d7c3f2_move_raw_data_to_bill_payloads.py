@@ -0,0 +1,87 @@
+"""move raw_data to bill_payloads
+
+Revision ID: b9e4a1d7c3f2
+Revises: f7c3b8e05a21
+Create Date: 2026-10-18 16:05:12.481930
+
+"""
+import datetime
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4a1d7c3f2'
+down_revision: Union[str, Sequence[str], None] = 'f7c3b8e05a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+
+bills = sa.table('bills', sa.column('id', sa.Integer), sa.column('change_hash', sa.String), sa.column('raw_data', sa.JSON))
+payloads = sa.table(
+    'bill_payloads',
+    sa.column('bill_id', sa.Integer),
+    sa.column('change_hash', sa.String),
+    sa.column('content', sa.LargeBinary),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def _batches(conn, query, key):
+    # Keyset over the bill id so memory stays at one batch of payloads
+    last_id = 0
+    while True:
+        rows = conn.execute(query.where(key > last_id).order_by(key).limit(BATCH)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bill_payloads',
+    sa.Column('bill_id', sa.Integer(), nullable=False),
+    sa.Column('change_hash', sa.String(), nullable=True),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['bill_id'], ['bills.id'], ),
+    sa.PrimaryKeyConstraint('bill_id')
+    )
+
+    conn = op.get_bind()
+    query = sa.select(bills.c.id, bills.c.change_hash, bills.c.raw_data).where(bills.c.raw_data.isnot(None))
+    now = datetime.datetime.utcnow()
+    for rows in _batches(conn, query, bills.c.id):
+        conn.execute(payloads.insert(), [
+            {
+                "bill_id": bill_id,
+                "change_hash": change_hash,
+                "content": zlib.compress(json.dumps(raw, separators=(",", ":")).encode("utf-8"), 6),
+                "updated_at": now,
+            }
+            for bill_id, change_hash, raw in rows
+        ])
+
+    op.drop_column('bills', 'raw_data')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('bills', sa.Column('raw_data', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    query = sa.select(payloads.c.bill_id, payloads.c.content)
+    for rows in _batches(conn, query, payloads.c.bill_id):
+        for bill_id, content in rows:
+            conn.execute(
+                bills.update().where(bills.c.id == bill_id)
+                .values(raw_data=json.loads(zlib.decompress(content)))
+            )
+
+    op.drop_table('bill_payloads')
@@ -0,0 +1,77 @@
+"""add bill search vectors
+
+Revision ID: c3d7e9f1a2b4
+Revises: b9e4a1d7c3f2
+Create Date: 2026-10-18 17:21:40.118274
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d7e9f1a2b4'
+down_revision: Union[str, Sequence[str], None] = 'b9e4a1d7c3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+TEXT_MAX_CHARS = 200_000  # settings.SEARCH_TEXT_MAX_CHARS at the time of writing
+
+# Same expression as app.services.search_service, frozen here
+BILL_VECTOR_SQL = """
+UPDATE bills AS b SET search_vector =
+    setweight(to_tsvector('english', coalesce(b.title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(b.description, '')), 'B')
+    || coalesce((
+        SELECT e.search_vector
+        FROM bill_texts AS t JOIN extracted_texts AS e ON e.text_hash = t.text_hash
+        WHERE t.bill_id = b.id AND e.search_vector IS NOT NULL
+        ORDER BY t.date DESC NULLS LAST, t.id DESC
+        LIMIT 1
+    ), ''::tsvector)
+WHERE b.id > :after AND b.id <= :upto
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('extracted_texts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('bills', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    conn = op.get_bind()
+
+    # Extracted texts are zlib-compressed, so their vectors are built from Python
+    last_hash = ''
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT text_hash, content FROM extracted_texts WHERE text_hash > :after ORDER BY text_hash LIMIT :n"),
+            {"after": last_hash, "n": BATCH},
+        ).fetchall()
+        if not rows:
+            break
+        for text_hash, content in rows:
+            conn.execute(
+                sa.text("UPDATE extracted_texts SET search_vector = setweight(to_tsvector('english', :body), 'C') "
+                        "WHERE text_hash = :hash"),
+                {"body": zlib.decompress(content).decode("utf-8")[:TEXT_MAX_CHARS], "hash": text_hash},
+            )
+        last_hash = rows[-1][0]
+
+    # Bills in id ranges, so no single statement rewrites the whole table
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM bills")).scalar()
+    for after in range(0, max_id, BATCH * 10):
+        conn.execute(sa.text(BILL_VECTOR_SQL), {"after": after, "upto": after + BATCH * 10})
+
+    op.create_index('ix_bills_search_vector', 'bills', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bills_search_vector', table_name='bills', postgresql_using='gin')
+    op.drop_column('bills', 'search_vector')
+    op.drop_column('extracted_texts', 'search_vector')
@@ -0,0 +1,36 @@
+"""add extracted texts
+
+Revision ID: d4f81a6c2e57
+Revises: a7d35c0e9b12
+Create Date: 2026-10-18 12:41:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f81a6c2e57'
+down_revision: Union[str, Sequence[str], None] = 'a7d35c0e9b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extracted_texts',
+    sa.Column('text_hash', sa.String(), nullable=False),
+    sa.Column('doc_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('text_hash')
+    )
+    op.create_index(op.f('ix_extracted_texts_doc_id'), 'extracted_texts', ['doc_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_extracted_texts_doc_id'), table_name='extracted_texts')
+    op.drop_table('extracted_texts')
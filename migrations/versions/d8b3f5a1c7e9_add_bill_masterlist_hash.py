@@ -0,0 +1,39 @@
+"""add bill masterlist_hash
+
+Revision ID: d8b3f5a1c7e9
+Revises: c3d7e9f1a2b4
+Create Date: 2026-10-18 19:42:10.512306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b3f5a1c7e9'
+down_revision: Union[str, Sequence[str], None] = 'c3d7e9f1a2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bills', sa.Column('masterlist_hash', sa.String(), nullable=True))
+
+    # Up to now the masterlist wrote change_hash itself, so it is the last hash it saw
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM bills")).scalar()
+    for after in range(0, max_id, BATCH):
+        conn.execute(
+            sa.text("UPDATE bills SET masterlist_hash = change_hash WHERE id > :after AND id <= :upto"),
+            {"after": after, "upto": after + BATCH},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bills', 'masterlist_hash')
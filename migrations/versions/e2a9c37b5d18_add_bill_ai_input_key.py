@@ -0,0 +1,28 @@
+"""add bill ai input key
+
+Revision ID: e2a9c37b5d18
+Revises: d4f81a6c2e57
+Create Date: 2026-10-18 13:15:40.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c37b5d18'
+down_revision: Union[str, Sequence[str], None] = 'd4f81a6c2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bills', sa.Column('ai_input_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bills', 'ai_input_key')
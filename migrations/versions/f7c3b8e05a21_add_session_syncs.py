@@ -0,0 +1,36 @@
+"""add session syncs
+
+Revision ID: f7c3b8e05a21
+Revises: e2a9c37b5d18
+Create Date: 2026-10-18 14:02:11.640287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3b8e05a21'
+down_revision: Union[str, Sequence[str], None] = 'e2a9c37b5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('session_syncs',
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('dataset_hash', sa.String(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+    op.create_index(op.f('ix_session_syncs_state'), 'session_syncs', ['state'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_session_syncs_state'), table_name='session_syncs')
+    op.drop_table('session_syncs')